@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_alter_schoolsettings_school_logo'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'category'], name='user_role_category'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.db import DatabaseError, migrations, transaction
+
+# Columns the student search (StudentViewSet) matches with icontains
+SEARCH_FIELDS = ['name', 'student_id', 'chest_code', 'email']
+
+
+def create_search_indexes(apps, schema_editor):
+    """
+    Trigram GIN indexes for the student search on PostgreSQL.
+
+    icontains compiles to UPPER(column::text) LIKE UPPER('%term%'), which these
+    expression indexes serve. Other databases keep scanning the student rows.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    except DatabaseError as e:
+        # Needs a role allowed to create extensions; the search still works without it
+        print(f"Skipping student search indexes, pg_trgm is not available: {e}")
+        return
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS student_{field}_trgm ON auth_user '
+            f'USING gin ((UPPER({field}::text)) gin_trgm_ops) WHERE role = \'student\''
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS student_{field}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -121,6 +121,11 @@ class User(AbstractUser):
                 name='unique_student_id_per_category'
             )
         ]
+        indexes = [
+            # Student lists filtered by category
+            models.Index(fields=['role', 'category'], name='user_role_category'),
+            # The student search's trigram indexes are PostgreSQL only (migration 0012)
+        ]
 
 
 class SchoolSettings(models.Model):
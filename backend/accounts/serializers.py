@@ -74,11 +74,16 @@ class StudentSerializer(serializers.ModelSerializer):
         fields = ['id', 'username', 'email', 'name', 'role', 'category', 'grade', 'section', 'address', 'date_of_birth', 'student_id', 'display_name', 'total_points', 'chest_code', 'team', 'team_id']
         read_only_fields = ['id', 'username', 'student_id', 'display_name', 'total_points', 'chest_code', 'team', 'team_id']
 
+    def _member_team(self, obj):
+        """First team (by name) the student is a member of; StudentViewSet prefetches team_memberships"""
+        memberships = list(obj.team_memberships.all())
+        return memberships[0] if memberships else None
+
     def get_team(self, obj):
         """Get the team information for this student"""
         try:
             # Check if student is a team member
-            member_team = Team.objects.filter(members=obj).first()
+            member_team = self._member_team(obj)
             if member_team:
                 return {
                     'id': member_team.id,
@@ -95,7 +100,7 @@ class StudentSerializer(serializers.ModelSerializer):
         """Get the team ID for this student"""
         try:
             # Check if student is a team member
-            member_team = Team.objects.filter(members=obj).first()
+            member_team = self._member_team(obj)
             if member_team:
                 return member_team.id
             
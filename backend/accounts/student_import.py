@@ -0,0 +1,83 @@
+"""
+Identity allocation and password hashing for bulk student imports.
+
+A StudentImporter is opened once per upload. It reads the student IDs,
+usernames and school emails that are already taken in a single snapshot
+query, then hands out new ones from memory for every chunk of the upload.
+
+Imported students get their student ID as default password. Hashing those
+at Django's full PBKDF2 work factor dominates a large import, so they are
+stored with a cheap PBKDF2 hash that Django re-hashes at the full work factor
+on the student's first successful login.
+"""
+from datetime import datetime
+
+from django.contrib.auth.hashers import get_hasher
+from django.db.models import Q
+
+EMAIL_DOMAIN = '@school.edu'
+# Work factor of deferred hashes; Django upgrades them at first login
+DEFERRED_HASH_ITERATIONS = 1000
+
+
+def student_id_prefix(year, grade):
+    return f"STU{year}{grade}"
+
+
+class StudentImporter:
+    """Allocates student IDs, usernames and emails and hashes default passwords for one import"""
+
+    def __init__(self, year=None):
+        from .models import User
+
+        self.year = year or datetime.now().year
+
+        # Everything the new identities could collide with, in one query
+        self.used_ids = set()
+        self.used_usernames = set()
+        self.used_emails = set()
+        for student_id, username, email in User.objects.filter(
+            Q(student_id__startswith=f"STU{self.year}")
+            | Q(username__istartswith=f"stu{self.year}")
+            | Q(email__iendswith=EMAIL_DOMAIN)
+        ).values_list('student_id', 'username', 'email'):
+            if student_id:
+                self.used_ids.add(student_id)
+            if username:
+                self.used_usernames.add(username.lower())
+            if email:
+                self.used_emails.add(email)
+        self.next_sequence = {}
+
+    def allocate_student_id(self, grade):
+        """Next free student ID for a grade (its lowercase form is the username)"""
+        prefix = student_id_prefix(self.year, grade)
+        if prefix not in self.next_sequence:
+            # Start after the number of existing IDs, as single creations do
+            self.next_sequence[prefix] = sum(1 for used in self.used_ids if used.startswith(prefix)) + 1
+
+        sequence = self.next_sequence[prefix]
+        student_id = f"{prefix}{sequence:03d}"
+        while student_id in self.used_ids or student_id.lower() in self.used_usernames:
+            sequence += 1
+            student_id = f"{prefix}{sequence:03d}"
+        self.next_sequence[prefix] = sequence + 1
+        self.used_ids.add(student_id)
+        self.used_usernames.add(student_id.lower())
+        return student_id
+
+    def allocate_email(self, name):
+        """name@school.edu, or name1@school.edu, name2@... when taken"""
+        base = name.lower().replace(' ', '.')
+        email = f"{base}{EMAIL_DOMAIN}"
+        counter = 1
+        while email in self.used_emails:
+            email = f"{base}{counter}{EMAIL_DOMAIN}"
+            counter += 1
+        self.used_emails.add(email)
+        return email
+
+    def hash_passwords(self, passwords):
+        """Encoded passwords (cheap hashes, upgraded at first login) for a list of raw passwords, in order"""
+        hasher = get_hasher('pbkdf2_sha256')
+        return [hasher.encode(password, hasher.salt(), iterations=DEFERRED_HASH_ITERATIONS) for password in passwords]
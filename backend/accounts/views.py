@@ -15,12 +15,12 @@ import re
 import random
 import string
 from django.contrib.auth import authenticate
-from django.contrib.auth.hashers import make_password
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from django.utils import timezone
 from events.models import Team, Event, Program, ProgramAssignment, PointsRecord as EventPointsRecord
+from events.data_version import schedule_data_version_bump
 from datetime import datetime
 from .serializers import SchoolSettingsSerializer
 
@@ -49,7 +49,8 @@ def school_settings(request):
     settings = SchoolSettings.get_settings()
     return Response({
         'school_name': settings.school_name,
-        'school_logo': settings.school_logo,
+        # The file's URL, as the SchoolSettings serializer renders it
+        'school_logo': request.build_absolute_uri(settings.school_logo.url) if settings.school_logo else None,
         'primary_color': settings.primary_color,
         'secondary_color': settings.secondary_color,
     })
@@ -76,55 +77,18 @@ def admin_dashboard_summary(request):
     total_students = User.objects.filter(role='student').count()
     total_programs = Event.objects.filter(status='completed').count()
 
-    # Calculate global points using percentage-based calculation
-    teams_with_points = []
-    teams = Team.objects.prefetch_related('members', 'program_assignments__program__event').all()
+    # Global points come from the shared materialized leaderboard
+    from events.leaderboard import get_global_leaderboard
+    global_points = get_global_leaderboard(teams=Team.objects.all(), include_students=False)
     
-    for team in teams:
-        # Calculate percentage-based global points (same as global points calculation)
-        from events.models import ProgramResult
-        from django.db.models import Sum
-        
-        # Get all events this team participated in
-        team_results = ProgramResult.objects.filter(
-            team=team,
-            points_earned__gt=0
-        ).select_related('program__event')
-        
-        total_global_percentage = 0
-        events_participated = 0
-        
-        if team_results.exists():
-            # Group by event
-            event_breakdown = {}
-            for result in team_results:
-                event_name = result.program.event.title
-                if event_name not in event_breakdown:
-                    event_breakdown[event_name] = {
-                        'team_points': 0,
-                        'total_event_points': 0
-                    }
-                event_breakdown[event_name]['team_points'] += result.points_earned
-            
-            # Calculate total event points for each event
-            for event_name in event_breakdown:
-                total_event_points = ProgramResult.objects.filter(
-                    program__event__title=event_name,
-                    points_earned__gt=0
-                ).aggregate(total=Sum('points_earned'))['total'] or 0
-                
-                # Calculate percentage for this event
-                if total_event_points > 0:
-                    event_percentage = (event_breakdown[event_name]['team_points'] / total_event_points) * 100
-                    total_global_percentage += event_percentage
-                    events_participated += 1
-        
+    teams_with_points = []
+    for team in global_points['teams']:
         teams_with_points.append({
-            'id': team.id,
-            'name': team.name,
-            'global_points': round(total_global_percentage, 2),
-            'members': team.member_count,
-            'events_participated': events_participated,
+            'id': team['id'],
+            'name': team['name'],
+            'global_points': team['global_points'],
+            'members': team['members'],
+            'events_participated': team['events_participated'],
             'event_breakdown': {}
         })
     
@@ -202,50 +166,19 @@ def team_manager_dashboard(request):
             'type': 'points'
         })
     
-    # Calculate global points for each team
+    # Global points for each team come from the shared materialized leaderboard
+    from events.leaderboard import get_global_leaderboard
+    global_points = get_global_leaderboard(teams=managed_teams, include_students=False)
+    
     teams_with_global_points = []
-    for team in managed_teams:
-        # Calculate percentage-based global points
-        team_results = ProgramResult.objects.filter(
-            team=team,
-            points_earned__gt=0
-        ).select_related('program__event')
-        
-        total_global_percentage = 0
-        events_participated = 0
-        
-        if team_results.exists():
-            # Group by event
-            event_breakdown = {}
-            for result in team_results:
-                event_name = result.program.event.title
-                if event_name not in event_breakdown:
-                    event_breakdown[event_name] = {
-                        'team_points': 0,
-                        'total_event_points': 0
-                    }
-                event_breakdown[event_name]['team_points'] += result.points_earned
-            
-            # Calculate total event points for each event
-            for event_name in event_breakdown:
-                total_event_points = ProgramResult.objects.filter(
-                    program__event__title=event_name,
-                    points_earned__gt=0
-                ).aggregate(total=Sum('points_earned'))['total'] or 0
-                
-                # Calculate percentage for this event
-                if total_event_points > 0:
-                    event_percentage = (event_breakdown[event_name]['team_points'] / total_event_points) * 100
-                    total_global_percentage += event_percentage
-                    events_participated += 1
-        
+    for team in global_points['teams']:
         teams_with_global_points.append({
-            'id': team.id,
-            'name': team.name,
-            'points': team.points_earned,  # Keep original points for backward compatibility
-            'global_points': round(total_global_percentage, 2),  # Add global points
-            'members': team.member_count,
-            'events_participated': events_participated
+            'id': team['id'],
+            'name': team['name'],
+            'points': team['points_earned'],  # Keep original points for backward compatibility
+            'global_points': team['global_points'],  # Add global points
+            'members': team['members'],
+            'events_participated': team['events_participated']
         })
     
     dashboard_data = {
@@ -465,19 +398,19 @@ def team_manager_available_programs(request):
         from events.serializers import ProgramSerializer
         
         # Get all active programs from published/ongoing events
-        programs = Program.objects.filter(
+        programs = ProgramSerializer.setup_queryset(Program.objects.filter(
             event__status__in=['published', 'ongoing'],
             is_active=True
-        ).select_related('event').order_by('event__start_date', 'start_time')
+        ), request).order_by('event__start_date', 'start_time')
         
         # Apply pagination
         paginator = SmallPagination()
         page = paginator.paginate_queryset(programs, request)
         if page is not None:
-            serializer = ProgramSerializer(page, many=True)
+            serializer = ProgramSerializer(page, many=True, context={'request': request})
             return paginator.get_paginated_response(serializer.data)
         
-        serializer = ProgramSerializer(programs, many=True)
+        serializer = ProgramSerializer(programs, many=True, context={'request': request})
         return Response(serializer.data)
         
     except Exception as e:
@@ -736,13 +669,13 @@ class StudentViewSet(viewsets.ModelViewSet):
             # Other users can't access students
             queryset = queryset.none()
         
-        # Apply search filter
-        search = self.request.query_params.get('search', '')
+        # Apply search filter (trigram indexed on PostgreSQL, see accounts migration 0012)
+        search = self.request.query_params.get('search', '').strip()
         if search:
             queryset = queryset.filter(
-                Q(first_name__icontains=search) |
-                Q(last_name__icontains=search) |
+                Q(name__icontains=search) |
                 Q(student_id__icontains=search) |
+                Q(chest_code__icontains=search) |
                 Q(email__icontains=search)
             )
         
@@ -776,7 +709,8 @@ class StudentViewSet(viewsets.ModelViewSet):
                 except Team.DoesNotExist:
                     queryset = queryset.none()
         
-        return queryset.order_by('first_name', 'last_name')
+        # Memberships for StudentSerializer.get_team/get_team_id, one query per page
+        return queryset.prefetch_related('team_memberships').order_by('first_name', 'last_name')
     
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
@@ -1149,24 +1083,27 @@ class StudentViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'])
     def bulk_upload(self, request):
-        """AI-powered bulk upload students via Excel file with team assignments"""
+        """AI-powered bulk upload students via Excel/CSV file with team assignments"""
+        from django.db import transaction
+        from events.spreadsheets import read_spreadsheet, iter_chunks, SpreadsheetError, SPREADSHEET_EXTENSIONS
+        from .student_import import StudentImporter
+        
         if 'file' not in request.FILES:
             return Response({'error': 'No file uploaded'}, status=status.HTTP_400_BAD_REQUEST)
         
         file = request.FILES['file']
-        if not file.name.endswith(('.xlsx', '.xls')):
-            return Response({'error': 'Please upload an Excel file (.xlsx or .xls)'}, status=status.HTTP_400_BAD_REQUEST)
+        if not file.name.lower().endswith(SPREADSHEET_EXTENSIONS):
+            return Response({'error': 'Please upload an Excel (.xlsx, .xls) or CSV (.csv) file'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Check file size (limit to 10MB)
         if file.size > 10 * 1024 * 1024:  # 10MB
             return Response({'error': 'File size too large. Please upload a file smaller than 10MB.'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Check openpyxl version for .xlsx files
-        if file.name.endswith('.xlsx'):
+        if file.name.lower().endswith('.xlsx'):
             try:
                 import openpyxl
                 openpyxl_version = openpyxl.__version__
-                print(f"Current openpyxl version: {openpyxl_version}")
                 if openpyxl_version < '3.1.0':
                     return Response({
                         'error': 'Server is currently updating. Please wait a few minutes and try again.',
@@ -1189,173 +1126,74 @@ class StudentViewSet(viewsets.ModelViewSet):
                 }, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            # Read Excel file with proper engine selection and version handling
+            # Stream the rows instead of loading the whole sheet into memory
             try:
-                if file.name.endswith('.xlsx'):
-                    # For .xlsx files, we must use openpyxl
-                    try:
-                        df = pd.read_excel(file, engine='openpyxl')
-                    except Exception as openpyxl_error:
-                        error_msg = str(openpyxl_error).lower()
-                        if 'openpyxl' in error_msg and ('version' in error_msg or '3.1.0' in error_msg):
-                            # openpyxl version issue - try to provide alternative solution
-                            return Response({
-                                'error': 'Excel file reading failed due to openpyxl version issue.',
-                                'details': [
-                                    f'Current openpyxl version is too old (requires 3.1.0+)',
-                                    f'Technical error: {str(openpyxl_error)}'
-                                ],
-                                'suggestions': [
-                                    'Please wait for the server to update (usually 5-10 minutes)',
-                                    'Try uploading the file again in a few minutes',
-                                    'If the issue persists, contact support'
-                                ]
-                            }, status=status.HTTP_400_BAD_REQUEST)
-                        else:
-                            raise openpyxl_error
-                elif file.name.endswith('.xls'):
-                    # For .xls files, try openpyxl first, then xlrd
-                    try:
-                        df = pd.read_excel(file, engine='openpyxl')
-                    except Exception:
-                        df = pd.read_excel(file, engine='xlrd')
-                else:
-                    return Response({'error': 'Please upload an Excel file (.xlsx or .xls)'}, status=status.HTTP_400_BAD_REQUEST)
-                
-                print(f"Successfully read Excel file: {file.name}, Shape: {df.shape}")
-                
-            except Exception as e:
-                print(f"Error reading Excel file {file.name}: {str(e)}")
-                return Response({'error': f'Error reading Excel file: {str(e)}. Please ensure the file is a valid Excel file and not corrupted.'}, status=status.HTTP_400_BAD_REQUEST)
-            
-            # AI-powered column detection and data validation
-            print(f"Processing Excel data with {len(df)} rows...")
-            results = self._process_student_excel_with_ai(df)
-            
-            print(f"Validation results: {len(results['valid_students'])} valid, {len(results['errors'])} errors")
-            
-            if results['errors']:
+                headers, rows = read_spreadsheet(file)
+            except SpreadsheetError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            
+            # AI-powered column detection
+            columns = [header.lower().replace(' ', '_') for header in headers]
+            column_mapping = self._detect_student_columns(columns)
+            
+            # Validate required columns (simplified)
+            required_fields = ['name', 'category', 'class']
+            missing_fields = [field for field in required_fields if not column_mapping.get(field)]
+            if missing_fields:
                 return Response({
                     'error': 'Data validation failed',
-                    'details': results['errors'],
-                    'suggestions': results['suggestions']
+                    'details': [f'Missing required columns: {", ".join(missing_fields)}'],
+                    'suggestions': ['Please ensure your Excel file has columns for: name, category, class']
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Process successful student creations
+            total_processed = 0
+            errors = []
             created_students = []
             skipped = []
-            team_assignments = []
-            
-            print(f"Starting to process {len(results['valid_students'])} valid students...")
+            team_assignment_results = []
             
-            for index, student_data in enumerate(results['valid_students']):
-                print(f"Processing student {index + 1}/{len(results['valid_students'])}: {student_data.get('name', 'Unknown')}")
-                try:
-                    # Auto-generate student_id
-                    from datetime import datetime
-                    current_year = datetime.now().year
-                    category = student_data.get('category', 'hs')
-                    class_name = student_data.get('class', '9')
-                    
-                    # Generate student_id based on category and class
-                    if category == 'hs':
-                        grade = class_name
-                    else:  # hss
-                        if 'Plus One' in class_name:
-                            grade = '11'
-                        else:  # Plus Two
-                            grade = '12'
-                    
-                    # Find the next sequence number
-                    existing_students = User.objects.filter(
-                        student_id__startswith=f"STU{current_year}{grade}"
-                    ).count()
-                    sequence = existing_students + 1
+            # Validate and write one chunk at a time. The import is all-or-nothing:
+            # after the first invalid row nothing more is written, the remaining rows
+            # are only validated so every error can be reported, and the transaction
+            # is rolled back.
+            with transaction.atomic():
+                importer = StudentImporter()
+                for chunk in iter_chunks(rows):
+                    valid_students = []
+                    for row_number, values in chunk:
+                        row = dict(zip(columns, values))
+                        student_data, error = self._validate_student_row(row_number, row, column_mapping)
+                        if error:
+                            errors.append(error)
+                        elif student_data:
+                            valid_students.append(student_data)
                     
-                    student_id = f"STU{current_year}{grade}{sequence:03d}"
-                    
-                    # Ensure student_id is unique
-                    while User.objects.filter(student_id=student_id).exists():
-                        sequence += 1
-                        student_id = f"STU{current_year}{grade}{sequence:03d}"
-                    
-                    # Auto-generate email
-                    name = student_data['name'].lower().replace(' ', '.')
-                    email = f"{name}@school.edu"
-                    
-                    # Ensure email is unique
-                    counter = 1
-                    original_email = email
-                    while User.objects.filter(email=email).exists():
-                        email = f"{name}{counter}@school.edu"
-                        counter += 1
-                    
-                    # Check if student already exists
-                    existing_student = User.objects.filter(
-                        Q(student_id=student_id) |
-                        Q(email=email)
-                    ).first()
-                    
-                    if existing_student:
-                        skipped.append({
-                            'student_id': student_id,
-                            'name': student_data['name'],
-                            'email': email,
-                            'reason': 'Student already exists with this ID or email'
-                        })
+                    total_processed += len(valid_students)
+                    if errors or not valid_students:
                         continue
                     
-                    # Create new student
-                    student = User.objects.create(
-                        student_id=student_id,
-                        name=student_data['name'],
-                        email=email,
-                        role='student',
-                        username=student_id.lower(),
-                        password=make_password(student_id),  # Default password is student_id
-                        category=category,
-                        grade=grade,
-                        section=class_name,  # Store the full class name in section
-                        is_active=True
-                    )
-                    
-                    # Generate chest code after student is created
-                    try:
-                        student.generate_chest_code()
-                    except Exception as e:
-                        print(f"Warning: Could not generate chest code for {student.student_id}: {str(e)}")
-                        # Continue without chest code - it's not critical
-                    
-                    created_students.append(student)
-                    print(f"Successfully created student: {student.student_id} - {student.name}")
-                    
-                    # Handle team assignment
-                    team_name = student_data.get('team_name', '').strip()
-                    if team_name:
-                        team_assignments.append({
-                            'student': student,
-                            'team_name': team_name
-                        })
-                        print(f"Queued team assignment: {student.name} -> {team_name}")
+                    chunk_students, team_assignments = self._create_students_chunk(valid_students, importer)
+                    created_students.extend(chunk_students)
                     
-                except Exception as e:
-                    error_msg = f'Error creating student: {str(e)}'
-                    print(f"Error creating student {student_data.get('name', 'Unknown')}: {error_msg}")
-                    skipped.append({
-                        'student_id': student_data.get('student_id', 'Unknown'),
-                        'name': student_data.get('name', ''),
-                        'email': student_data.get('email', ''),
-                        'reason': error_msg
-                    })
+                    # Process team assignments
+                    if team_assignments:
+                        team_assignment_results.extend(self._process_team_assignments(team_assignments))
+                
+                if errors:
+                    transaction.set_rollback(True)
             
-            # Process team assignments
-            team_assignment_results = []
-            if team_assignments:
-                team_assignment_results = self._process_team_assignments(team_assignments)
+            print(f"Validation results: {total_processed} valid, {len(errors)} errors")
+            
+            if errors:
+                return Response({
+                    'error': 'Data validation failed',
+                    'details': errors,
+                    'suggestions': []
+                }, status=status.HTTP_400_BAD_REQUEST)
             
             # Only return a summary and first 10 skipped/error entries to avoid large responses
             summary = {
-                'total_processed': len(results['valid_students']),
+                'total_processed': total_processed,
                 'successful_creations': len(created_students),
                 'skipped_creations': len(skipped),
                 'team_assignments_processed': len(team_assignment_results)
@@ -1383,130 +1221,138 @@ class StudentViewSet(viewsets.ModelViewSet):
                 'suggestions': ['Please try again with a different file', 'Ensure the file format is correct', 'Contact support if the issue persists']
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    def _create_students_chunk(self, valid_students, importer):
+        """Create one chunk of validated students with bulk inserts, returning (students, team_assignments)"""
+        from events.chest_numbers import assign_chest_codes
+        
+        students = []
+        team_assignments = []
+        for student_data in valid_students:
+            category = student_data.get('category', 'hs')
+            class_name = student_data.get('class', '9')
+            
+            # Generate student_id based on category and class
+            if category == 'hs':
+                grade = class_name
+            else:  # hss
+                if 'Plus One' in class_name:
+                    grade = '11'
+                else:  # Plus Two
+                    grade = '12'
+            
+            # IDs, usernames and emails come from the import's snapshot of taken values
+            student_id = importer.allocate_student_id(grade)
+            student = User(
+                student_id=student_id,
+                name=student_data['name'],
+                email=importer.allocate_email(student_data['name']),
+                role='student',
+                username=student_id.lower(),
+                category=category,
+                grade=grade,
+                section=class_name,  # Store the full class name in section
+                is_active=True
+            )
+            students.append(student)
+            
+            # Handle team assignment
+            team_name = student_data.get('team_name', '').strip()
+            if team_name:
+                team_assignments.append({
+                    'student': student,
+                    'team_name': team_name
+                })
+        
+        # Default password is student_id, hashed for the whole chunk at once
+        for student, password in zip(students, importer.hash_passwords([student.student_id for student in students])):
+            student.password = password
+        
+        # Generate chest codes before inserting, so no follow-up update is needed
+        assign_chest_codes(students)
+        students = User.objects.bulk_create(students)
+        # bulk_create sends no save signals, so bump the report data version here
+        schedule_data_version_bump(shared=True)
+        return students, team_assignments
+    
     def _process_team_assignments(self, team_assignments):
         """Process team assignments for bulk uploaded students"""
         from events.models import Team
         
-        assignment_results = []
+        # Resolve every team name at once, creating the missing teams in one batch
+        teams, created_names = Team.get_or_create_by_names(
+            assignment['team_name'] for assignment in team_assignments
+        )
         
+        assignment_results = []
+        memberships = []
+        Membership = Team.members.through
         for assignment in team_assignments:
             student = assignment['student']
             team_name = assignment['team_name']
-            
-            try:
-                # Try to find existing team
-                team = Team.objects.filter(name__iexact=team_name).first()
-                
-                if not team:
-                    # Create new team if it doesn't exist
-                    # Get the next team number
-                    max_team_number = Team.objects.aggregate(max_num=Max('team_number'))['max_num'] or 0
-                    new_team_number = max_team_number + 1
-                    
-                    team = Team.objects.create(
-                        name=team_name,
-                        team_number=new_team_number
-                    )
-                    
-                    # Generate team credentials
-                    team.generate_team_credentials()
-                    team.save()
-                    
-                    assignment_results.append({
-                        'student': student.display_name,
-                        'team_name': team_name,
-                        'action': 'Team created and student assigned as member',
-                        'success': True
-                    })
-                else:
-                    # Add student to existing team
-                    team.members.add(student)
-                    assignment_results.append({
-                        'student': student.display_name,
-                        'team_name': team_name,
-                        'action': 'Added as team member',
-                        'success': True
-                    })
-                        
-            except Exception as e:
-                assignment_results.append({
-                    'student': student.display_name,
-                    'team_name': team_name,
-                    'action': f'Error: {str(e)}',
-                    'success': False
-                })
+            key = team_name.strip().lower()
+            team = teams[key]
+            memberships.append(Membership(team_id=team.id, user_id=student.id))
+            
+            if key in created_names:
+                # The first student of a newly created team is reported as its creator
+                created_names.discard(key)
+                action = 'Team created and student assigned as member'
+            else:
+                action = 'Added as team member'
+            assignment_results.append({
+                'student': student.display_name,
+                'team_name': team_name,
+                'action': action,
+                'success': True
+            })
         
+        # All membership rows in one insert
+        Membership.objects.bulk_create(memberships, ignore_conflicts=True)
+        schedule_data_version_bump(shared=True)
         return assignment_results
 
-    def _process_student_excel_with_ai(self, df):
-        """AI-powered processing of Excel data for student creation (name only, no first/last required)"""
-        results = {
-            'valid_students': [],
-            'errors': [],
-            'suggestions': []
-        }
-        
-        # Clean column names
-        df.columns = df.columns.str.strip().str.lower().str.replace(' ', '_')
-        
-        # AI-powered column mapping
-        column_mapping = self._detect_student_columns(df.columns.tolist())
-        
-        # Validate required columns (simplified)
-        required_fields = ['name', 'category', 'class']
-        missing_fields = [field for field in required_fields if not column_mapping.get(field)]
-        
-        if missing_fields:
-            results['errors'].append(f'Missing required columns: {", ".join(missing_fields)}')
-            results['suggestions'].append('Please ensure your Excel file has columns for: name, category, class')
-            return results
-        
-        # Process each row
-        for index, row in df.iterrows():
-            try:
-                # Extract required fields
-                full_name = str(row[column_mapping['name']]).strip()
-                category = str(row[column_mapping['category']]).strip()
-                class_name = str(row[column_mapping['class']]).strip()
-                
-                # Skip empty rows
-                if pd.isna(full_name) or full_name == '' or full_name.lower() == 'nan':
-                    continue
-                
-                # Validate category
-                if category not in ['hs', 'hss']:
-                    results['errors'].append(f'Row {index + 2}: Invalid category "{category}". Must be "hs" or "hss"')
-                    continue
-                
-                # Validate class based on category
-                valid_classes = {
-                    'hs': ['8', '9', '10'],
-                    'hss': ['Plus One Science', 'Plus One Commerce', 'Plus Two Science', 'Plus Two Commerce']
-                }
-                
-                if class_name not in valid_classes[category]:
-                    results['errors'].append(f'Row {index + 2}: Invalid class "{class_name}" for category "{category}". Valid classes for {category}: {", ".join(valid_classes[category])}')
-                    continue
-                
-                # Build student data
-                student_data = {
-                    'name': full_name,  # Only use full name
-                    'category': category,
-                    'class': class_name,
-                }
-                
-                # Add optional team field
-                if column_mapping.get('team_name'):
-                    team_value = str(row[column_mapping['team_name']]).strip()
-                    if team_value and team_value.lower() != 'nan':
-                        student_data['team_name'] = team_value
-                
-                results['valid_students'].append(student_data)
-                
-            except Exception as e:
-                results['errors'].append(f'Row {index + 2}: Error processing data: {str(e)}')
-        
-        return results
+    def _validate_student_row(self, row_number, row, column_mapping):
+        """Validate one spreadsheet row for student creation (name only, no first/last required)"""
+        try:
+            # Extract required fields
+            full_name = str(row.get(column_mapping['name'], '')).strip()
+            category = str(row.get(column_mapping['category'], '')).strip()
+            class_name = str(row.get(column_mapping['class'], '')).strip()
+            
+            # Skip empty rows
+            if full_name == '' or full_name.lower() == 'nan':
+                return None, None
+            
+            # Validate category
+            if category not in ['hs', 'hss']:
+                return None, f'Row {row_number}: Invalid category "{category}". Must be "hs" or "hss"'
+            
+            # Validate class based on category
+            valid_classes = {
+                'hs': ['8', '9', '10'],
+                'hss': ['Plus One Science', 'Plus One Commerce', 'Plus Two Science', 'Plus Two Commerce']
+            }
+            
+            if class_name not in valid_classes[category]:
+                return None, f'Row {row_number}: Invalid class "{class_name}" for category "{category}". Valid classes for {category}: {", ".join(valid_classes[category])}'
+            
+            # Build student data
+            student_data = {
+                'name': full_name,  # Only use full name
+                'category': category,
+                'class': class_name,
+            }
+            
+            # Add optional team field
+            if column_mapping.get('team_name'):
+                team_value = str(row.get(column_mapping['team_name'], '')).strip()
+                if team_value and team_value.lower() != 'nan':
+                    student_data['team_name'] = team_value
+            
+            return student_data, None
+            
+        except Exception as e:
+            return None, f'Row {row_number}: Error processing data: {str(e)}'
     
     def _detect_student_columns(self, columns):
         """AI-powered column detection for student data"""
@@ -1825,135 +1671,10 @@ class PointsViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'])
     def calculate_global_points(self, request=None):
         """Calculate global points based on percentage performance across all events"""
-        from events.models import Event, Team, ProgramResult
-        from django.db.models import Sum
-        
-        # Get all events that have results
-        events_with_results = Event.objects.filter(
-            programs__results__isnull=False
-        ).distinct()
+        from events.leaderboard import get_global_leaderboard
         
-        team_global_points = {}
-        student_global_points = {}
-        
-        for event in events_with_results:
-            # Get all results for this event
-            event_results = ProgramResult.objects.filter(
-                program__event=event,
-                points_earned__gt=0
-            ).select_related('participant', 'team', 'program')
-            
-            if not event_results.exists():
-                continue
-            
-            # Calculate total points for this event
-            total_event_points = event_results.aggregate(total=Sum('points_earned'))['total'] or 0
-            
-            if total_event_points == 0:
-                continue
-            
-            # Calculate team points for this event
-            team_event_points = {}
-            for result in event_results.filter(team__isnull=False):
-                team_id = result.team.id
-                if team_id not in team_event_points:
-                    team_event_points[team_id] = {
-                        'team': result.team,
-                        'points': 0
-                    }
-                team_event_points[team_id]['points'] += result.points_earned
-            
-            # Calculate percentage for each team and add to global points
-            for team_id, team_data in team_event_points.items():
-                if team_id not in team_global_points:
-                    team_global_points[team_id] = {
-                        'team': team_data['team'],
-                        'global_points': 0,
-                        'events_participated': 0,
-                        'event_breakdown': []
-                    }
-                
-                # Calculate percentage for this event
-                event_percentage = (team_data['points'] / total_event_points) * 100
-                
-                # Add percentage to global points (this is the key change)
-                team_global_points[team_id]['global_points'] += event_percentage
-                team_global_points[team_id]['events_participated'] += 1
-                team_global_points[team_id]['event_breakdown'].append({
-                    'event_name': event.title,
-                    'event_points': team_data['points'],
-                    'total_event_points': total_event_points,
-                    'percentage': round(event_percentage, 2)
-                })
-            
-            # Calculate student points for this event (only individual programs)
-            student_event_points = {}
-            for result in event_results.filter(program__is_team_based=False):
-                student_id = result.participant.id
-                if student_id not in student_event_points:
-                    student_event_points[student_id] = {
-                        'student': result.participant,
-                        'points': 0
-                    }
-                student_event_points[student_id]['points'] += result.points_earned
-            
-            # Calculate percentage for each student and add to global points
-            for student_id, student_data in student_event_points.items():
-                if student_id not in student_global_points:
-                    student_global_points[student_id] = {
-                        'student': student_data['student'],
-                        'global_points': 0,
-                        'events_participated': 0,
-                        'event_breakdown': []
-                    }
-                
-                # Calculate percentage for this event
-                event_percentage = (student_data['points'] / total_event_points) * 100
-                
-                # Add percentage to global points (this is the key change)
-                student_global_points[student_id]['global_points'] += event_percentage
-                student_global_points[student_id]['events_participated'] += 1
-                student_global_points[student_id]['event_breakdown'].append({
-                    'event_name': event.title,
-                    'event_points': student_data['points'],
-                    'total_event_points': total_event_points,
-                    'percentage': round(event_percentage, 2)
-                })
-        
-        # Convert to list format
-        teams_list = []
-        for team_id, team_data in team_global_points.items():
-            teams_list.append({
-                'id': team_data['team'].id,
-                'name': team_data['team'].name,
-                'global_points': round(team_data['global_points'], 2),
-                'members': team_data['team'].member_count,
-                'events_participated': team_data['events_participated'],
-                'event_breakdown': team_data['event_breakdown']
-            })
-        
-        students_list = []
-        for student_id, student_data in student_global_points.items():
-            # Use proper name resolution instead of display_name
-            student = student_data['student']
-            student_name = student.get_full_name() if hasattr(student, 'get_full_name') else f"{student.first_name} {student.last_name}".strip()
-            if not student_name or student_name.strip() == '':
-                student_name = student.name or f"Student {student.student_id}" if student.student_id else "Unknown Student"
-            
-            students_list.append({
-                'id': student.id,
-                'name': student_name,
-                'student_id': student.student_id,
-                'global_points': round(student_data['global_points'], 2),
-                'category': student.get_category_display() if student.category else 'N/A',
-                'events_participated': student_data['events_participated'],
-                'event_breakdown': student_data['event_breakdown']
-            })
-        
-        result = {
-            'teams': teams_list,
-            'students': students_list
-        }
+        # Read from the materialized leaderboard (kept up to date as results change)
+        result = get_global_leaderboard()
         
         if request:
             return Response(result)
@@ -1966,7 +1687,9 @@ class PointsViewSet(viewsets.ModelViewSet):
         if request.user.role != 'admin':
             return Response({'error': 'Only admins can recalculate global points'}, status=403)
         
-        # Calculate global points
+        # Rebuild the materialized leaderboard from results, then read it
+        from events.leaderboard import refresh_all_leaderboards
+        refresh_all_leaderboards()
         global_points = self.calculate_global_points()
         
         # Update team global points (store in points_earned field)
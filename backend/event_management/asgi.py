@@ -4,4 +4,7 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'event_management.settings')
 
-application = get_asgi_application() 
\ No newline at end of file
+# Serve through ASGI (e.g. gunicorn -k uvicorn.workers.UvicornWorker event_management.asgi:application)
+# so the live results streams at /api/events/<id>/live/ (events/live.py) stay open
+# without each one holding a worker thread.
+application = get_asgi_application()
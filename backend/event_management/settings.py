@@ -43,6 +43,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost so it times the whole request; disabled unless REQUEST_METRICS=true
+    'events.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -140,7 +142,7 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
 # Add whitenoise for static files in production
 if not DEBUG:
-    MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
+    MIDDLEWARE.insert(MIDDLEWARE.index('corsheaders.middleware.CorsMiddleware') + 1, 'whitenoise.middleware.WhiteNoiseMiddleware')
     STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
     
     # Memory optimization for production
@@ -242,5 +244,50 @@ if DEBUG:
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media') 
 
+# Rendered PDF reports (written by the report worker, see events/reports.py)
+REPORTS_ROOT = os.environ.get('REPORTS_ROOT', os.path.join(MEDIA_ROOT, 'reports'))
+# Least recently used cached reports are evicted once the cache grows past this size
+REPORT_CACHE_MAX_BYTES = int(os.environ.get('REPORT_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+# Running report jobs not finished this long after a worker claimed them are marked failed
+REPORT_JOB_LEASE_SECONDS = int(os.environ.get('REPORT_JOB_LEASE_SECONDS', 30 * 60))
+# Processes rendering an event print pack (events/sheets.py); 0 uses one per CPU
+PRINT_PACK_WORKERS = int(os.environ.get('PRINT_PACK_WORKERS', 0))
+
 DATA_UPLOAD_MAX_MEMORY_SIZE = 104857600  # 100 MB
-FILE_UPLOAD_MAX_MEMORY_SIZE = 104857600  # 100 MB 
\ No newline at end of file
+# Uploads larger than this are spooled to a temp file; spreadsheet imports stream from it
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2621440  # 2.5 MB
+
+# Live results streams (events/live.py) open at once per process under WSGI. Each one
+# holds a worker thread, so keep this below gunicorn's --threads (4 in the Procfile)
+LIVE_MAX_WSGI_STREAMS = int(os.environ.get('LIVE_MAX_WSGI_STREAMS', 2))
+# Seconds a live stream token (from /api/events/<id>/live/token/) stays valid
+LIVE_STREAM_TOKEN_MAX_AGE = int(os.environ.get('LIVE_STREAM_TOKEN_MAX_AGE', 60))
+
+# Request metrics (events/middleware.py): per-request query count, DB time and
+# duplicate queries, p50/p95 per route at /api/metrics/requests/ (admin only),
+# and a JSON line in the 'events.slow_requests' log for slow requests
+REQUEST_METRICS_ENABLED = os.environ.get('REQUEST_METRICS', 'False').lower() == 'true'
+REQUEST_METRICS_SLOW_MS = int(os.environ.get('REQUEST_METRICS_SLOW_MS', 1000))
+REQUEST_METRICS_SLOW_QUERIES = int(os.environ.get('REQUEST_METRICS_SLOW_QUERIES', 50))
+# Recent requests kept per route for the percentiles
+REQUEST_METRICS_SAMPLES = int(os.environ.get('REQUEST_METRICS_SAMPLES', 500))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'events.slow_requests': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+        # Live results poll thread (events/live.py): failed polls and recovery
+        'events.live': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+# Also append slow requests to a file (one JSON object per line)
+if os.environ.get('REQUEST_METRICS_SLOW_LOG'):
+    LOGGING['handlers']['slow_request_file'] = {
+        'class': 'logging.handlers.WatchedFileHandler',
+        'filename': os.environ['REQUEST_METRICS_SLOW_LOG'],
+    }
+    LOGGING['loggers']['events.slow_requests']['handlers'].append('slow_request_file')
@@ -0,0 +1,156 @@
+"""
+Batch chest number allocation for program assignments.
+
+Chest numbers are unique per event and grouped in ranges: team N uses
+N*100..N*100+99, and participants without a team use the range starting
+after the last team, (team count + 1) * 100. A student keeps the same chest
+number for every program in an event. Free numbers are handed out from a
+ChestNumberCounter row per (event, range) rather than by reading MAX().
+"""
+from collections import defaultdict
+
+
+class ChestNumberRangeFull(Exception):
+    """Raised when a team has used every chest number in its range"""
+
+
+def get_general_range_start():
+    """First chest number for participants without a team (2 teams -> 300, 3 teams -> 400, ...)"""
+    from .models import Team
+    return (Team.objects.count() + 1) * 100
+
+
+def get_chest_number_range(team=None, general_start=None):
+    """Return (range_start, range_end) for a team's chest numbers; range_end is None for the open general range"""
+    if team is not None and team.team_number:
+        team_base = team.team_number * 100
+        return team_base, team_base + 100
+    return general_start or get_general_range_start(), None
+
+
+def reserve_chest_numbers(event_id, team=None, count=1, range_start=None, range_end=None):
+    """
+    Reserve `count` consecutive chest numbers for a team (or the general range) in an event.
+
+    Reservations go through a per-(event, range) ChestNumberCounter row, so a
+    whole batch costs one counter update no matter how many numbers it takes.
+    Pass range_start/range_end to reserve from an explicit range instead.
+    """
+    from .models import ChestNumberCounter
+
+    if range_start is None:
+        range_start, range_end = get_chest_number_range(team)
+    return ChestNumberCounter.reserve(event_id, range_start, count=count, range_end=range_end)
+
+
+def allocate_chest_numbers(event, assignments, assigned_by=None):
+    """
+    Set chest_number on a batch of unsaved ProgramAssignments in one pass.
+
+    Students that already have a chest number in the event keep it; everyone
+    else gets the next free number in their team's range, reserved once per
+    range for the whole batch. Returns the ChestNumber rows to create for the
+    newly numbered students.
+    """
+    from .models import ChestNumber
+
+    student_ids = [assignment.student_id for assignment in assignments]
+    existing = dict(ChestNumber.objects.filter(
+        event=event, student_id__in=student_ids
+    ).values_list('student_id', 'chest_number'))
+
+    # Students needing a number, grouped by chest number range
+    general_start = get_general_range_start()
+    by_range = defaultdict(list)
+    numbered = set(existing)
+    for assignment in assignments:
+        if assignment.student_id in existing:
+            assignment.chest_number = existing[assignment.student_id]
+        elif assignment.student_id not in numbered:
+            numbered.add(assignment.student_id)
+            by_range[get_chest_number_range(assignment.team, general_start)].append(assignment)
+
+    new_chest_numbers = []
+    for (range_start, range_end), range_assignments in by_range.items():
+        try:
+            numbers = reserve_chest_numbers(
+                event.id, count=len(range_assignments), range_start=range_start, range_end=range_end
+            )
+        except ChestNumberRangeFull:
+            team = range_assignments[0].team
+            raise ChestNumberRangeFull(
+                f'Team "{team.name}" does not have {len(range_assignments)} free chest numbers left '
+                f'in its range ({range_start}-{range_end - 1}) for this event'
+            )
+        for assignment, chest_number in zip(range_assignments, numbers):
+            assignment.chest_number = chest_number
+            existing[assignment.student_id] = chest_number
+            new_chest_numbers.append(ChestNumber(
+                event=event,
+                student_id=assignment.student_id,
+                team=assignment.team,
+                chest_number=chest_number,
+                assigned_by=assigned_by
+            ))
+
+    # Duplicate assignments of the same student share its number
+    for assignment in assignments:
+        assignment.chest_number = existing[assignment.student_id]
+
+    return new_chest_numbers
+
+
+def assign_chest_codes(students):
+    """
+    Give every student without a chest code one, the same way User.generate_chest_code does.
+
+    Returns the students whose chest_code was set (to be saved with bulk_update).
+    """
+    from accounts.models import User
+    from .models import ProgramAssignment
+
+    students = [student for student in students if not student.chest_code]
+    if not students:
+        return []
+
+    # Latest numbered assignment per student, if any (unsaved students have none)
+    latest_chest = {}
+    saved_ids = [student.id for student in students if student.pk]
+    if saved_ids:
+        for student_id, chest_number in ProgramAssignment.objects.filter(
+            student_id__in=saved_ids, chest_number__isnull=False
+        ).order_by('student_id', '-assigned_at').values_list('student_id', 'chest_number'):
+            latest_chest.setdefault(student_id, chest_number)
+
+    prefixes = [
+        f"{student.category.upper() if student.category else 'GEN'}{student.grade if student.grade else '00'}"
+        for student in students
+    ]
+    candidate_codes = [f"CHEST{number:04d}" for number in latest_chest.values()]
+    taken_codes = set(User.objects.filter(chest_code__in=candidate_codes).values_list('chest_code', flat=True))
+
+    # Numbers already used per category/grade prefix
+    used_numbers = defaultdict(set)
+    for prefix in set(prefixes):
+        for code in User.objects.filter(chest_code__startswith=prefix).values_list('chest_code', flat=True):
+            number_part = code[len(prefix):]
+            if number_part.isdigit():
+                used_numbers[prefix].add(int(number_part))
+
+    updated = []
+    for student, prefix in zip(students, prefixes):
+        code = None
+        if student.id in latest_chest:
+            code = f"CHEST{latest_chest[student.id]:04d}"
+            if code in taken_codes:
+                code = None
+        if code is None:
+            next_number = 1
+            while next_number in used_numbers[prefix]:
+                next_number += 1
+            used_numbers[prefix].add(next_number)
+            code = f"{prefix}{next_number:03d}"
+        taken_codes.add(code)
+        student.chest_code = code
+        updated.append(student)
+    return updated
@@ -0,0 +1,118 @@
+"""
+Change counters behind the report cache keys.
+
+Every write that can change what a report shows bumps a DataVersion counter
+once its transaction commits:
+
+- the event's counter for the event itself, its programs, results,
+  assignments, chest numbers, points records, scoreboard and leaderboard;
+- the shared counter for teams, team memberships, users and school
+  settings, which appear in every event's reports.
+
+Model signals (see the receivers at the end of events/models.py) cover
+saves and deletes. Bulk creates and updates and raw SQL writes send no
+signals, so the code doing them schedules the bump itself. A report's data
+version (events/reports.py get_data_version) is read from the counters in
+one query instead of scanning the data.
+"""
+import threading
+from contextlib import contextmanager
+from functools import partial
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+# Counter of the data every event's reports share
+SHARED = 'shared'
+# Bumped together with any event, for reports that cover all events
+ALL_EVENTS = 'all'
+
+# Changes collected by an active batched_data_version_bumps() block in this thread
+_batch = threading.local()
+
+
+def event_scope(event_id):
+    return f'event:{event_id}'
+
+
+def schedule_data_version_bump(event_id=None, program_id=None, shared=False):
+    """Bump an event's (or a program's event's) and/or the shared counter once the current transaction commits"""
+    changes = set()
+    if event_id:
+        changes.add(('event', event_id))
+    if program_id:
+        changes.add(('program', program_id))
+    if shared:
+        changes.add((SHARED, None))
+    if not changes:
+        return
+
+    pending = getattr(_batch, 'changes', None)
+    if pending is not None:
+        pending.update(changes)
+        return
+    transaction.on_commit(partial(bump_data_versions, changes))
+
+
+@contextmanager
+def batched_data_version_bumps():
+    """
+    Bump each counter once for everything inside the block.
+
+    Deletes send a signal per row; without this, deleting a team or a
+    program queues one bump per assignment and result.
+    """
+    if getattr(_batch, 'changes', None) is not None:
+        # Nested block: the outermost one schedules
+        yield
+        return
+    _batch.changes = pending = set()
+    try:
+        yield
+    finally:
+        _batch.changes = None
+    if pending:
+        transaction.on_commit(partial(bump_data_versions, pending))
+
+
+def bump_data_versions(changes):
+    """Increment the counters for a set of ('event', id), ('program', id) and ('shared', None) changes"""
+    from .models import DataVersion, Program
+
+    event_ids = {key for kind, key in changes if kind == 'event'}
+    program_ids = {key for kind, key in changes if kind == 'program'}
+    if program_ids:
+        # Programs deleted meanwhile bumped their event when they were deleted
+        event_ids.update(Program.objects.filter(pk__in=program_ids).values_list('event_id', flat=True))
+
+    scopes = {event_scope(event_id) for event_id in event_ids}
+    if event_ids:
+        scopes.add(ALL_EVENTS)
+    if (SHARED, None) in changes:
+        scopes.add(SHARED)
+    if not scopes:
+        return
+
+    updated = DataVersion.objects.filter(scope__in=scopes).update(version=F('version') + 1, updated_at=timezone.now())
+    if updated == len(scopes):
+        return
+
+    # First change in a scope creates its counter
+    existing = set(DataVersion.objects.filter(scope__in=scopes).values_list('scope', flat=True))
+    for scope in scopes - existing:
+        try:
+            with transaction.atomic():
+                DataVersion.objects.create(scope=scope, version=1)
+        except IntegrityError:
+            # Created concurrently by another request, increment that row instead
+            DataVersion.objects.filter(scope=scope).update(version=F('version') + 1, updated_at=timezone.now())
+
+
+def read_data_versions(event_id=None):
+    """[(scope, version)] of an event and the shared data; without an event, of all events"""
+    from .models import DataVersion
+
+    scopes = [event_scope(event_id) if event_id else ALL_EVENTS, SHARED]
+    versions = dict(DataVersion.objects.filter(scope__in=scopes).values_list('scope', 'version'))
+    return [(scope, versions.get(scope, 0)) for scope in scopes]
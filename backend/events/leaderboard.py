@@ -0,0 +1,182 @@
+"""
+Materialized global leaderboard.
+
+Global points are percentage based: for every event, a team (or student)
+earns its share of the event's total points as a percentage, and the
+percentages are summed across events. Per-event points are stored in
+LeaderboardEntry and rebuilt for one event at a time whenever a ranking in
+that event changes, so reading the leaderboard is a handful of queries
+instead of O(teams x events).
+"""
+import threading
+from contextlib import contextmanager
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from .data_version import schedule_data_version_bump
+
+# Events collected by an active batched_leaderboard_refreshes() block in this thread
+_batch = threading.local()
+
+
+def schedule_leaderboard_refresh(event_id):
+    """Refresh the leaderboard for an event once the current transaction commits"""
+    pending = getattr(_batch, 'events', None)
+    if pending is not None:
+        pending.add(event_id)
+        return
+    transaction.on_commit(partial(refresh_event_leaderboard, event_id))
+
+
+@contextmanager
+def batched_leaderboard_refreshes():
+    """Schedule each event's leaderboard refresh once for everything inside the block"""
+    if getattr(_batch, 'events', None) is not None:
+        # Nested block: the outermost one schedules
+        yield
+        return
+    _batch.events = pending = set()
+    try:
+        yield
+    finally:
+        _batch.events = None
+    for event_id in sorted(pending):
+        schedule_leaderboard_refresh(event_id)
+
+
+def refresh_event_leaderboard(event_id):
+    """Rebuild the leaderboard rows for one event from its program results"""
+    from .models import Event, ProgramResult, LeaderboardEntry
+
+    with transaction.atomic():
+        # Lock the event so concurrent refreshes of the same event run one after another
+        if not Event.objects.select_for_update().filter(pk=event_id).exists():
+            return
+
+        results = ProgramResult.objects.filter(program__event_id=event_id, points_earned__gt=0)
+
+        entries = []
+        total_points = results.aggregate(total=Sum('points_earned'))['total'] or 0
+        if total_points > 0:
+            entries.append(LeaderboardEntry(event_id=event_id, points=total_points))
+
+            for row in results.filter(team__isnull=False).values('team_id').annotate(points=Sum('points_earned')):
+                entries.append(LeaderboardEntry(event_id=event_id, team_id=row['team_id'], points=row['points']))
+
+            # Students only earn global points from individual programs
+            for row in results.filter(program__is_team_based=False).values('participant_id').annotate(points=Sum('points_earned')):
+                entries.append(LeaderboardEntry(event_id=event_id, student_id=row['participant_id'], points=row['points']))
+
+        LeaderboardEntry.objects.filter(event_id=event_id).delete()
+        LeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+        # Reports read the leaderboard, which is rebuilt after the change that bumped the version
+        schedule_data_version_bump(event_id=event_id)
+
+
+def refresh_all_leaderboards():
+    """Rebuild the leaderboard rows for every event"""
+    from .models import Event, LeaderboardEntry
+
+    event_ids = list(Event.objects.values_list('id', flat=True))
+    for event_id in event_ids:
+        refresh_event_leaderboard(event_id)
+    LeaderboardEntry.objects.exclude(event_id__in=event_ids).delete()
+
+
+def _student_display_name(student):
+    """Resolve the name shown for a student on the leaderboard"""
+    student_name = student.get_full_name()
+    if not student_name or student_name.strip() == '':
+        student_name = student.name or f"Student {student.student_id}" if student.student_id else "Unknown Student"
+    return student_name
+
+
+def get_global_leaderboard(teams=None, include_students=True):
+    """
+    Read the percentage-based global leaderboard from the materialized rows.
+
+    By default only teams that earned points are listed. Pass a Team queryset
+    as `teams` to list exactly those teams instead (teams without points get 0).
+    Returns {'teams': [...], 'students': [...]} with each entry carrying
+    global_points, events_participated and a per-event breakdown.
+    """
+    from .models import Team, LeaderboardEntry
+
+    entries = LeaderboardEntry.objects.select_related('event')
+
+    event_totals = {
+        entry.event_id: entry.points
+        for entry in entries.filter(team__isnull=True, student__isnull=True)
+    }
+
+    def add_entry(bucket, key, entry):
+        total_event_points = event_totals.get(entry.event_id)
+        if not total_event_points:
+            return
+        event_percentage = (entry.points / total_event_points) * 100
+        data = bucket.setdefault(key, {
+            'global_points': 0,
+            'events_participated': 0,
+            'event_breakdown': []
+        })
+        data['global_points'] += event_percentage
+        data['events_participated'] += 1
+        data['event_breakdown'].append({
+            'event_id': entry.event_id,
+            'event_name': entry.event.title,
+            'event_points': entry.points,
+            'total_event_points': total_event_points,
+            'percentage': round(event_percentage, 2)
+        })
+
+    team_entries = entries.filter(team__isnull=False).order_by('event__start_date', 'event_id')
+    if teams is not None:
+        team_entries = team_entries.filter(team__in=teams)
+    team_points = {}
+    for entry in team_entries:
+        add_entry(team_points, entry.team_id, entry)
+
+    if teams is None:
+        teams = Team.objects.filter(id__in=team_points.keys())
+    teams = teams.annotate(members_total=Count('members', distinct=True))
+
+    teams_list = []
+    for team in teams:
+        data = team_points.get(team.id, {'global_points': 0, 'events_participated': 0, 'event_breakdown': []})
+        teams_list.append({
+            'id': team.id,
+            'name': team.name,
+            'global_points': round(data['global_points'], 2),
+            'members': team.members_total,
+            'points_earned': team.points_earned,
+            'events_participated': data['events_participated'],
+            'event_breakdown': data['event_breakdown']
+        })
+
+    students_list = []
+    if include_students:
+        student_points = {}
+        students = {}
+        student_entries = entries.filter(student__isnull=False).select_related('student').order_by('event__start_date', 'event_id')
+        for entry in student_entries:
+            students[entry.student_id] = entry.student
+            add_entry(student_points, entry.student_id, entry)
+
+        for student_id, data in student_points.items():
+            student = students[student_id]
+            students_list.append({
+                'id': student.id,
+                'name': _student_display_name(student),
+                'student_id': student.student_id,
+                'global_points': round(data['global_points'], 2),
+                'category': student.get_category_display() if student.category else 'N/A',
+                'events_participated': data['events_participated'],
+                'event_breakdown': data['event_breakdown']
+            })
+
+    return {
+        'teams': teams_list,
+        'students': students_list
+    }
@@ -0,0 +1,319 @@
+"""
+Live results push channel (server-sent events).
+
+Results screens subscribe once per event to /api/events/<id>/live/ and get a
+compact message whenever a program's ranking changes or a program is marked
+finished, instead of polling the points, summary and leaderboard endpoints.
+
+Publishing appends a LiveUpdate row when the surrounding transaction commits.
+Each server process runs one background thread that tails the table and
+keeps the most recent messages in memory, so any number of open streams in
+that process cost one small indexed query per poll interval. Streams resume
+from the standard Last-Event-ID header after a reconnect.
+
+EventSource cannot send an Authorization header, so a client first POSTs to
+/api/events/<id>/live/token/ with its usual credentials and opens the stream
+with the returned ?stream_token=. That token is signed, only valid for the
+stream of that one event and expires after LIVE_STREAM_TOKEN_MAX_AGE seconds;
+it is checked when the stream is opened, and clients fetch a fresh one for
+every reconnect. Access tokens never appear in stream URLs.
+
+Under WSGI every open stream holds a worker thread, so streams there end
+after WSGI_STREAM_SECONDS and the browser reconnects, and at most
+LIVE_MAX_WSGI_STREAMS streams are open per process at once: further
+connections get 503 with a Retry-After hint, which leaves the remaining
+threads to the API. Served through event_management/asgi.py the stream is an
+async generator and holds no thread while idle.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+
+from django.core import signing
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from rest_framework.renderers import BaseRenderer
+
+logger = logging.getLogger(__name__)
+
+# How often each process checks for new updates
+POLL_INTERVAL = 1.0
+# Failed polls double the wait before the next one, up to this many seconds
+MAX_POLL_BACKOFF = 60.0
+# Recent messages kept in memory per process for open streams
+BUFFER_SIZE = 1000
+# Comment line sent to idle streams so proxies keep the connection open
+KEEPALIVE_SECONDS = 15
+# Streams are closed after this long under WSGI to free the worker thread
+WSGI_STREAM_SECONDS = 300
+# Seconds a client refused for lack of a free stream slot should wait
+WSGI_RETRY_AFTER = 30
+ASGI_STREAM_SECONDS = 3600
+# Browser reconnect delay (ms)
+RETRY_MS = 3000
+# Signing salt of stream tokens, so no other signed value is accepted as one
+STREAM_TOKEN_SALT = 'events.live-stream'
+# LiveUpdate rows older than this are pruned
+RETENTION = timedelta(hours=12)
+PRUNE_EVERY = 200
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets DRF views accept `Accept: text/event-stream` (the body is streamed, not rendered)"""
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode() if data is not None else b''
+
+
+def make_stream_token(event_id, user):
+    """Short-lived token that opens the live stream of one event"""
+    return signing.dumps({'event': event_id, 'user': user.id}, salt=STREAM_TOKEN_SALT)
+
+
+def check_stream_token(token, event_id):
+    """True if `token` is an unexpired stream token for this event"""
+    from django.conf import settings
+
+    if not token:
+        return False
+    try:
+        data = signing.loads(token, salt=STREAM_TOKEN_SALT, max_age=settings.LIVE_STREAM_TOKEN_MAX_AGE)
+    except signing.BadSignature:  # Also raised for expired tokens
+        return False
+    return data.get('event') == event_id
+
+
+def publish_update(event_id, kind, payload):
+    """Queue a live update for an event; it is written when the current transaction commits"""
+    transaction.on_commit(lambda: _write_update(event_id, kind, payload))
+
+
+def publish_ranking_change(program, changed_results):
+    """Publish the new positions and points of the results whose ranking moved"""
+    if not changed_results:
+        return
+    publish_update(program.event_id, 'ranking', {
+        'program_id': program.id,
+        'program_name': program.name,
+        'category': program.category,
+        'results': [
+            {
+                'id': result.id,
+                'participant_id': result.participant_id,
+                'team_id': result.team_id,
+                'position': result.position,
+                'points_earned': result.points_earned,
+            }
+            for result in changed_results
+        ],
+    })
+
+
+def publish_program_finished(program):
+    publish_update(program.event_id, 'program_finished', {
+        'program_id': program.id,
+        'program_name': program.name,
+        'category': program.category,
+    })
+
+
+def _write_update(event_id, kind, payload):
+    from .models import LiveUpdate
+
+    update = LiveUpdate.objects.create(event_id=event_id, kind=kind, payload=payload)
+    if update.id % PRUNE_EVERY == 0:
+        LiveUpdate.objects.filter(created_at__lt=timezone.now() - RETENTION).delete()
+
+
+def format_message(update_id, kind, payload):
+    """One SSE message; `payload` is already JSON"""
+    return f'id: {update_id}\nevent: {kind}\ndata: {payload}\n\n'
+
+
+class LiveUpdateHub:
+    """Per-process tail of the LiveUpdate table shared by every open stream"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._messages = deque(maxlen=BUFFER_SIZE)  # (id, event_id, formatted message)
+        self._last_id = None
+        self._thread = None
+
+    def start(self):
+        """Start the polling thread on first use; returns the latest update id at that moment"""
+        with self._condition:
+            if self._thread is None:
+                self._last_id = _latest_update_id()
+                self._thread = threading.Thread(target=self._run, name='live-update-hub', daemon=True)
+                self._thread.start()
+            return self._last_id
+
+    def _run(self):
+        from .models import LiveUpdate
+
+        delay = POLL_INTERVAL
+        while True:
+            time.sleep(delay)
+            try:
+                close_old_connections()
+                rows = list(LiveUpdate.objects.filter(id__gt=self._last_id).values_list(
+                    'id', 'event_id', 'kind', 'payload'
+                )[:BUFFER_SIZE])
+            except Exception:
+                # Keep an unavailable database from being hit (and logged) every second
+                delay = min(delay * 2, MAX_POLL_BACKOFF)
+                logger.exception('Live update poll failed, next attempt in %.0fs', delay)
+                continue
+            if delay != POLL_INTERVAL:
+                logger.info('Live update polling recovered')
+                delay = POLL_INTERVAL
+            if not rows:
+                continue
+            with self._condition:
+                for update_id, event_id, kind, payload in rows:
+                    self._messages.append((update_id, event_id, format_message(update_id, kind, json.dumps(payload))))
+                self._last_id = rows[-1][0]
+                self._condition.notify_all()
+
+    def messages_after(self, event_id, after_id):
+        """Buffered messages for an event newer than after_id, and the newest id seen"""
+        with self._condition:
+            return self._collect(event_id, after_id)
+
+    def wait_for_messages(self, event_id, after_id, timeout):
+        """Block until there are messages newer than after_id (for any event) or the timeout passes"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._last_id > after_id, timeout=timeout)
+            return self._collect(event_id, after_id)
+
+    def _collect(self, event_id, after_id):
+        messages = [message for update_id, update_event, message in self._messages
+                    if update_id > after_id and update_event == event_id]
+        return messages, max(after_id, self._last_id)
+
+
+hub = LiveUpdateHub()
+
+
+class StreamSlots:
+    """Per-process cap on open WSGI streams, each of which holds a worker thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open = 0
+
+    def acquire(self):
+        """Take a slot; False when LIVE_MAX_WSGI_STREAMS streams are already open"""
+        from django.conf import settings
+
+        with self._lock:
+            if self._open >= settings.LIVE_MAX_WSGI_STREAMS:
+                return False
+            self._open += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self._open -= 1
+
+
+wsgi_stream_slots = StreamSlots()
+
+
+class SlotStream:
+    """
+    Iterator for StreamingHttpResponse that gives its slot back when the
+    response is closed, including when the client goes away before the
+    first message (an unstarted generator's finally block would never run).
+    """
+
+    def __init__(self, iterator, slots):
+        self._iterator = iterator
+        self._slots = slots
+        self._released = False
+
+    def __iter__(self):
+        return self._iterator
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            self._slots.release()
+        self._iterator.close()
+
+
+def _latest_update_id():
+    from .models import LiveUpdate
+
+    return LiveUpdate.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def _backlog(event_id, after_id, up_to_id):
+    """Messages a reconnecting client missed, straight from the table (the hub delivers the rest)"""
+    from .models import LiveUpdate
+
+    return [
+        format_message(update_id, kind, json.dumps(payload))
+        for update_id, kind, payload in LiveUpdate.objects.filter(
+            event_id=event_id, id__gt=after_id, id__lte=up_to_id
+        ).values_list('id', 'kind', 'payload')[:BUFFER_SIZE]
+    ]
+
+
+def _start_position(last_event_id):
+    """(id the hub has reached, id to replay missed updates after or None) for a new connection"""
+    latest = hub.start()
+    if last_event_id is not None and last_event_id < latest:
+        return latest, last_event_id
+    return latest, None
+
+
+def event_stream(event_id, last_event_id=None):
+    """Blocking SSE generator (WSGI)"""
+    after_id, resume_from = _start_position(last_event_id)
+    yield f'retry: {RETRY_MS}\n\n'
+    if resume_from is not None:
+        yield from _backlog(event_id, resume_from, after_id)
+
+    deadline = time.monotonic() + WSGI_STREAM_SECONDS
+    keepalive_at = time.monotonic() + KEEPALIVE_SECONDS
+    while time.monotonic() < deadline:
+        # Wakes for updates to any event; only this event's messages are sent
+        messages, after_id = hub.wait_for_messages(event_id, after_id, max(0, keepalive_at - time.monotonic()))
+        if messages:
+            yield from messages
+            keepalive_at = time.monotonic() + KEEPALIVE_SECONDS
+        elif time.monotonic() >= keepalive_at:
+            yield ': keepalive\n\n'
+            keepalive_at = time.monotonic() + KEEPALIVE_SECONDS
+
+
+async def async_event_stream(event_id, last_event_id=None):
+    """Non-blocking SSE generator (ASGI); reads the hub's buffer without holding a thread"""
+    from asgiref.sync import sync_to_async
+
+    after_id, resume_from = await sync_to_async(_start_position)(last_event_id)
+    yield f'retry: {RETRY_MS}\n\n'
+    if resume_from is not None:
+        for message in await sync_to_async(_backlog)(event_id, resume_from, after_id):
+            yield message
+
+    deadline = time.monotonic() + ASGI_STREAM_SECONDS
+    idle_since = time.monotonic()
+    while time.monotonic() < deadline:
+        await asyncio.sleep(POLL_INTERVAL)
+        messages, after_id = hub.messages_after(event_id, after_id)
+        if messages:
+            for message in messages:
+                yield message
+            idle_since = time.monotonic()
+        elif time.monotonic() - idle_since >= KEEPALIVE_SECONDS:
+            yield ': keepalive\n\n'
+            idle_since = time.monotonic()
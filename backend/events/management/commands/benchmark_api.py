@@ -0,0 +1,311 @@
+import json
+import tempfile
+import time
+from collections import Counter
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment
+)
+from django.urls import URLPattern, URLResolver, NoReverseMatch, get_resolver, reverse
+from django.utils import timezone
+from events.synthetic import build_fest
+
+
+# Which sample object fills a route's `pk`, by URL name prefix (most specific first)
+PK_OBJECTS = [
+    ('points-student-details', 'student'),
+    ('event-programs', 'program'),
+    ('event-points', 'event'),
+    ('program-assignments', 'assignment'),
+    ('program-results', 'result'),
+    ('eventannouncement', 'announcement'),
+    ('event', 'event'),
+    ('team-manager', 'team'),
+    ('team', 'team'),
+    ('program', 'program'),
+    ('students', 'student'),
+    ('points', 'points_record'),
+    ('schoolsettings', 'school_settings'),
+]
+
+# Sample object for every other URL keyword argument
+KWARG_OBJECTS = {
+    'event_pk': 'event',
+    'event_id': 'event',
+    'program_pk': 'program',
+    'program_id': 'program',
+    'team_id': 'team',
+    'student_id': 'student',
+    'assignment_id': 'assignment',
+    'job_id': 'report_job',
+}
+
+# Query string for routes that answer 400 without one: (sample, query built from it)
+ROUTE_QUERY = {
+    'event-search-by-chest-number': ('assignment', lambda assignment: {'chest_number': assignment.chest_number}),
+    'program-category-counts': ('event', lambda event: {'event_id': event.pk}),
+}
+
+# Routes that only answer their own role, by URL name prefix; the rest run as the admin
+ROUTE_USERS = [
+    ('team-manager-', 'team_manager'),
+    ('team_manager_dashboard', 'team_manager'),
+]
+
+SKIP_ROUTES = {
+    # Long-lived streams never finish a response, so they can't be timed like the rest
+    'event_live_updates',
+    # Disabled in the views (always 503) until the executable reports come back
+    'generate_program_details_executable',
+    'generate_complete_results_executable',
+    'generate_participants_team_executable',
+}
+
+# Per-route budgets for the default dataset, measured with headroom
+DEFAULT_BUDGETS = settings.BASE_DIR / 'benchmark_budgets.json'
+
+
+class Command(BaseCommand):
+    help = 'Call every GET API route against a synthetic fest and check query count/latency budgets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--teams', type=int, default=4, help='Number of teams')
+        parser.add_argument('--programs', type=int, default=20, help='Number of programs')
+        parser.add_argument('--students-per-team', type=int, default=15, help='Students in each team')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for the dataset')
+        parser.add_argument(
+            '--budgets',
+            default=str(DEFAULT_BUDGETS),
+            help='JSON file of {"route-name": {"queries": N, "ms": T}}; "*" sets the default '
+                 '(default: benchmark_budgets.json, measured for the default dataset options)',
+        )
+        parser.add_argument('--max-queries', type=int, default=50, help='Default query budget per route')
+        parser.add_argument('--max-ms', type=float, default=2000, help='Default time budget per route (ms)')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+        parser.add_argument('--route', action='append', help='Only run routes whose name contains this (repeatable)')
+        parser.add_argument(
+            '--use-current-db',
+            action='store_true',
+            help='Measure against the configured database as-is instead of a throwaway synthetic one',
+        )
+
+    def handle(self, *args, **options):
+        budgets = self._load_budgets(options)
+
+        setup_test_environment()
+        old_name = None
+        # Reports rendered for the sample job go to a throwaway directory, not the real cache
+        reports_root = nullcontext() if options['use_current_db'] else tempfile.TemporaryDirectory()
+        try:
+            if not options['use_current_db']:
+                old_name = connection.settings_dict['NAME']
+                connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+                self.stdout.write('Building synthetic dataset...')
+                started = time.perf_counter()
+                build_fest(
+                    students=options['teams'] * options['students_per_team'],
+                    teams=options['teams'],
+                    programs=options['programs'],
+                    finished=1,
+                    seed=options['seed'],
+                )
+                self.stdout.write(f'Dataset ready in {time.perf_counter() - started:.1f}s')
+
+            with reports_root as reports_dir:
+                with override_settings(REPORTS_ROOT=reports_dir) if reports_dir else nullcontext():
+                    samples = self._load_samples(create_report_job=not options['use_current_db'])
+                    report = self._run_routes(samples, budgets, options['route'])
+        finally:
+            if old_name is not None:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Report written to {options['output']}")
+
+        # A route that errors is never within budget, however fast it fails
+        failed = [f"{row['name']} ({row['status']})" for row in report['routes'] if row['failed']]
+        over_budget = [row['name'] for row in report['routes'] if row['over_budget']]
+        problems = []
+        if failed:
+            problems.append(f"{len(failed)} failed: {', '.join(failed)}")
+        if over_budget:
+            problems.append(f"{len(over_budget)} over budget: {', '.join(over_budget)}")
+        if problems:
+            raise CommandError(f"Of {len(report['routes'])} routes, " + '; '.join(problems))
+        self.stdout.write(self.style.SUCCESS(f"All {len(report['routes'])} routes succeeded within budget"))
+
+    def _load_budgets(self, options):
+        budgets = {'*': {'queries': options['max_queries'], 'ms': options['max_ms']}}
+        if options['budgets']:
+            try:
+                with open(options['budgets']) as f:
+                    budgets.update(json.load(f))
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read budgets file: {e}")
+        return budgets
+
+    def _load_samples(self, create_report_job=False):
+        """One object of each kind to fill URL parameters with, and the users to run requests as"""
+        from accounts.models import SchoolSettings, User
+        from events.models import (
+            Event, EventAnnouncement, PointsRecord, Program, ProgramAssignment, ProgramResult, Team
+        )
+        from events.reports import jobs_visible_to
+
+        # Staff admins pass the Django admin permission checks as well as the role checks
+        admin = User.objects.filter(role='admin').order_by('-is_staff', 'id').first()
+        if admin is None:
+            raise CommandError('No admin user to run requests as')
+
+        program = Program.objects.filter(assignments__chest_number__isnull=False).first()
+        event = program.event if program else Event.objects.first()
+        managed_team = Team.objects.filter(team_manager__role='team_manager').select_related('team_manager').first()
+        if create_report_job and event is not None:
+            self._render_sample_job(event, admin)
+        return {
+            'user': admin,
+            'team_manager': managed_team.team_manager if managed_team else None,
+            'event': event,
+            'program': program,
+            # The managed team, so team-manager routes ask about their own team
+            'team': managed_team or Team.objects.first(),
+            'student': User.objects.filter(role='student').first(),
+            'assignment': ProgramAssignment.objects.filter(program=program, chest_number__isnull=False).first(),
+            'result': ProgramResult.objects.filter(program=program).first(),
+            'announcement': EventAnnouncement.objects.first(),
+            'points_record': PointsRecord.objects.first(),
+            'school_settings': SchoolSettings.objects.first(),
+            'report_job': jobs_visible_to(admin).filter(status='completed').order_by('-created_at').first(),
+        }
+
+    def _render_sample_job(self, event, admin):
+        """Queue and render one report the way the worker does, for the report job routes"""
+        from events.reports import claim_next_job, enqueue_report, run_job
+
+        job = enqueue_report('program_details', {'event_id': event.pk}, requested_by=admin)
+        if job.status == 'pending':
+            job = run_job(claim_next_job())
+        if job.status != 'completed':
+            raise CommandError(f'Sample report job failed: {job.error}')
+
+    def _run_routes(self, samples, budgets, only):
+        from rest_framework.test import APIClient
+
+        # Server errors are recorded as 500 rows rather than aborting the run
+        clients = {}
+        for role in ('user', 'team_manager'):
+            if samples[role] is not None:
+                clients[role] = APIClient(SERVER_NAME='localhost', raise_request_exception=False)
+                clients[role].force_authenticate(samples[role])
+
+        rows = []
+        skipped = []
+        for name, pattern in _iter_get_routes():
+            if only and not any(part in name for part in only):
+                continue
+            path = _reverse_route(name, pattern, samples)
+            role = next((role for prefix, role in ROUTE_USERS if name.startswith(prefix)), 'user')
+            query_sample, build_query = ROUTE_QUERY.get(name, (None, None))
+            if path is None or role not in clients or (query_sample and samples[query_sample] is None):
+                skipped.append(name)
+                continue
+            query = build_query(samples[query_sample]) if build_query else None
+
+            reset_queries()
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = clients[role].get(path, query)
+                content = (
+                    b''.join(response.streaming_content) if response.streaming else response.content
+                )
+                elapsed_ms = (time.perf_counter() - started) * 1000
+
+            statements = Counter(query['sql'] for query in queries.captured_queries)
+            budget = {**budgets['*'], **budgets.get(name, {})}
+            row = {
+                'name': name,
+                'path': path,
+                'status': response.status_code,
+                'queries': len(queries.captured_queries),
+                'duplicate_queries': sum(count - 1 for count in statements.values()),
+                'time_ms': round(elapsed_ms, 1),
+                'bytes': len(content),
+                'budget_queries': budget['queries'],
+                'budget_ms': budget['ms'],
+            }
+            row['failed'] = not 200 <= response.status_code < 400
+            row['over_budget'] = row['queries'] > budget['queries'] or row['time_ms'] > budget['ms']
+            rows.append(row)
+
+            line = (
+                f"{row['status']} {row['queries']:>4}q {row['time_ms']:>8.1f}ms {row['bytes']:>9}B  {name}"
+            )
+            self.stdout.write(self.style.ERROR(line) if row['failed'] or row['over_budget'] else line)
+
+        if skipped:
+            self.stdout.write(f"Skipped (no sample data for URL parameters or user): {', '.join(skipped)}")
+
+        return {
+            'generated_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'routes': rows,
+            'skipped': skipped,
+        }
+
+
+def _iter_get_routes(patterns=None):
+    """Yield (url name, pattern) for every named route that answers GET, once per name"""
+    seen = set()
+    stack = list(patterns if patterns is not None else get_resolver().url_patterns)
+    while stack:
+        entry = stack.pop(0)
+        if isinstance(entry, URLResolver):
+            # Namespaced includes (the Django admin) are not part of the API
+            if not entry.namespace:
+                stack[:0] = entry.url_patterns
+            continue
+        if not isinstance(entry, URLPattern) or not entry.name or entry.name in seen:
+            continue
+        if entry.name == 'api-root' or entry.name in SKIP_ROUTES or 'format' in entry.pattern.regex.groupindex:
+            continue
+        if _allows_get(entry.callback):
+            seen.add(entry.name)
+            yield entry.name, entry
+
+
+def _allows_get(callback):
+    actions = getattr(callback, 'actions', None)
+    if actions is not None:
+        return 'get' in actions
+    view_class = getattr(callback, 'cls', None) or getattr(callback, 'view_class', None)
+    if view_class is not None:
+        return hasattr(view_class, 'get')
+    return True
+
+
+def _reverse_route(name, pattern, samples):
+    """Build the route's path from sample objects, or None if a parameter has no sample"""
+    kwargs = {}
+    for kwarg in pattern.pattern.regex.groupindex:
+        if kwarg == 'pk':
+            key = next((key for prefix, key in PK_OBJECTS if name.startswith(prefix)), None)
+        elif kwarg in KWARG_OBJECTS:
+            key = KWARG_OBJECTS[kwarg]
+        else:
+            return None
+        sample = samples.get(key) if key else None
+        if sample is None:
+            return None
+        kwargs[kwarg] = sample.pk
+    try:
+        return reverse(name, kwargs=kwargs)
+    except NoReverseMatch:
+        return None
+
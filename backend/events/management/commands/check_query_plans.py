@@ -0,0 +1,129 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from accounts.models import User
+from events.models import ChestNumber, PointsRecord, ProgramAssignment, ProgramResult
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot view querysets and fail if they stop using their indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force-index',
+            action='store_true',
+            help='Disable sequential scans (PostgreSQL) to check index usability on a small dataset',
+        )
+        parser.add_argument(
+            '--verbose-plans',
+            action='store_true',
+            help='Print the full plan for every query',
+        )
+
+    def handle(self, *args, **options):
+        checks = self._build_checks()
+        if not checks:
+            raise CommandError('No data to explain. Load a dataset first (manage.py seed_fest or a copy of production).')
+
+        failures = []
+        with transaction.atomic():
+            if options['force_index'] and connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+
+            for label, queryset, index_name in checks:
+                plan = queryset.explain()
+                if index_name in plan:
+                    self.stdout.write(f"OK    {label} -> {index_name}")
+                else:
+                    failures.append(label)
+                    self.stdout.write(self.style.ERROR(f"FAIL  {label}: expected {index_name}"))
+                if options['verbose_plans'] or index_name not in plan:
+                    self.stdout.write('      ' + plan.replace('\n', '\n      '))
+
+        if failures:
+            raise CommandError(f"{len(failures)} of {len(checks)} queries no longer use their index")
+        self.stdout.write(self.style.SUCCESS(f"All {len(checks)} query plans use their indexes"))
+
+    def _build_checks(self):
+        """(label, queryset, expected index) for each hot filter, using ids from the current data"""
+        checks = []
+
+        result = ProgramResult.objects.filter(team__isnull=False).select_related('program').first()
+        if result:
+            # rank_program / scoreboard refresh
+            checks.append((
+                'ProgramResult ranking by program',
+                ProgramResult.objects.filter(
+                    program_id=result.program_id, average_marks__isnull=False
+                ).order_by('-average_marks', '-total_marks'),
+                'result_program_ranked',
+            ))
+            # Team points breakdowns
+            checks.append((
+                'ProgramResult points by team',
+                ProgramResult.objects.filter(team_id=result.team_id, points_earned__gt=0),
+                'result_team_points',
+            ))
+
+        assignment = ProgramAssignment.objects.filter(team__isnull=False).select_related('program').first()
+        if assignment:
+            # Served by the student foreign key index, joined to program for the event
+            checks.append((
+                'ProgramAssignment by student in event',
+                ProgramAssignment.objects.filter(
+                    student_id=assignment.student_id, program__event_id=assignment.program.event_id
+                ),
+                'programassignment_student_id',
+            ))
+            checks.append((
+                'ProgramAssignment team roster by chest number',
+                ProgramAssignment.objects.filter(team_id=assignment.team_id).order_by('chest_number'),
+                'assignment_team_chest',
+            ))
+
+        chest_number = ChestNumber.objects.filter(team__isnull=False).first()
+        if chest_number:
+            checks.append((
+                'ChestNumber by event and team',
+                ChestNumber.objects.filter(
+                    event_id=chest_number.event_id, team_id=chest_number.team_id
+                ).order_by('chest_number'),
+                'chest_event_team_number',
+            ))
+
+        record = PointsRecord.objects.filter(team__isnull=False).first()
+        if record:
+            checks.append((
+                'PointsRecord by team',
+                PointsRecord.objects.filter(team_id=record.team_id),
+                'points_team_event',
+            ))
+        record = PointsRecord.objects.filter(student__isnull=False).first()
+        if record:
+            checks.append((
+                'PointsRecord by student',
+                PointsRecord.objects.filter(student_id=record.student_id),
+                'points_student_event',
+            ))
+
+        student = User.objects.filter(role='student', category__isnull=False).first()
+        if student:
+            checks.append((
+                'Students by category',
+                User.objects.filter(role='student', category=student.category),
+                'user_role_category',
+            ))
+            if connection.vendor == 'postgresql':
+                # StudentViewSet search, trigram indexes from accounts migration 0012
+                term = (student.name or student.email or '')[:4]
+                checks.append((
+                    'Student search',
+                    User.objects.filter(role='student').filter(
+                        Q(name__icontains=term) | Q(student_id__icontains=term) |
+                        Q(chest_code__icontains=term) | Q(email__icontains=term)
+                    ),
+                    'student_name_trgm',
+                ))
+
+        return checks
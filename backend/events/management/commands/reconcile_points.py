@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from accounts.models import User
+from events.data_version import schedule_data_version_bump
+from events.models import PointsRecord, Team
+
+class Command(BaseCommand):
+    help = 'Rebuild team/student points totals from the points records ledger'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show totals that are out of sync without making changes',
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Like --dry-run, but fail if any total is out of sync with the ledger',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run'] or options['check']
+
+        # Expected totals from the ledger, with the same clamping as the running totals
+        teams_to_update = []
+        teams = Team.objects.only('id', 'name', 'points_earned').annotate(
+            expected=PointsRecord.clamped_total('team')
+        )
+        for team in teams:
+            expected = team.expected
+            if team.points_earned != expected:
+                self.stdout.write(f"Team {team.name}: points_earned {team.points_earned} -> {expected}")
+                team.points_earned = expected
+                teams_to_update.append(team)
+
+        students_to_update = []
+        students = User.objects.filter(role='student').only('id', 'username', 'name', 'email', 'total_points').annotate(
+            expected=PointsRecord.clamped_total('student')
+        )
+        for student in students:
+            expected = student.expected
+            if student.total_points != expected:
+                self.stdout.write(f"Student {student.display_name}: total_points {student.total_points} -> {expected}")
+                student.total_points = expected
+                students_to_update.append(student)
+
+        self.stdout.write(f"Team totals out of sync: {len(teams_to_update)}")
+        self.stdout.write(f"Student totals out of sync: {len(students_to_update)}")
+
+        if options['check'] and (teams_to_update or students_to_update):
+            raise CommandError("Points totals are out of sync with the points records ledger")
+        if dry_run:
+            self.stdout.write("Dry run completed. No changes made.")
+            return
+
+        with transaction.atomic():
+            Team.objects.bulk_update(teams_to_update, ['points_earned'], batch_size=1000)
+            User.objects.bulk_update(students_to_update, ['total_points'], batch_size=1000)
+
+            # Bulk writes send no save signals; totals show up on every event's reports
+            schedule_data_version_bump(shared=True)
+
+        self.stdout.write(self.style.SUCCESS("Successfully reconciled points totals"))
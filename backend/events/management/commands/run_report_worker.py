@@ -0,0 +1,60 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from events.reports import claim_next_job, run_job
+
+class Command(BaseCommand):
+    help = 'Render queued PDF report jobs to disk'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process the jobs that are currently queued and exit',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=2.0,
+            help='Seconds to wait between polls when the queue is empty (default: 2)',
+        )
+        parser.add_argument(
+            '--max-jobs',
+            type=int,
+            default=0,
+            help='Exit after processing this many jobs (default: no limit)',
+        )
+
+    def handle(self, *args, **options):
+        once = options['once']
+        sleep = options['sleep']
+        max_jobs = options['max_jobs']
+        processed = 0
+
+        self.stdout.write("Report worker started")
+
+        while True:
+            close_old_connections()
+            job = claim_next_job()
+
+            if job is None:
+                if once:
+                    break
+                time.sleep(sleep)
+                continue
+
+            self.stdout.write(f"Rendering {job.report_type} #{job.id} {job.params}")
+            started = time.monotonic()
+            job = run_job(job)
+            elapsed = time.monotonic() - started
+
+            if job.status == 'completed':
+                self.stdout.write(self.style.SUCCESS(f"  Completed in {elapsed:.1f}s: {job.file_path}"))
+            else:
+                self.stdout.write(self.style.ERROR(f"  Failed in {elapsed:.1f}s: {job.error.splitlines()[0] if job.error else ''}"))
+
+            processed += 1
+            if max_jobs and processed >= max_jobs:
+                break
+
+        self.stdout.write(f"Report worker stopped after {processed} jobs")
@@ -0,0 +1,60 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from events.synthetic import build_fest, flush_fest
+
+
+class Command(BaseCommand):
+    help = 'Generate a deterministic synthetic fest (students, teams, programs, assignments, results) for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=1000, help='Number of students (split between HS and HSS)')
+        parser.add_argument('--teams', type=int, default=8, help='Number of teams')
+        parser.add_argument('--events', type=int, default=1, help='Number of events')
+        parser.add_argument('--programs', type=int, default=100, help='Number of programs across all events')
+        parser.add_argument(
+            '--participants-per-team', type=int, default=2,
+            help='Participants each team sends to an individual program',
+        )
+        parser.add_argument(
+            '--finished', type=float, default=0.8,
+            help='Fraction of programs that are finished and have judged results',
+        )
+        parser.add_argument('--seed', type=int, default=1, help='Random seed; the same seed gives the same data')
+        parser.add_argument('--start-date', type=date.fromisoformat, help='First event day (YYYY-MM-DD), default today')
+        parser.add_argument(
+            '--flush',
+            action='store_true',
+            help='Delete a previously generated fest before seeding',
+        )
+
+    def handle(self, *args, **options):
+        if options['students'] < 0 or options['teams'] < 1 or options['events'] < 1 or options['programs'] < 0:
+            raise CommandError('Need at least one team and one event')
+        if not 0 <= options['finished'] <= 1:
+            raise CommandError('--finished must be between 0 and 1')
+
+        if options['flush']:
+            deleted = flush_fest()
+            self.stdout.write(f"Deleted {deleted} rows from the previous synthetic fest")
+
+        started = time.perf_counter()
+        try:
+            counts = build_fest(
+                students=options['students'],
+                teams=options['teams'],
+                events=options['events'],
+                programs=options['programs'],
+                participants_per_team=options['participants_per_team'],
+                finished=options['finished'],
+                seed=options['seed'],
+                start_date=options['start_date'],
+                log=lambda message: self.stdout.write(f"  {message}"),
+            )
+        except Exception as e:
+            raise CommandError(f"Seeding failed (re-run with --flush if a previous fest exists): {e}")
+
+        elapsed = time.perf_counter() - started
+        summary = ', '.join(f"{count} {name.replace('_', ' ')}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Seeded {summary} in {elapsed:.1f}s"))
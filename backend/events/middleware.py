@@ -0,0 +1,169 @@
+"""
+Opt-in request instrumentation.
+
+RequestMetricsMiddleware wraps every database query made while serving a
+request to count queries, time them and fingerprint their SQL, so repeated
+statements (the usual N+1 signature) show up per endpoint. Per-route samples
+are kept in memory for the admin metrics endpoint (p50/p95), and requests
+over the configured thresholds are written to the 'events.slow_requests'
+log as one JSON object per line.
+
+Enable with REQUEST_METRICS=true; otherwise the middleware removes itself at
+startup and costs nothing.
+"""
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+slow_request_logger = logging.getLogger('events.slow_requests')
+
+_IN_LIST = re.compile(r'\bIN \((?:%s|\?)(?:, ?(?:%s|\?))*\)', re.IGNORECASE)
+_NUMBER = re.compile(r'\b\d+\b')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+def fingerprint(sql):
+    """SQL with literals and IN lists collapsed, so the same statement with different values matches"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+class RouteMetrics:
+    """Recent (wall ms, query count, db ms) samples per route, shared by all threads of the process"""
+
+    def __init__(self, max_samples):
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._totals = Counter()
+
+    def record(self, route, wall_ms, queries, db_ms):
+        with self._lock:
+            samples = self._samples.get(route)
+            if samples is None:
+                samples = self._samples[route] = deque(maxlen=self.max_samples)
+            samples.append((wall_ms, queries, db_ms))
+            self._totals[route] += 1
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+
+    def summary(self):
+        """Per-route request count and p50/p95 of wall time, queries and DB time, slowest p95 first"""
+        with self._lock:
+            snapshot = {route: list(samples) for route, samples in self._samples.items()}
+            totals = dict(self._totals)
+
+        routes = []
+        for route, samples in snapshot.items():
+            wall = [sample[0] for sample in samples]
+            queries = [sample[1] for sample in samples]
+            db = [sample[2] for sample in samples]
+            routes.append({
+                'route': route,
+                'requests': totals[route],
+                'samples': len(samples),
+                'p50_ms': round(percentile(wall, 0.5), 1),
+                'p95_ms': round(percentile(wall, 0.95), 1),
+                'max_ms': round(max(wall), 1),
+                'p50_queries': percentile(queries, 0.5),
+                'p95_queries': percentile(queries, 0.95),
+                'p50_db_ms': round(percentile(db, 0.5), 1),
+                'p95_db_ms': round(percentile(db, 0.95), 1),
+            })
+        routes.sort(key=lambda row: row['p95_ms'], reverse=True)
+        return routes
+
+
+# Process-wide store read by the admin metrics endpoint
+route_metrics = RouteMetrics(getattr(settings, 'REQUEST_METRICS_SAMPLES', 500))
+
+
+class QueryRecorder:
+    """connection.execute_wrapper callback that counts, times and fingerprints queries"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def duplicates(self, limit=5):
+        """Most repeated statements as (count, fingerprint), repeats only"""
+        return [(count, sql) for sql, count in self.fingerprints.most_common(limit) if count > 1]
+
+
+class RequestMetricsMiddleware:
+    """Record query count, DB time, duplicate queries and wall time for every request"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'REQUEST_METRICS_SLOW_MS', 1000)
+        self.slow_queries = getattr(settings, 'REQUEST_METRICS_SLOW_QUERIES', 50)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        wall_ms = (time.perf_counter() - started) * 1000
+        db_ms = recorder.duration * 1000
+
+        route = self._route_name(request)
+        route_metrics.record(route, wall_ms, recorder.count, db_ms)
+        response['Server-Timing'] = f'db;dur={db_ms:.1f}, total;dur={wall_ms:.1f}'
+
+        if wall_ms >= self.slow_ms or recorder.count >= self.slow_queries:
+            user = getattr(request, 'user', None)
+            slow_request_logger.warning(json.dumps({
+                'route': route,
+                # Query values may carry tokens or personal data, so only their names are logged
+                'path': request.path,
+                'query_params': sorted(request.GET.keys()),
+                'status': response.status_code,
+                'user_id': user.pk if user is not None and user.is_authenticated else None,
+                'wall_ms': round(wall_ms, 1),
+                'db_ms': round(db_ms, 1),
+                'queries': recorder.count,
+                'duplicate_queries': sum(count - 1 for count in recorder.fingerprints.values()),
+                'top_duplicates': [
+                    {'count': count, 'sql': sql[:500]} for count, sql in recorder.duplicates()
+                ],
+            }))
+        return response
+
+    def _route_name(self, request):
+        """'METHOD url-name' for resolved requests (one bucket per route, not per id)"""
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return f'{request.method} <unresolved>'
+        return f'{request.method} {match.view_name or match.route}'
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:43
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_points_totals(apps, schema_editor):
+    """Populate the running totals from existing points records"""
+    PointsRecord = apps.get_model('events', 'PointsRecord')
+    TeamEventPoints = apps.get_model('events', 'TeamEventPoints')
+    StudentEventPoints = apps.get_model('events', 'StudentEventPoints')
+
+    team_totals = PointsRecord.objects.filter(
+        event__isnull=False, team__isnull=False
+    ).values('event_id', 'team_id').annotate(total=models.Sum('points'))
+    TeamEventPoints.objects.bulk_create([
+        TeamEventPoints(event_id=row['event_id'], team_id=row['team_id'], points=row['total'] or 0)
+        for row in team_totals
+    ])
+
+    student_totals = PointsRecord.objects.filter(
+        event__isnull=False, student__isnull=False
+    ).values('event_id', 'student_id').annotate(total=models.Sum('points'))
+    StudentEventPoints.objects.bulk_create([
+        StudentEventPoints(event_id=row['event_id'], student_id=row['student_id'], points=row['total'] or 0)
+        for row in student_totals
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('events', '0023_update_open_to_general'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamEventPoints',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('points', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='events.event')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_points', to='events.team')),
+            ],
+            options={
+                'default_related_name': 'team_points_totals',
+                'unique_together': {('event', 'team')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentEventPoints',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('points', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='events.event')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_points', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'default_related_name': 'student_points_totals',
+                'unique_together': {('event', 'student')},
+            },
+        ),
+        migrations.RunPython(build_points_totals, migrations.RunPython.noop),
+    ]
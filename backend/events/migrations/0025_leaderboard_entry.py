@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_leaderboard(apps, schema_editor):
+    """Populate the leaderboard from existing program results"""
+    ProgramResult = apps.get_model('events', 'ProgramResult')
+    LeaderboardEntry = apps.get_model('events', 'LeaderboardEntry')
+
+    results = ProgramResult.objects.filter(points_earned__gt=0)
+    entries = []
+    for row in results.values('program__event_id').annotate(points=models.Sum('points_earned')):
+        entries.append(LeaderboardEntry(event_id=row['program__event_id'], points=row['points']))
+    for row in results.filter(team__isnull=False).values('program__event_id', 'team_id').annotate(points=models.Sum('points_earned')):
+        entries.append(LeaderboardEntry(event_id=row['program__event_id'], team_id=row['team_id'], points=row['points']))
+    for row in results.filter(program__is_team_based=False).values('program__event_id', 'participant_id').annotate(points=models.Sum('points_earned')):
+        entries.append(LeaderboardEntry(event_id=row['program__event_id'], student_id=row['participant_id'], points=row['points']))
+    LeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('events', '0024_points_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('points', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='events.event')),
+                ('student', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL)),
+                ('team', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='events.team')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(condition=models.Q(('team__isnull', True), ('student__isnull', True)), fields=('event',), name='unique_leaderboard_total_per_event'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(condition=models.Q(('team__isnull', False)), fields=('event', 'team'), name='unique_leaderboard_team_per_event'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(condition=models.Q(('student__isnull', False)), fields=('event', 'student'), name='unique_leaderboard_student_per_event'),
+        ),
+        migrations.RunPython(build_leaderboard, migrations.RunPython.noop),
+    ]
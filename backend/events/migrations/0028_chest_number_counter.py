@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0027_report_cache_entry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChestNumberCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('range_start', models.PositiveIntegerField()),
+                ('next_number', models.PositiveIntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chest_number_counters', to='events.event')),
+            ],
+            options={
+                'unique_together': {('event', 'range_start')},
+            },
+        ),
+    ]
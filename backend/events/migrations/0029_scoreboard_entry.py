@@ -0,0 +1,103 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:02
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_scoreboard(apps, schema_editor):
+    """Populate the scoreboard from existing marked program results"""
+    ProgramResult = apps.get_model('events', 'ProgramResult')
+    ProgramAssignment = apps.get_model('events', 'ProgramAssignment')
+    ChestNumber = apps.get_model('events', 'ChestNumber')
+    ScoreboardEntry = apps.get_model('events', 'ScoreboardEntry')
+
+    chest_numbers = {
+        (row['event_id'], row['student_id']): row['chest_number']
+        for row in ChestNumber.objects.values('event_id', 'student_id', 'chest_number')
+    }
+    assignment_numbers = {
+        (row['program_id'], row['student_id']): row['chest_number']
+        for row in ProgramAssignment.objects.filter(chest_number__isnull=False).values('program_id', 'student_id', 'chest_number')
+    }
+
+    entries = []
+    results = ProgramResult.objects.filter(average_marks__isnull=False).select_related('program', 'participant', 'team')
+    for result in results.iterator():
+        program = result.program
+        participant = result.participant
+        if participant.name:
+            full_name = participant.name
+        elif participant.first_name or participant.last_name:
+            full_name = f"{participant.first_name} {participant.last_name}".strip()
+        else:
+            full_name = participant.email or participant.username
+        entries.append(ScoreboardEntry(
+            event_id=program.event_id,
+            program_id=program.id,
+            result_id=result.id,
+            program_name=program.name,
+            program_category=program.category,
+            is_team_based=program.is_team_based,
+            participant_id=participant.id,
+            participant_name=full_name or '',
+            participant_display_name=participant.name or participant.email or participant.username or '',
+            participant_code=participant.student_id,
+            team_id=result.team_id,
+            team_name=result.team.name if result.team else None,
+            chest_number=assignment_numbers.get((program.id, participant.id)) or chest_numbers.get((program.event_id, participant.id)),
+            result_number=result.result_number,
+            judge1_marks=result.judge1_marks,
+            judge2_marks=result.judge2_marks,
+            judge3_marks=result.judge3_marks,
+            total_marks=result.total_marks,
+            average_marks=result.average_marks,
+            position=result.position,
+            points_earned=result.points_earned,
+            comments=result.comments or '',
+        ))
+    ScoreboardEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('events', '0028_chest_number_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('program_name', models.CharField(max_length=200)),
+                ('program_category', models.CharField(max_length=20)),
+                ('is_team_based', models.BooleanField(default=False)),
+                ('participant_name', models.CharField(blank=True, max_length=255)),
+                ('participant_display_name', models.CharField(blank=True, max_length=255)),
+                ('participant_code', models.CharField(blank=True, max_length=50, null=True)),
+                ('team_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('chest_number', models.PositiveIntegerField(blank=True, null=True)),
+                ('result_number', models.IntegerField(blank=True, null=True)),
+                ('judge1_marks', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('judge2_marks', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('judge3_marks', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('total_marks', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('average_marks', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('position', models.IntegerField(blank=True, null=True)),
+                ('points_earned', models.IntegerField(default=0)),
+                ('comments', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scoreboard_entries', to='events.event')),
+                ('participant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scoreboard_entries', to=settings.AUTH_USER_MODEL)),
+                ('program', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scoreboard_entries', to='events.program')),
+                ('result', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='scoreboard_entry', to='events.programresult')),
+                ('team', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='scoreboard_entries', to='events.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['event', 'position', 'program_category', 'program_name'], name='scoreboard_event_position'), models.Index(fields=['program', 'result_number', 'position'], name='scoreboard_program_order')],
+            },
+        ),
+        migrations.RunPython(build_scoreboard, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0029_scoreboard_entry'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chestnumber',
+            index=models.Index(fields=['event', 'team', 'chest_number'], name='chest_event_team_number'),
+        ),
+        migrations.AddIndex(
+            model_name='pointsrecord',
+            index=models.Index(condition=models.Q(('team__isnull', False)), fields=['team', 'event'], name='points_team_event'),
+        ),
+        migrations.AddIndex(
+            model_name='pointsrecord',
+            index=models.Index(condition=models.Q(('student__isnull', False)), fields=['student', 'event'], name='points_student_event'),
+        ),
+        migrations.AddIndex(
+            model_name='programassignment',
+            index=models.Index(fields=['team', 'chest_number'], name='assignment_team_chest'),
+        ),
+        migrations.AddIndex(
+            model_name='programresult',
+            index=models.Index(condition=models.Q(('average_marks__isnull', False)), fields=['program', '-average_marks', '-total_marks'], name='result_program_ranked'),
+        ),
+        migrations.AddIndex(
+            model_name='programresult',
+            index=models.Index(condition=models.Q(('team__isnull', False)), fields=['team', 'points_earned'], name='result_team_points'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0031_live_update'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportjob',
+            name='progress_done',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='reportjob',
+            name='progress_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:57
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0033_data_version'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='teameventpoints',
+            unique_together=None,
+        ),
+        migrations.RemoveField(
+            model_name='teameventpoints',
+            name='event',
+        ),
+        migrations.RemoveField(
+            model_name='teameventpoints',
+            name='team',
+        ),
+        migrations.DeleteModel(
+            name='StudentEventPoints',
+        ),
+        migrations.DeleteModel(
+            name='TeamEventPoints',
+        ),
+    ]
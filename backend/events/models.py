@@ -67,17 +67,22 @@ class Event(models.Model):
     def __str__(self):
         return self.title
     
+    @property
+    def participating_teams(self):
+        """Teams take part in an event through their program assignments"""
+        return Team.objects.filter(program_assignments__program__event=self).distinct()
+
     @property
     def current_participants(self):
         if self.is_team_based:
-            return sum(team.members.count() for team in self.teams.all())
+            return User.objects.filter(team_memberships__in=self.participating_teams).distinct().count()
         else:
             return self.individual_participants.count()
     
     @property
     def current_teams(self):
         if self.is_team_based:
-            return self.teams.count()
+            return self.participating_teams.count()
         return 0
     
     @property
@@ -101,26 +106,47 @@ class Event(models.Model):
         """Override delete method to automatically clean up all related data"""
         # Note: Teams are no longer linked to events, so we don't delete teams here
         # Teams can participate in multiple events, so deleting an event shouldn't delete teams
+        from .data_version import batched_data_version_bumps
         
-        # Delete all individual participations for this event
-        self.individual_participants.all().delete()
-        
-        # Delete all programs for this event (this will cascade to clean up program-related data)
-        self.programs.all().delete()
-        
-        # Delete all announcements for this event
-        self.announcements.all().delete()
-        
-        # Delete all chest numbers for this event
-        from .models import ChestNumber
-        ChestNumber.objects.filter(event=self).delete()
-        
-        # Delete all points records for this event
-        from .models import PointsRecord
-        PointsRecord.objects.filter(event=self).delete()
+        # The per-row delete signals below bump the report data version once
+        with batched_data_version_bumps():
+            # Delete all individual participations for this event
+            self.individual_participants.all().delete()
+            
+            # Delete all programs for this event (this will cascade to clean up program-related data)
+            self.programs.all().delete()
+            
+            # Delete all announcements for this event
+            self.announcements.all().delete()
+            
+            # Delete all chest numbers for this event
+            from .models import ChestNumber
+            ChestNumber.objects.filter(event=self).delete()
+            
+            # Delete all points records for this event
+            from .models import PointsRecord
+            PointsRecord.objects.filter(event=self).delete()
+            
+            # Call the parent delete method
+            super().delete(*args, **kwargs)
+
+class TeamQuerySet(models.QuerySet):
+    def delete(self):
+        """Delete the teams one by one through Team.delete, which also removes their related data"""
+        from django.db import transaction
         
-        # Call the parent delete method
-        super().delete(*args, **kwargs)
+        deleted = 0
+        per_model = {}
+        with transaction.atomic():
+            for team in self:
+                count, counts = team.delete()
+                deleted += count
+                for label, label_count in counts.items():
+                    per_model[label] = per_model.get(label, 0) + label_count
+        return deleted, per_model
+    
+    delete.alters_data = True
+    delete.queryset_only = True
 
 class Team(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -142,6 +168,8 @@ class Team(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = TeamQuerySet.as_manager()
+    
     class Meta:
         ordering = ['name']
         
@@ -165,14 +193,49 @@ class Team(models.Model):
     @classmethod
     def reset_team_numbering(cls):
         """Reset team numbering to be sequential (1, 2, 3, etc.) based on creation order"""
-        # Get all teams ordered by creation date
-        teams = cls.objects.all().order_by('created_at')
+        from django.db import connection, transaction
+        from .data_version import schedule_data_version_bump
         
-        # Renumber teams sequentially starting from 1
-        for index, team in enumerate(teams, start=1):
-            if team.team_number != index:
-                team.team_number = index
-                team.save(update_fields=['team_number'])
+        table = connection.ops.quote_name(cls._meta.db_table)
+        with transaction.atomic():
+            # Neither path sends save signals, and team numbers are printed on reports
+            schedule_data_version_bump(shared=True)
+            if connection.vendor in ('postgresql', 'sqlite'):
+                # team_number is unique, so clear the numbers that change first and
+                # then assign the new ones; both are single window-function UPDATEs
+                numbered = f"SELECT id, ROW_NUMBER() OVER (ORDER BY created_at, id) AS new_number FROM {table}"
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"UPDATE {table} SET team_number = NULL FROM ({numbered}) AS numbered "
+                        f"WHERE {table}.id = numbered.id AND {table}.team_number IS NOT NULL "
+                        f"AND {table}.team_number <> numbered.new_number"
+                    )
+                    cursor.execute(
+                        f"UPDATE {table} SET team_number = numbered.new_number FROM ({numbered}) AS numbered "
+                        f"WHERE {table}.id = numbered.id AND {table}.team_number IS NULL"
+                    )
+                return
+            
+            # Other databases: compute the numbering here and write it in two bulk updates
+            changed = [
+                cls(id=team_id, team_number=new_number)
+                for team_id, new_number, old_number in cls.renumbering_plan()
+            ]
+            cleared = [cls(id=team.id, team_number=None) for team in changed]
+            cls.objects.bulk_update(cleared, ['team_number'])
+            cls.objects.bulk_update(changed, ['team_number'])
+    
+    @classmethod
+    def renumbering_plan(cls, exclude_id=None):
+        """(team id, new number, old number) for every team whose number reset_team_numbering would change"""
+        teams = cls.objects.order_by('created_at', 'id').values_list('id', 'team_number')
+        if exclude_id is not None:
+            teams = teams.exclude(id=exclude_id)
+        return [
+            (team_id, index, team_number)
+            for index, (team_id, team_number) in enumerate(teams, start=1)
+            if team_number != index
+        ]
     
     @classmethod
     def get_next_team_number(cls):
@@ -183,6 +246,56 @@ class Team(models.Model):
         )['max_number']
         return (max_number or 0) + 1
     
+    @classmethod
+    def get_or_create_by_names(cls, names):
+        """
+        Map team names to teams case-insensitively, creating the missing ones in one insert.
+        
+        Returns ({lowercased name: team}, set of lowercased names that were created).
+        New teams get contiguous numbers after the highest one in use and their
+        team manager credentials, as save() would give them one by one.
+        """
+        wanted = {}
+        for name in names:
+            wanted.setdefault(name.strip().lower(), name.strip())
+        wanted.pop('', None)
+        
+        # Teams are few, so one pass over all of them builds the case-insensitive map
+        teams = {}
+        taken_usernames = set()
+        for team in cls.objects.order_by('name'):
+            teams.setdefault(team.name.lower(), team)
+            taken_usernames.add(team.team_username)
+        
+        missing = [name for key, name in wanted.items() if key not in teams]
+        if not missing:
+            return {key: teams[key] for key in wanted}, set()
+        
+        first_number = cls.get_next_team_number()
+        new_teams = []
+        for offset, name in enumerate(missing):
+            # Same username scheme as generate_team_credentials, checked against the snapshot
+            base_username = f"{name.lower().replace(' ', '_').replace('-', '_')}_team"
+            team_username = base_username
+            counter = 1
+            while team_username in taken_usernames:
+                team_username = f"{base_username}_{counter}"
+                counter += 1
+            taken_usernames.add(team_username)
+            new_teams.append(cls(
+                name=name,
+                team_number=first_number + offset,
+                team_username=team_username,
+                team_password=''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(8)),
+            ))
+        
+        for team in cls.objects.bulk_create(new_teams):
+            teams[team.name.lower()] = team
+        
+        from .data_version import schedule_data_version_bump
+        schedule_data_version_bump(shared=True)
+        return {key: teams[key] for key in wanted}, {name.lower() for name in missing}
+    
     @property
     def member_count(self):
         # Count all team members
@@ -238,68 +351,72 @@ class Team(models.Model):
             }
         return None
     
-    def delete(self, *args, **kwargs):
-        """Override delete method to automatically clean up related data"""
-        # Store the team number before deletion for potential renumbering
-        team_number = self.team_number
+    def delete(self, *args, dry_run=False, **kwargs):
+        """Override delete method to automatically clean up related data
+        
+        The team's assignments, results, chest numbers and points records are
+        removed with set-based deletes, then the remaining teams are renumbered,
+        all in one transaction. Queryset deletes come through here too (see
+        TeamQuerySet). With dry_run nothing is changed and
+        the deletion_preview() summary is returned instead.
+        """
+        if dry_run:
+            return self.deletion_preview()
+        
+        from django.db import transaction
+        from .data_version import batched_data_version_bumps
+        
+        with transaction.atomic(), batched_data_version_bumps():
+            # Clear related rows up front so Django's delete collector has
+            # nothing left to load and signal one row at a time
+            self.delete_related_data()
+            result = super().delete(*args, **kwargs)
+            
+            # After deletion, reset team numbering to ensure sequential numbering
+            Team.reset_team_numbering()
+        return result
+    
+    def delete_related_data(self):
+        """Delete this team's assignments, results, chest numbers and points records with set-based deletes"""
+        from .leaderboard import batched_leaderboard_refreshes
+        from .scoreboard import batched_scoreboard_refreshes
         
-        # Get all students who were in this team
-        team_members = list(self.members.all())
+        # Remember the members for cleanup_orphaned_assignments (the memberships go with the team)
+        if not hasattr(self, '_former_member_ids'):
+            self._former_member_ids = list(self.members.values_list('id', flat=True))
         
         # Delete all program assignments for this team
-        from .models import ProgramAssignment
         ProgramAssignment.objects.filter(team=self).delete()
         
-        # Delete all program results for this team
-        from .models import ProgramResult
-        ProgramResult.objects.filter(team=self).delete()
+        # Delete all program results for this team, rebuilding each affected
+        # scoreboard and leaderboard once rather than once per result
+        with batched_scoreboard_refreshes(), batched_leaderboard_refreshes():
+            ProgramResult.objects.filter(team=self).delete()
         
         # Delete all chest numbers for this team
-        from .models import ChestNumber
         ChestNumber.objects.filter(team=self).delete()
         
-        # Delete all points records for this team
-        from .models import PointsRecord
+        # Delete all points records for this team (the ledger signal takes records
+        # that also credit a student off that student's total)
         PointsRecord.objects.filter(team=self).delete()
-        
-        # Delete team profile if exists
-        if hasattr(self, 'profile'):
-            self.profile.delete()
-        
-        # Call the parent delete method
-        super().delete(*args, **kwargs)
-        
-        # After deletion, reset team numbering to ensure sequential numbering
-        Team.reset_team_numbering()
-        
-        # Clean up any orphaned program assignments for students who were in this team
-        # This ensures students get new chest numbers when assigned to new teams
-        for student in team_members:
-            # Remove team reference from any remaining program assignments
-            orphaned_assignments = ProgramAssignment.objects.filter(
-                student=student,
-                team__isnull=False
-            ).exclude(
-                team__in=Team.objects.all()
-            )
-            
-            for assignment in orphaned_assignments:
-                assignment.team = None
-                assignment.chest_number = None  # Remove chest number so it gets regenerated
-                assignment.save()
-            
-            # Remove team reference from any remaining chest numbers
-            orphaned_chest_numbers = ChestNumber.objects.filter(
-                student=student,
-                team__isnull=False
-            ).exclude(
-                team__in=Team.objects.all()
-            )
-            
-            for chest_number in orphaned_chest_numbers:
-                chest_number.team = None
-                chest_number.chest_number = None  # Remove chest number so it gets regenerated
-                chest_number.save()
+    
+    def deletion_preview(self):
+        """What deleting this team would remove and how the other teams would be renumbered"""
+        related_data = self.get_related_data_summary()
+        team_numbers = dict(Team.objects.exclude(id=self.id).values_list('id', 'team_number'))
+        names = dict(Team.objects.exclude(id=self.id).values_list('id', 'name'))
+        return {
+            'team_id': self.id,
+            'team_name': self.name,
+            'team_number': self.team_number,
+            'member_count': self.members.count(),
+            'related_data': related_data,
+            'total_records': sum(related_data.values()),
+            'renumbering': [
+                {'id': team_id, 'name': names[team_id], 'old_number': team_numbers[team_id], 'new_number': new_number}
+                for team_id, new_number, old_number in Team.renumbering_plan(exclude_id=self.id)
+            ],
+        }
     
     def has_assignments(self):
         """Check if this team has any program assignments"""
@@ -381,30 +498,123 @@ class PointsRecord(models.Model):
     
     class Meta:
         ordering = ['-awarded_at']
+        indexes = [
+            # Ledger lookups per team/student, optionally within one event
+            models.Index(fields=['team', 'event'], name='points_team_event', condition=models.Q(team__isnull=False)),
+            models.Index(fields=['student', 'event'], name='points_student_event', condition=models.Q(student__isnull=False)),
+        ]
     
     def __str__(self):
         recipient = self.team.name if self.team else self.student.display_name
         return f"{recipient}: {self.points} pts ({self.reason})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what this record contributed to the running totals when it was loaded
+        instance._ledger_state = instance._get_ledger_state()
+        return instance
+    
+    def _get_ledger_state(self):
+        """Return the (team_id, student_id, points) this record contributes to the totals"""
+        return (
+            self.__dict__.get('team_id'),
+            self.__dict__.get('student_id'),
+            self.__dict__.get('points') or 0,
+        )
+    
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # Update total points when record is saved
-        self.update_total_points()
+        from django.db import transaction
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            
+            # Refresh the running totals of whoever this save changed points for
+            previous = getattr(self, '_ledger_state', None)
+            current = self._get_ledger_state()
+            if previous != current:
+                if previous and previous[:2] != current[:2]:
+                    PointsRecord.refresh_totals(*previous[:2])
+                PointsRecord.refresh_totals(*current[:2])
+            self._ledger_state = current
+    
+    @staticmethod
+    def clamped_total(recipient):
+        """
+        Expression for the ledger sum of the outer Team (recipient='team') or User
+        (recipient='student') row, floored at zero.
+        
+        Team.points_earned and User.total_points are unsigned, so this is the one
+        rule for both the running totals and reconcile_points. Clamping each
+        increment instead would drift from it once penalties exist.
+        """
+        from django.db.models.functions import Coalesce, Greatest
+        
+        ledger_sum = PointsRecord.objects.filter(**{recipient: models.OuterRef('pk')}).order_by().values(
+            recipient
+        ).annotate(total=models.Sum('points')).values('total')
+        return Greatest(Coalesce(models.Subquery(ledger_sum), 0), 0)
+    
+    @staticmethod
+    def refresh_totals(team_id, student_id):
+        """Recompute the team and student running totals after their ledger changed"""
+        if team_id:
+            # Lock the row first: the sum then sees every record committed by a
+            # concurrent writer that got the lock before us
+            list(Team.objects.select_for_update().filter(pk=team_id).values_list('pk'))
+            Team.objects.filter(pk=team_id).update(points_earned=PointsRecord.clamped_total('team'))
+        
+        if student_id:
+            list(User.objects.select_for_update().filter(pk=student_id).values_list('pk'))
+            User.objects.filter(pk=student_id).update(total_points=PointsRecord.clamped_total('student'))
     
     def update_total_points(self):
-        """Update total points for team or student"""
+        """Recalculate total points for team or student from all records (slow path, see reconcile_points)"""
+        if self.team_id:
+            Team.objects.filter(pk=self.team_id).update(points_earned=PointsRecord.clamped_total('team'))
+        if self.student_id:
+            User.objects.filter(pk=self.student_id).update(total_points=PointsRecord.clamped_total('student'))
+
+class LeaderboardEntry(models.Model):
+    """Materialized per-event points for the global leaderboard.
+
+    A row with neither team nor student holds the event's total points;
+    team and student rows hold their share. Rows are rebuilt per event
+    whenever a ranking in that event changes (see events/leaderboard.py).
+    """
+    event = models.ForeignKey('Event', on_delete=models.CASCADE, related_name='leaderboard_entries')
+    team = models.ForeignKey('Team', on_delete=models.CASCADE, null=True, blank=True, related_name='leaderboard_entries')
+    student = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='leaderboard_entries')
+    points = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event'],
+                condition=models.Q(team__isnull=True) & models.Q(student__isnull=True),
+                name='unique_leaderboard_total_per_event'
+            ),
+            models.UniqueConstraint(
+                fields=['event', 'team'],
+                condition=models.Q(team__isnull=False),
+                name='unique_leaderboard_team_per_event'
+            ),
+            models.UniqueConstraint(
+                fields=['event', 'student'],
+                condition=models.Q(student__isnull=False),
+                name='unique_leaderboard_student_per_event'
+            ),
+        ]
+    
+    def __str__(self):
         if self.team:
-            total = PointsRecord.objects.filter(team=self.team).aggregate(
-                total=models.Sum('points')
-            )['total'] or 0
-            self.team.points_earned = total
-            self.team.save()
+            recipient = self.team.name
         elif self.student:
-            total = PointsRecord.objects.filter(student=self.student).aggregate(
-                total=models.Sum('points')
-            )['total'] or 0
-            self.student.total_points = total
-            self.student.save()
+            recipient = self.student.display_name
+        else:
+            recipient = 'Total'
+        return f"{self.event.title} - {recipient}: {self.points} pts"
 
 class TeamProfile(models.Model):
     """Extended team profile with additional details"""
@@ -494,6 +704,15 @@ class Program(models.Model):
         else:
             return 'scheduled'
     
+    @property
+    def team_size_min(self):
+        # Programs have one fixed team size; the team-manager views still read it as a range
+        return self.team_size
+
+    @property
+    def team_size_max(self):
+        return self.team_size
+
     @property
     def duration_minutes(self):
         """Calculate duration in minutes if both start and end times are set"""
@@ -514,6 +733,13 @@ class Program(models.Model):
         if self.is_team_based and not self.team_size:
             raise ValidationError("Team-based programs must have a team size specified")
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored finished flag so saves can tell when a program becomes finished
+        instance._loaded_is_finished = instance.__dict__.get('is_finished')
+        return instance
+    
     def save(self, *args, **kwargs):
         # Auto-enforce that HS and HSS programs are individual
         if self.category in ['hs', 'hss']:
@@ -528,14 +754,17 @@ class Program(models.Model):
     
     def delete(self, *args, **kwargs):
         """Override delete method to automatically clean up all related data"""
-        # Delete all program assignments for this program
-        self.assignments.all().delete()
+        from .data_version import batched_data_version_bumps
         
-        # Delete all program results for this program
-        self.results.all().delete()
-        
-        # Call the parent delete method
-        super().delete(*args, **kwargs)
+        with batched_data_version_bumps():
+            # Delete all program assignments for this program
+            self.assignments.all().delete()
+            
+            # Delete all program results for this program
+            self.results.all().delete()
+            
+            # Call the parent delete method
+            super().delete(*args, **kwargs)
 
 class ProgramAssignment(models.Model):
     program = models.ForeignKey(Program, on_delete=models.CASCADE, related_name='assignments')
@@ -547,6 +776,10 @@ class ProgramAssignment(models.Model):
 
     class Meta:
         unique_together = ['program', 'student']
+        indexes = [
+            # Team rosters in chest number order
+            models.Index(fields=['team', 'chest_number'], name='assignment_team_chest'),
+        ]
 
     def __str__(self):
         return f"{self.student.display_name} - {self.program.name}"
@@ -598,60 +831,10 @@ class ProgramAssignment(models.Model):
             
             # Auto-generate chest number if not provided
             if not self.chest_number:
-                if self.team:
-                    # For team-based programs, use team-based numbering
-                    team_base = self.team.team_number * 100  # Team 1: 100-199, Team 2: 200-299, etc.
-                    
-                    # Find the next available chest number in this team's range for this event
-                    # Check both ProgramAssignment and ChestNumber models
-                    max_chest_assignment = ProgramAssignment.objects.filter(
-                        program__event=self.program.event,
-                        team=self.team,
-                        chest_number__gte=team_base,
-                        chest_number__lt=team_base + 100
-                    ).aggregate(max_chest=models.Max('chest_number'))['max_chest']
-                    
-                    max_chest_chest = ChestNumber.objects.filter(
-                        event=self.program.event,
-                        team=self.team,
-                        chest_number__gte=team_base,
-                        chest_number__lt=team_base + 100
-                    ).aggregate(max_chest=models.Max('chest_number'))['max_chest']
-                    
-                    max_chest = max(max_chest_assignment or 0, max_chest_chest or 0)
-                    
-                    if max_chest >= team_base:
-                        self.chest_number = max_chest + 1
-                    else:
-                        self.chest_number = team_base  # Start from team_base (e.g., 100, 200, 300)
-                else:
-                    # For general category (open) programs without teams, use dynamic starting number
-                    # based on total number of teams in the event
-                    total_teams = Team.objects.count()
-                    
-                    # Calculate starting number for general category
-                    # 2 teams = start from 300, 3 teams = start from 400, etc.
-                    general_start = (total_teams + 1) * 100
-                    
-                    # Find the next available chest number in general range for this event
-                    max_chest_assignment = ProgramAssignment.objects.filter(
-                        program__event=self.program.event,
-                        team__isnull=True,
-                        chest_number__gte=general_start
-                    ).aggregate(max_chest=models.Max('chest_number'))['max_chest']
-                    
-                    max_chest_chest = ChestNumber.objects.filter(
-                        event=self.program.event,
-                        team__isnull=True,
-                        chest_number__gte=general_start
-                    ).aggregate(max_chest=models.Max('chest_number'))['max_chest']
-                    
-                    max_chest = max(max_chest_assignment or 0, max_chest_chest or 0)
-                    
-                    if max_chest >= general_start:
-                        self.chest_number = max_chest + 1
-                    else:
-                        self.chest_number = general_start  # Start from calculated general start
+                from .chest_numbers import reserve_chest_numbers
+                # Team N uses N*100-N*100+99; participants without a team use the
+                # general range after the last team (2 teams -> 300, 3 teams -> 400, ...)
+                self.chest_number = reserve_chest_numbers(self.program.event_id, self.team)[0]
         
         # Generate chest code for the student if not already generated
         if not self.student.chest_code:
@@ -704,10 +887,17 @@ class ProgramResult(models.Model):
     class Meta:
         unique_together = ['program', 'participant']  # Use original field name
         ordering = ['-average_marks', '-total_marks']
+        indexes = [
+            # Ranking reads only the marked results of a program, best first
+            models.Index(
+                fields=['program', '-average_marks', '-total_marks'], name='result_program_ranked',
+                condition=models.Q(average_marks__isnull=False)
+            ),
+            # Team points totals
+            models.Index(fields=['team', 'points_earned'], name='result_team_points', condition=models.Q(team__isnull=False)),
+        ]
     
     def save(self, *args, **kwargs):
-        from decimal import Decimal, InvalidOperation
-        
         # Auto-sync team assignment from global team membership if not set
         if not self.team and self.participant.team_memberships.exists():
             self.team = self.participant.team_memberships.first()
@@ -716,7 +906,25 @@ class ProgramResult(models.Model):
         if not self.result_number and self.has_marks():
             self.assign_result_number()
         
-        # Calculate total and average marks with proper type conversion
+        # Calculate total and average marks
+        self.calculate_marks()
+        
+        super().save(*args, **kwargs)
+        
+        # Update positions and points for all results in this program
+        changed = self.update_program_rankings()
+        
+        # Distribute points to team and individual members, only for results
+        # whose ranking moved (this result is always refreshed as its marks changed)
+        for result in changed:
+            if result.pk != self.pk:
+                result.distribute_points_to_team_and_members()
+        self.distribute_points_to_team_and_members()
+    
+    def calculate_marks(self):
+        """Calculate total and average marks from the judges' marks with proper type conversion"""
+        from decimal import Decimal, InvalidOperation
+        
         marks = []
         if self.judge1_marks is not None:
             try:
@@ -740,14 +948,6 @@ class ProgramResult(models.Model):
         else:
             self.total_marks = None
             self.average_marks = None
-        
-        super().save(*args, **kwargs)
-        
-        # Update positions and points for all results in this program
-        self.update_program_rankings()
-        
-        # Distribute points to team and individual members
-        self.distribute_points_to_team_and_members()
     
     def has_marks(self):
         """Check if this result has any marks entered"""
@@ -785,8 +985,8 @@ class ProgramResult(models.Model):
             
             with transaction.atomic():
                 # Create or update PointsRecord for the team
-                point_type = 'event_winner' if self.position == 1 else 'event_runner_up' if self.position == 2 else 'event_participation'
-                position_text = 'Winner' if self.position == 1 else 'Runner-up' if self.position == 2 else f'{self.position}rd place' if self.position == 3 else f'{self.position}th place'
+                point_type, reason = self.points_record_key()
+                position_text = self.position_text()
                 
                 # Award points to team if it exists
                 if self.team:
@@ -794,7 +994,7 @@ class ProgramResult(models.Model):
                         team=self.team,
                         event=self.program.event,
                         point_type=point_type,
-                        reason=f'{self.program.name} - {position_text}',
+                        reason=reason,
                         defaults={
                             'points': self.points_earned,
                             'description': f'Points earned by {self.participant.get_full_name()} in {self.program.name}',
@@ -807,7 +1007,7 @@ class ProgramResult(models.Model):
                     student=self.participant,
                     event=self.program.event,
                     point_type=point_type,
-                    reason=f'{self.program.name} - {position_text}',
+                    reason=reason,
                     defaults={
                         'points': self.points_earned,
                         'description': f'Individual points for {position_text} in {self.program.name}',
@@ -815,68 +1015,144 @@ class ProgramResult(models.Model):
                     }
                 )
     
+    def position_text(self, position=None):
+        position = position or self.position
+        return 'Winner' if position == 1 else 'Runner-up' if position == 2 else f'{position}rd place' if position == 3 else f'{position}th place'
+    
+    def points_record_key(self, position=None):
+        """(point_type, reason) of the points records distribute_points_to_team_and_members writes for a position"""
+        position = position or self.position
+        point_type = 'event_winner' if position == 1 else 'event_runner_up' if position == 2 else 'event_participation'
+        return point_type, f'{self.program.name} - {self.position_text(position)}'
+    
+    def withdraw_position_points(self, position):
+        """Delete the points records this result's team and participant got for a former position.
+        
+        The records are keyed on the position, so a result that moved would
+        otherwise keep the points of its old place next to those of its new one.
+        Results now holding that position get their records back when their
+        points are distributed.
+        """
+        point_type, reason = self.points_record_key(position)
+        recipients = models.Q(student_id=self.participant_id)
+        if self.team_id:
+            recipients |= models.Q(team_id=self.team_id)
+        PointsRecord.objects.filter(
+            recipients, event_id=self.program.event_id, point_type=point_type, reason=reason
+        ).delete()
+    
+    def withdraw_points(self, team_id, participant_id):
+        """Delete the points records this result gave a former team and participant.
+        
+        Call after the result was saved with its new team/participant and before
+        distributing its points again. A team record that another result of the
+        program still earns (team programs share one per team and position) is kept.
+        """
+        point_type, reason = self.points_record_key()
+        records = PointsRecord.objects.filter(event_id=self.program.event_id, point_type=point_type, reason=reason)
+        
+        if participant_id and participant_id != self.participant_id:
+            records.filter(student_id=participant_id).delete()
+        
+        if team_id and team_id != self.team_id:
+            still_earned = ProgramResult.objects.filter(
+                program_id=self.program_id, team_id=team_id, position=self.position, points_earned__gt=0
+            ).exists()
+            if not still_earned:
+                records.filter(team_id=team_id).delete()
+    
     def update_program_rankings(self):
-        """Update positions and points for all results in this program"""
-        from django.db import transaction
+        """Update positions and points for all results in this program.
+
+        Returns the results whose position or points changed.
+        """
+        from .ranking import rank_program
         
-        with transaction.atomic():
-            # Get all results for this program, ordered by average marks
-            results = ProgramResult.objects.filter(
-                program=self.program
-            ).exclude(
-                average_marks__isnull=True
-            ).order_by('-average_marks', '-total_marks', 'participant__first_name')
-            
-            # Update positions and points
-            for index, result in enumerate(results, 1):
-                position = index
-                
-                # Assign points based on position, program category, and team-based status
-                if self.program.category in ['hs', 'hss']:
-                    # HS and HSS programs are always individual: 5, 3, 1 points
-                    if position == 1:
-                        points = 5
-                    elif position == 2:
-                        points = 3
-                    elif position == 3:
-                        points = 1
-                    else:
-                        points = 0
-                elif self.program.category == 'general':
-                    # General category programs: 10, 6, 3 points (both individual and team-based)
-                    if position == 1:
-                        points = 10
-                    elif position == 2:
-                        points = 6
-                    elif position == 3:
-                        points = 3
-                    else:
-                        points = 0
-                else:
-                    # Fallback for any other category
-                    if position == 1:
-                        points = 5
-                    elif position == 2:
-                        points = 3
-                    elif position == 3:
-                        points = 1
-                    else:
-                        points = 0
-                
-                # Update without triggering save recursion
-                ProgramResult.objects.filter(id=result.id).update(
-                    position=position,
-                    points_earned=points
-                )
-                
-                # Distribute points for this result
-                if result.id != self.id:  # Don't distribute for self to avoid recursion
-                    updated_result = ProgramResult.objects.get(id=result.id)
-                    updated_result.distribute_points_to_team_and_members()
+        changed = rank_program(self.program)
+        
+        # Keep this instance in sync with the values that were written
+        for result in changed:
+            if result.pk == self.pk:
+                self.position = result.position
+                self.points_earned = result.points_earned
+                self.updated_at = result.updated_at
+        
+        return changed
     
     def __str__(self):
         return f"{self.participant.get_full_name()} - {self.program.name} - Position: {self.position or 'Unranked'}"
 
+class ScoreboardEntry(models.Model):
+    """Denormalized copy of a marked program result for the results read paths.
+
+    Holds everything the results summary, programs-with-results list and the
+    winners reports show (names, team, chest number, marks, position, points),
+    so they are served from one indexed table instead of joining the
+    write-heavy result tables. Rows are rebuilt per program whenever the
+    program is ranked (see events/scoreboard.py).
+    """
+    event = models.ForeignKey('Event', on_delete=models.CASCADE, related_name='scoreboard_entries')
+    program = models.ForeignKey('Program', on_delete=models.CASCADE, related_name='scoreboard_entries')
+    result = models.OneToOneField('ProgramResult', on_delete=models.CASCADE, related_name='scoreboard_entry')
+    program_name = models.CharField(max_length=200)
+    program_category = models.CharField(max_length=20)
+    is_team_based = models.BooleanField(default=False)
+    
+    participant = models.ForeignKey(User, on_delete=models.CASCADE, related_name='scoreboard_entries')
+    participant_name = models.CharField(max_length=255, blank=True)
+    participant_display_name = models.CharField(max_length=255, blank=True)
+    participant_code = models.CharField(max_length=50, blank=True, null=True)
+    team = models.ForeignKey('Team', on_delete=models.SET_NULL, null=True, blank=True, related_name='scoreboard_entries')
+    team_name = models.CharField(max_length=100, blank=True, null=True)
+    chest_number = models.PositiveIntegerField(null=True, blank=True)
+    
+    result_number = models.IntegerField(null=True, blank=True)
+    judge1_marks = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    judge2_marks = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    judge3_marks = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    total_marks = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
+    average_marks = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    position = models.IntegerField(null=True, blank=True)
+    points_earned = models.IntegerField(default=0)
+    comments = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['event', 'position', 'program_category', 'program_name'], name='scoreboard_event_position'),
+            models.Index(fields=['program', 'result_number', 'position'], name='scoreboard_program_order'),
+        ]
+    
+    def __str__(self):
+        return f"{self.program_name} #{self.position or '-'}: {self.participant_name}"
+
+class LiveUpdate(models.Model):
+    """A small change notification pushed to live results subscribers (see events/live.py).
+
+    Rows are appended when a program's ranking changes or it is marked
+    finished; every server process tails this table and fans new rows out
+    to its open event streams. Old rows are pruned as new ones arrive.
+    """
+    KIND_CHOICES = [
+        ('ranking', 'Ranking changed'),
+        ('program_finished', 'Program finished'),
+    ]
+    
+    event = models.ForeignKey('Event', on_delete=models.CASCADE, related_name='live_updates')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['event', 'id'], name='live_update_event_id'),
+            models.Index(fields=['created_at'], name='live_update_created'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} #{self.id} (event {self.event_id})"
+
 class ChestNumber(models.Model):
     """Track chest numbers for students participating in events"""
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='chest_numbers')
@@ -894,6 +1170,9 @@ class ChestNumber(models.Model):
             ['event', 'chest_number'],  # Unique chest numbers per event
         ]
         ordering = ['chest_number']
+        indexes = [
+            models.Index(fields=['event', 'team', 'chest_number'], name='chest_event_team_number'),
+        ]
     
     def __str__(self):
         return f"Chest #{self.chest_number} - {self.student.display_name} ({self.event.name})"
@@ -901,36 +1180,128 @@ class ChestNumber(models.Model):
     def save(self, *args, **kwargs):
         # Auto-generate chest number if not provided
         if not self.chest_number:
+            from .chest_numbers import reserve_chest_numbers
             if self.team and self.team.team_number:
-                # Get team-based chest number range using team_number
+                # Team-based range using team_number
                 # Team 1: 100-199, Team 2: 200-299, Team 3: 300-399, etc.
-                team_base = self.team.team_number * 100
-                
-                # Find the next available chest number in this team's range
-                max_chest = ChestNumber.objects.filter(
-                    event=self.event,
-                    team=self.team,
-                    chest_number__gte=team_base,
-                    chest_number__lt=team_base + 100
-                ).aggregate(max_chest=models.Max('chest_number'))['max_chest']
-                
-                if max_chest:
-                    self.chest_number = max_chest + 1
-                else:
-                    self.chest_number = team_base  # Start from team_base (e.g., 100, 200, 300)
+                self.chest_number = reserve_chest_numbers(self.event_id, self.team)[0]
             else:
                 # For individual assignments without teams, use general range starting from 1
                 # This avoids conflicts with team-based chest numbers (100+)
-                max_chest = ChestNumber.objects.filter(
-                    event=self.event,
-                    team__isnull=True,
-                    chest_number__lt=100  # Keep individual assignments below 100
-                ).aggregate(max_chest=models.Max('chest_number'))['max_chest']
-                
-                self.chest_number = max(1, (max_chest or 0) + 1)
+                self.chest_number = reserve_chest_numbers(self.event_id, range_start=1, range_end=100)[0]
         
         super().save(*args, **kwargs)
 
+class ChestNumberCounter(models.Model):
+    """
+    Next free chest number for one range of an event (team N: N*100..N*100+99,
+    general range: open ended). Numbers are handed out by atomically bumping
+    next_number, so concurrent assignments never read the same MAX. Counters
+    are not rewound when assignments are deleted or teams renumbered, so a
+    range that looks full is checked against the numbers actually in use
+    before giving up.
+    """
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='chest_number_counters')
+    range_start = models.PositiveIntegerField()
+    next_number = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['event', 'range_start']
+    
+    def __str__(self):
+        return f"{self.event.title} {self.range_start}+: next {self.next_number}"
+    
+    @classmethod
+    def first_free_number(cls, event_id, range_start, range_end=None):
+        """Next number after the highest chest number already used in the range"""
+        lookup = {'chest_number__gte': range_start}
+        if range_end is not None:
+            lookup['chest_number__lt'] = range_end
+        max_chest = max(
+            ChestNumber.objects.filter(event_id=event_id, **lookup).aggregate(
+                max_chest=models.Max('chest_number'))['max_chest'] or 0,
+            ProgramAssignment.objects.filter(program__event_id=event_id, **lookup).aggregate(
+                max_chest=models.Max('chest_number'))['max_chest'] or 0,
+        )
+        return max(max_chest + 1, range_start)
+    
+    @classmethod
+    def first_free_block(cls, event_id, range_start, range_end, count):
+        """First number of `count` consecutive unused chest numbers in the range, or None"""
+        lookup = {'chest_number__gte': range_start, 'chest_number__lt': range_end}
+        used = set(ChestNumber.objects.filter(event_id=event_id, **lookup).values_list('chest_number', flat=True))
+        used.update(ProgramAssignment.objects.filter(
+            program__event_id=event_id, **lookup
+        ).values_list('chest_number', flat=True))
+        
+        block_start = range_start
+        for number in range(range_start, range_end):
+            if number in used:
+                block_start = number + 1
+            elif number - block_start + 1 == count:
+                return block_start
+        return None
+    
+    @classmethod
+    def reserve(cls, event_id, range_start, count=1, range_end=None):
+        """
+        Reserve `count` consecutive chest numbers in a range and return them as a range().
+        
+        When the counter would run past range_end, the counter is recomputed
+        from the highest number in use, then the range is scanned for a gap
+        left by deleted assignments. Raises ChestNumberRangeFull if neither
+        finds `count` free numbers.
+        """
+        from django.db import IntegrityError, transaction
+        from .chest_numbers import ChestNumberRangeFull
+        
+        with transaction.atomic():
+            # The UPDATE locks the counter row until the transaction commits
+            updated = cls.objects.filter(event_id=event_id, range_start=range_start).update(
+                next_number=models.F('next_number') + count,
+                updated_at=timezone.now()
+            )
+            if updated:
+                next_number = cls.objects.filter(
+                    event_id=event_id, range_start=range_start
+                ).values_list('next_number', flat=True).get()
+            else:
+                # First reservation in this range, start after any numbers already in use
+                next_number = cls.first_free_number(event_id, range_start, range_end) + count
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(event_id=event_id, range_start=range_start, next_number=next_number)
+                except IntegrityError:
+                    # Created concurrently by another request, reserve from that row instead
+                    cls.objects.filter(event_id=event_id, range_start=range_start).update(
+                        next_number=models.F('next_number') + count,
+                        updated_at=timezone.now()
+                    )
+                    next_number = cls.objects.filter(
+                        event_id=event_id, range_start=range_start
+                    ).values_list('next_number', flat=True).get()
+            
+            first_number = next_number - count
+            if range_end is not None and next_number > range_end:
+                # The counter row stays locked, so no other reservation in the range runs meanwhile
+                first_number = cls.first_free_number(event_id, range_start, range_end)
+                if first_number + count <= range_end:
+                    # Numbers at the top of the range were freed: rewind the counter
+                    next_number = first_number + count
+                    cls.objects.filter(event_id=event_id, range_start=range_start).update(
+                        next_number=next_number, updated_at=timezone.now()
+                    )
+                else:
+                    first_number = cls.first_free_block(event_id, range_start, range_end, count)
+                    if first_number is None:
+                        raise ChestNumberRangeFull(
+                            f'No free chest numbers left in the range {range_start}-{range_end - 1} for this event'
+                        )
+                    # Reuse a gap below the counter, which keeps its place
+                    next_number = first_number + count
+        return range(first_number, next_number)
+
 class TeamManager(models.Model):
     """Model to track team manager relationships"""
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='team_manager_profile')
@@ -944,39 +1315,259 @@ class TeamManager(models.Model):
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.team.name} Team Manager"
 
-# Django signals for automatic cleanup
-from django.db.models.signals import pre_delete, post_delete
-from django.dispatch import receiver
+class ReportJob(models.Model):
+    """PDF report queued for rendering by the report worker (see events/reports.py)"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    report_type = models.CharField(max_length=50)
+    params = models.JSONField(default=dict, blank=True)  # URL parameters, e.g. {"event_id": 1}
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, null=True, blank=True, related_name='report_jobs')
+    
+    # Stamp of the event data the report was requested for; unchanged data reuses the file
+    data_version = models.CharField(max_length=64, blank=True)
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    file_path = models.CharField(max_length=500, blank=True)
+    filename = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    
+    # Steps done of the total, for reports that record progress (e.g. programs of a print pack)
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(default=0)
+    
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='report_jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['report_type', 'data_version']),
+        ]
+    
+    def __str__(self):
+        return f"{self.report_type} #{self.id} ({self.status})"
 
-@receiver(pre_delete, sender=Team)
-def cleanup_team_data(sender, instance, **kwargs):
-    """Clean up all related data when a team is deleted"""
-    # Delete all program assignments for this team
-    from .models import ProgramAssignment
-    ProgramAssignment.objects.filter(team=instance).delete()
+class ReportCacheEntry(models.Model):
+    """Rendered PDF report cached for a version of the data it was built from (see events/reports.py)"""
+    # sha256 of (report type, params, data version); also used as the ETag
+    cache_key = models.CharField(max_length=64, unique=True)
+    report_type = models.CharField(max_length=50)
+    params = models.JSONField(default=dict, blank=True)
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, null=True, blank=True, related_name='report_cache_entries')
+    data_version = models.CharField(max_length=64, blank=True)
+    
+    # Files are content addressed, so identical PDFs share one file
+    content_hash = models.CharField(max_length=64)
+    file_path = models.CharField(max_length=500)
+    filename = models.CharField(max_length=255, blank=True)
+    size = models.PositiveIntegerField(default=0)
+    
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_accessed_at = models.DateTimeField(default=timezone.now, db_index=True)
     
-    # Delete all program results for this team
-    from .models import ProgramResult
-    ProgramResult.objects.filter(team=instance).delete()
+    class Meta:
+        ordering = ['-last_accessed_at']
     
-    # Delete all chest numbers for this team
-    from .models import ChestNumber
-    ChestNumber.objects.filter(team=instance).delete()
+    def __str__(self):
+        return f"{self.report_type} {self.params} ({self.size} bytes)"
+
+class DataVersion(models.Model):
+    """Change counter for report data, bumped after every write to it (see events/data_version.py)"""
+    # 'event:<id>' for one event's data, 'all' (bumped with every event) or 'shared'
+    # for teams, users and school settings
+    scope = models.CharField(max_length=32, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
     
-    # Delete all points records for this team
-    from .models import PointsRecord
-    PointsRecord.objects.filter(team=instance).delete()
+    def __str__(self):
+        return f"{self.scope}: {self.version}"
+
+# Django signals for automatic cleanup
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
 
 @receiver(post_delete, sender=Team)
 def cleanup_orphaned_assignments(sender, instance, **kwargs):
-    """Clean up any orphaned program assignments after team deletion"""
-    from .models import ProgramAssignment
-    # Find assignments that reference non-existent teams
-    orphaned_assignments = ProgramAssignment.objects.filter(
+    """Clear team and chest numbers left pointing at the deleted team by its former members"""
+    member_ids = getattr(instance, '_former_member_ids', None)
+    if not member_ids:
+        return
+    
+    # One UPDATE: the assignments keep their program but get a new chest
+    # number when the student is next assigned to a team
+    ProgramAssignment.objects.filter(
+        student_id__in=member_ids,
         team__isnull=False
     ).exclude(
         team__in=Team.objects.all()
-    )
+    ).update(team=None, chest_number=None)
     
-    if orphaned_assignments.exists():
-        orphaned_assignments.delete()
+    # ChestNumber rows can't exist without a number, so orphaned ones are removed
+    ChestNumber.objects.filter(
+        student_id__in=member_ids,
+        team__isnull=False
+    ).exclude(
+        team__in=Team.objects.all()
+    ).delete()
+
+@receiver(post_save, sender='accounts.SchoolSettings')
+@receiver(post_delete, sender='accounts.SchoolSettings')
+def clear_pdf_template_cache(sender, **kwargs):
+    """Rebuild the cached report header (school name and logo) after a settings change"""
+    from .pdf_engine import clear_cache
+    clear_cache()
+
+@receiver(post_delete, sender=PointsRecord)
+def remove_points_from_totals(sender, instance, **kwargs):
+    """Take a deleted points record out of the running totals"""
+    team_id, student_id, points = getattr(instance, '_ledger_state', instance._get_ledger_state())
+    if points:
+        PointsRecord.refresh_totals(team_id, student_id)
+
+@receiver(post_delete, sender=ProgramResult)
+def refresh_leaderboard_for_result(sender, instance, **kwargs):
+    """Refresh the event leaderboard when a result that carried points is deleted"""
+    if instance.points_earned > 0:
+        from .leaderboard import schedule_leaderboard_refresh
+        event_id = Program.objects.filter(pk=instance.program_id).values_list('event_id', flat=True).first()
+        if event_id:
+            schedule_leaderboard_refresh(event_id)
+
+@receiver(post_delete, sender=Program)
+def refresh_leaderboard_for_program(sender, instance, **kwargs):
+    """Refresh the event leaderboard when a program and its results are deleted"""
+    from .leaderboard import schedule_leaderboard_refresh
+    schedule_leaderboard_refresh(instance.event_id)
+
+@receiver(post_delete, sender=ProgramResult)
+def refresh_scoreboard_for_result(sender, instance, **kwargs):
+    """Drop a deleted result from its program's scoreboard"""
+    if instance.average_marks is not None:
+        from .scoreboard import schedule_scoreboard_refresh
+        schedule_scoreboard_refresh(instance.program_id)
+
+@receiver(post_save, sender=Program)
+def refresh_scoreboard_for_program(sender, instance, created, **kwargs):
+    """Keep the program name, category and type on the scoreboard in sync"""
+    if not created:
+        from .scoreboard import schedule_scoreboard_refresh
+        schedule_scoreboard_refresh(instance.pk, only_existing=True)
+
+
+@receiver(post_save, sender=Team)
+@receiver(pre_delete, sender=Team)
+def refresh_scoreboard_for_team(sender, instance, **kwargs):
+    """Keep the team name on the scoreboard in sync; a deleted team's rows lose it"""
+    from .scoreboard import schedule_scoreboard_refresh_for
+    entries = ScoreboardEntry.objects.filter(team_id=instance.pk)
+    if kwargs.get('signal') is post_save:
+        entries = entries.exclude(team_name=instance.name)
+    schedule_scoreboard_refresh_for(entries)
+
+@receiver(post_save, sender=User)
+def refresh_scoreboard_for_user(sender, instance, created, update_fields=None, **kwargs):
+    """Keep a student's names and code on the scoreboard in sync"""
+    if created or (update_fields and not set(update_fields) & {'name', 'first_name', 'last_name', 'email', 'username', 'student_id'}):
+        return
+    from .scoreboard import schedule_scoreboard_refresh_for
+    # Only rows that copied an older value
+    schedule_scoreboard_refresh_for(ScoreboardEntry.objects.filter(participant_id=instance.pk).exclude(
+        participant_name=instance.get_full_name() or '',
+        participant_display_name=instance.display_name or '',
+        participant_code=instance.student_id,
+    ))
+
+@receiver(post_save, sender=ChestNumber)
+@receiver(post_delete, sender=ChestNumber)
+def refresh_scoreboard_for_chest_number(sender, instance, **kwargs):
+    """A student's event chest number shows on their rows in every program of the event"""
+    from .scoreboard import schedule_scoreboard_refresh_for
+    schedule_scoreboard_refresh_for(ScoreboardEntry.objects.filter(
+        event_id=instance.event_id, participant_id=instance.student_id
+    ))
+
+@receiver(post_save, sender=ProgramAssignment)
+@receiver(post_delete, sender=ProgramAssignment)
+def refresh_scoreboard_for_assignment(sender, instance, **kwargs):
+    """An assignment's own chest number overrides the event one on the program's rows"""
+    from .scoreboard import schedule_scoreboard_refresh_for
+    schedule_scoreboard_refresh_for(ScoreboardEntry.objects.filter(
+        program_id=instance.program_id, participant_id=instance.student_id
+    ))
+
+
+@receiver(post_save, sender=Program)
+def publish_program_finished(sender, instance, created, **kwargs):
+    """Tell live results subscribers when a program is marked finished"""
+    if instance.is_finished and not getattr(instance, '_loaded_is_finished', False):
+        from .live import publish_program_finished as publish
+        publish(instance)
+    instance._loaded_is_finished = instance.is_finished
+
+
+# Report data versions: every save or delete of data that reports show bumps a
+# counter; bulk and raw SQL writes schedule their bump where they happen
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def bump_data_version_for_event(sender, instance, **kwargs):
+    from .data_version import schedule_data_version_bump
+    schedule_data_version_bump(event_id=instance.pk)
+
+@receiver(post_save, sender=Program)
+@receiver(post_delete, sender=Program)
+@receiver(post_save, sender=ChestNumber)
+@receiver(post_delete, sender=ChestNumber)
+@receiver(post_save, sender=IndividualParticipation)
+@receiver(post_delete, sender=IndividualParticipation)
+def bump_data_version_for_event_data(sender, instance, **kwargs):
+    from .data_version import schedule_data_version_bump
+    schedule_data_version_bump(event_id=instance.event_id)
+
+@receiver(post_save, sender=ProgramResult)
+@receiver(post_delete, sender=ProgramResult)
+@receiver(post_save, sender=ProgramAssignment)
+@receiver(post_delete, sender=ProgramAssignment)
+def bump_data_version_for_program_data(sender, instance, **kwargs):
+    from .data_version import schedule_data_version_bump
+    schedule_data_version_bump(program_id=instance.program_id)
+
+@receiver(post_save, sender=PointsRecord)
+@receiver(post_delete, sender=PointsRecord)
+def bump_data_version_for_points(sender, instance, **kwargs):
+    """Points without an event only move the team and student totals, which are shared"""
+    from .data_version import schedule_data_version_bump
+    schedule_data_version_bump(event_id=instance.event_id, shared=not instance.event_id)
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+@receiver(post_save, sender=TeamProfile)
+@receiver(post_delete, sender=TeamProfile)
+@receiver(post_save, sender='accounts.SchoolSettings')
+@receiver(post_delete, sender='accounts.SchoolSettings')
+@receiver(post_delete, sender=User)
+def bump_data_version_for_shared_data(sender, **kwargs):
+    from .data_version import schedule_data_version_bump
+    schedule_data_version_bump(shared=True)
+
+@receiver(post_save, sender=User)
+def bump_data_version_for_user(sender, update_fields=None, **kwargs):
+    """Logins (last_login, and the password upgrade of imported students) change nothing reports show"""
+    if update_fields and set(update_fields) <= {'last_login', 'password'}:
+        return
+    from .data_version import schedule_data_version_bump
+    schedule_data_version_bump(shared=True)
+
+@receiver(m2m_changed, sender=Team.members.through)
+def bump_data_version_for_members(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        from .data_version import schedule_data_version_bump
+        schedule_data_version_bump(shared=True)
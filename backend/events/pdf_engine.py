@@ -0,0 +1,338 @@
+"""
+Shared PDF rendering engine for reports.
+
+Every report view builds its story from the pieces cached here instead of
+recreating them per request, per table or per cell:
+
+- stylesheet() and paragraph_style(name): ReportLab's sample stylesheet and
+  the report paragraph styles in PARAGRAPH_STYLES, built once per process
+- table_style(name): the named table looks in TABLE_STYLES
+- get_template(school_settings): the CustomPDFTemplate (header with school
+  logo and name) for the current SchoolSettings row, with the logo read and
+  decoded once; rebuilt when the settings change
+- DataTable: a table that converts rows to cells as they are added, so
+  querysets can be streamed straight into it
+- program_info_table(program): the program bar shared by the program sheets
+- render_pdf(story): lays a story out into PDF bytes
+
+Cached styles are shared between threads and documents and must not be
+modified; derive a new ParagraphStyle from them instead.
+"""
+import copy
+import threading
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
+
+# name -> (parent style in the sample stylesheet, ParagraphStyle attributes)
+PARAGRAPH_STYLES = {
+    # Report header (school name, event and report titles)
+    'header_title': ('Heading1', dict(fontSize=16, spaceAfter=10, alignment=TA_CENTER, textColor=colors.black, fontName='Helvetica-Bold')),
+    # Title above a data table
+    'table_title': ('Heading3', dict(fontSize=12, spaceAfter=6, alignment=TA_LEFT, textColor=colors.black, fontName='Helvetica-Bold')),
+    # Data table cells
+    'table_header': ('Normal', dict(fontSize=10, spaceAfter=2, alignment=TA_CENTER, textColor=colors.black, fontName='Helvetica-Bold')),
+    'table_cell': ('Normal', dict(fontSize=9, spaceAfter=1, alignment=TA_CENTER, textColor=colors.black, fontName='Helvetica')),
+    # Program info bar (name | category | type) on results, calling and valuation sheets
+    'info_left': ('Normal', dict(fontSize=12, spaceAfter=5, alignment=TA_LEFT, textColor=colors.black, fontName='Helvetica-Bold')),
+    'info_center': ('Normal', dict(fontSize=12, spaceAfter=5, alignment=TA_CENTER, textColor=colors.black, fontName='Helvetica-Bold')),
+    'info_right': ('Normal', dict(fontSize=12, spaceAfter=5, alignment=TA_RIGHT, textColor=colors.black, fontName='Helvetica-Bold')),
+    'result_title': ('Heading1', dict(fontSize=16, spaceAfter=15, alignment=TA_CENTER, textColor=colors.black, fontName='Helvetica-Bold')),
+    'sheet_title': ('Heading1', dict(fontSize=18, spaceAfter=20, alignment=TA_CENTER, textColor=colors.black, fontName='Helvetica-Bold')),
+    'stage': ('Normal', dict(fontSize=12, spaceAfter=20, alignment=TA_RIGHT, textColor=colors.black, fontName='Helvetica-Bold')),
+    # Team list sections
+    'category_heading': ('Heading2', dict(fontSize=14, spaceAfter=10, spaceBefore=20, textColor=colors.darkblue, fontName='Helvetica-Bold')),
+    'grade_heading': ('Heading3', dict(fontSize=12, spaceAfter=8, spaceBefore=15, textColor=colors.darkgreen, fontName='Helvetica-Bold')),
+    'test_title': ('Heading1', dict(fontSize=24, spaceAfter=30, alignment=TA_CENTER)),
+}
+
+
+def _grey_header(header_font_size=None, font_size=None):
+    """Grey header row on a beige body, used by the event summary reports"""
+    commands = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ]
+    if font_size:
+        commands.append(('FONTSIZE', (0, 0), (-1, -1), font_size))
+    if header_font_size:
+        commands.append(('FONTSIZE', (0, 0), (-1, 0), header_font_size))
+    return commands + [
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]
+
+
+def _coloured_header(background, header_font_size):
+    """Light coloured header row on a white body (participants team report)"""
+    return [
+        ('BACKGROUND', (0, 0), (-1, 0), background),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), header_font_size),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]
+
+
+def _sheet(grid_colour, row_backgrounds, border_colour):
+    """Green header row with large padded cells (results, calling and valuation sheets)"""
+    return [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#27AE60')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 15),
+        ('TOPPADDING', (0, 0), (-1, 0), 15),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 11),
+        ('GRID', (0, 0), (-1, -1), 1.5, grid_colour),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 12),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+        ('TOPPADDING', (0, 1), (-1, -1), 12),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 12),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), row_backgrounds),
+        ('BOX', (0, 0), (-1, -1), 2, border_colour),
+        ('LINEBELOW', (0, 0), (-1, 0), 2, border_colour),
+    ]
+
+
+# name -> TableStyle commands
+TABLE_STYLES = {
+    # Black and white data table of CustomPDFTemplate.create_data_table
+    'data': [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.black),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 15),
+        ('TOPPADDING', (0, 0), (-1, 0), 15),
+        ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('LEFTPADDING', (0, 0), (-1, -1), 12),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+        ('TOPPADDING', (0, 1), (-1, -1), 12),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 12),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('BOX', (0, 0), (-1, -1), 2, colors.black),
+        ('LINEBELOW', (0, 0), (-1, 0), 2, colors.black),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+        ('LINEBELOW', (0, 1), (-1, -1), 0.5, colors.black),
+    ],
+    'program_info': [
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 12),
+        ('TOPPADDING', (0, 0), (-1, -1), 15),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
+        ('LEFTPADDING', (0, 0), (-1, -1), 10),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F8F9FA')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
+        ('BOX', (0, 0), (-1, -1), 1.5, colors.HexColor('#3498DB')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#BDC3C7')),
+    ],
+    'sheet': _sheet(colors.black, [colors.white, colors.lightgrey], colors.black),
+    'valuation_sheet': _sheet(colors.HexColor('#34495E'), [colors.HexColor('#FEF9E7'), colors.white], colors.HexColor('#2C3E50')) + [
+        # Judge columns highlighting
+        ('BACKGROUND', (1, 1), (3, -1), colors.HexColor('#F8F9FA')),
+    ],
+    'results': _grey_header(font_size=9),
+    'events': _grey_header(header_font_size=10),
+    'test': _grey_header(header_font_size=12),
+    'members': _coloured_header(colors.lightgreen, 9),
+    'participation': _coloured_header(colors.lightyellow, 8),
+    # Two-column label/value tables
+    'details': [
+        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ],
+    'event_details': [
+        ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
+        ('TEXTCOLOR', (0, 0), (0, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('BACKGROUND', (1, 0), (1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ],
+}
+
+_lock = threading.Lock()
+_stylesheet = None
+_paragraph_styles = {}
+_table_styles = {}
+# (settings key, CustomPDFTemplate) for the most recent SchoolSettings seen
+_template = (None, None)
+
+
+def stylesheet():
+    """ReportLab's sample stylesheet, built once per process (read only)"""
+    global _stylesheet
+    if _stylesheet is None:
+        _stylesheet = getSampleStyleSheet()
+    return _stylesheet
+
+
+def paragraph_style(name):
+    """Cached ParagraphStyle from PARAGRAPH_STYLES, or a sample stylesheet style such as 'Normal'"""
+    style = _paragraph_styles.get(name)
+    if style is None:
+        if name not in PARAGRAPH_STYLES:
+            return stylesheet()[name]
+        parent, attributes = PARAGRAPH_STYLES[name]
+        style = _paragraph_styles[name] = ParagraphStyle(name, parent=stylesheet()[parent], **attributes)
+    return style
+
+
+def table_style(name):
+    """Cached TableStyle for a TABLE_STYLES entry"""
+    style = _table_styles.get(name)
+    if style is None:
+        style = _table_styles[name] = TableStyle(TABLE_STYLES[name])
+    return style
+
+
+def get_template(school_settings):
+    """
+    The CustomPDFTemplate for these school settings, reused while they are unchanged.
+
+    Keyed on the row's updated_at and logo, so a settings change in any
+    process (web or report worker) is picked up on the next report.
+    """
+    from .custom_pdf_template import CustomPDFTemplate
+
+    global _template
+    key = _settings_key(school_settings)
+    cached_key, template = _template
+    if template is not None and cached_key == key:
+        return template
+    with _lock:
+        cached_key, template = _template
+        if template is None or cached_key != key:
+            template = CustomPDFTemplate(school_settings)
+            _template = (key, template)
+    return template
+
+
+def clear_cache():
+    """Drop the cached template and decoded logo (called when SchoolSettings change)"""
+    global _template
+    with _lock:
+        _template = (None, None)
+
+
+def _settings_key(school_settings):
+    if school_settings is None:
+        return None
+    return (
+        school_settings.pk,
+        getattr(school_settings, 'updated_at', None),
+        school_settings.school_name,
+        school_settings.school_logo.name if school_settings.school_logo else None,
+    )
+
+
+def copy_flowable(flowable):
+    """Shallow copy of a cached flowable for one document (layout state is per copy, image data shared)"""
+    return copy.copy(flowable)
+
+
+class DataTable:
+    """
+    Report table built one row at a time.
+
+    Rows can come from any iterable (extend() consumes generators and
+    querysets lazily); with paragraphs=True each cell becomes a Paragraph
+    using the shared cached cell styles. flowables() returns the Table(s) to
+    add to the story. repeat_header repeats the header row on every page;
+    chunk_rows splits very long tables into several tables that each start
+    with the header, which keeps ReportLab's page splitting cheap.
+    """
+
+    def __init__(self, headers, col_widths=None, style='data', paragraphs=False,
+                 header_style='table_header', cell_style='table_cell', repeat_header=False, chunk_rows=None):
+        self.col_widths = col_widths
+        self.style = style
+        self.paragraphs = paragraphs
+        self.repeat_header = repeat_header
+        self.chunk_rows = chunk_rows
+        self._cell_style = paragraph_style(cell_style) if paragraphs else None
+        header_style = paragraph_style(header_style) if paragraphs else None
+        self.header = self._cells(headers, header_style) if headers is not None else None
+        self.rows = []
+
+    def _cells(self, row, style):
+        if style is None:
+            return list(row)
+        return [Paragraph(str(cell), style) for cell in row]
+
+    def add_row(self, row):
+        self.rows.append(self._cells(row, self._cell_style))
+
+    def extend(self, rows):
+        for row in rows:
+            self.add_row(row)
+        return self
+
+    def __len__(self):
+        return len(self.rows)
+
+    def flowables(self):
+        """Table flowables for the rows added so far"""
+        header = [self.header] if self.header is not None else []
+        if not self.chunk_rows or len(self.rows) <= self.chunk_rows:
+            return [self._table(header + self.rows)]
+        return [
+            self._table(header + self.rows[start:start + self.chunk_rows])
+            for start in range(0, len(self.rows), self.chunk_rows)
+        ]
+
+    def _table(self, data):
+        repeat_rows = 1 if self.repeat_header and self.header is not None else 0
+        table = Table(data, colWidths=self.col_widths, repeatRows=repeat_rows)
+        table.setStyle(table_style(self.style))
+        return table
+
+
+def program_info_table(program, col_width=None):
+    """The 'NAME | CATEGORY | Team/Individual' bar at the top of program sheets"""
+    from reportlab.lib.units import inch
+
+    col_width = col_width or 2.5 * inch
+    program_type = "Team" if program.is_team_based else "Individual"
+    table = Table([[
+        Paragraph(f"<b>{program.name.upper()}</b>", paragraph_style('info_left')),
+        Paragraph(f"<b>{program.get_category_display().upper()}</b>", paragraph_style('info_center')),
+        Paragraph(f"<b>{program_type}</b>", paragraph_style('info_right')),
+    ]], colWidths=[col_width] * 3)
+    table.setStyle(table_style('program_info'))
+    return table
+
+
+def render_pdf(story, pagesize=A4, **doc_options):
+    """Lay out a story and return the PDF bytes (doc_options go to SimpleDocTemplate, e.g. margins)"""
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=pagesize, **doc_options)
+    doc.build(story)
+    return buffer.getvalue()
@@ -0,0 +1,99 @@
+"""
+Ranking engine for program results.
+
+Positions and points for a program are computed from a single ordered query,
+and only the rows whose position or points actually changed are written back
+(with one bulk UPDATE). Points records of the places the changed results
+left are withdrawn, and callers get the changed results back so that points
+are redistributed only where something moved.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .data_version import schedule_data_version_bump
+from .leaderboard import schedule_leaderboard_refresh
+from .live import publish_ranking_change
+from .scoreboard import schedule_scoreboard_refresh
+
+
+# Points awarded for 1st, 2nd and 3rd place by program category
+POSITION_POINTS = {
+    'hs': (5, 3, 1),      # HS and HSS programs are always individual
+    'hss': (5, 3, 1),
+    'general': (10, 6, 3),  # General programs (both individual and team-based)
+}
+DEFAULT_POSITION_POINTS = (5, 3, 1)  # Fallback for any other category
+
+
+def points_for_position(category, position):
+    """Return the points earned for a position in a program of this category"""
+    table = POSITION_POINTS.get(category, DEFAULT_POSITION_POINTS)
+    if position and 1 <= position <= len(table):
+        return table[position - 1]
+    return 0
+
+
+def compute_rankings(program):
+    """
+    Compute the ranking for a program without writing anything.
+
+    Returns a list of (result, position, points) tuples in ranking order.
+    """
+    from .models import ProgramResult
+
+    results = ProgramResult.objects.filter(
+        program=program, average_marks__isnull=False
+    ).select_related(
+        'participant', 'team', 'program__event__created_by', 'entered_by'
+    ).order_by('-average_marks', '-total_marks', 'participant__first_name')
+
+    return [
+        (result, position, points_for_position(program.category, position))
+        for position, result in enumerate(results, 1)
+    ]
+
+
+def rank_program(program):
+    """
+    Update positions and points for all results in a program.
+
+    Only results whose position or points changed are updated, in a single
+    bulk UPDATE. The points records of their former positions are deleted;
+    the caller distributes the new points. Returns the list of changed results
+    (with the new values set).
+    """
+    from .models import ProgramResult
+
+    with transaction.atomic():
+        changed = []
+        # Former position of changed results that held points records for it
+        previous_positions = {}
+        now = timezone.now()
+        for result, position, points in compute_rankings(program):
+            if result.position != position or result.points_earned != points:
+                if result.position and result.points_earned > 0:
+                    previous_positions[result.pk] = result.position
+                result.position = position
+                result.points_earned = points
+                result.updated_at = now
+                changed.append(result)
+
+        if changed:
+            # Write in primary key order so concurrent rankings lock rows consistently
+            changed.sort(key=lambda r: r.pk)
+            ProgramResult.objects.bulk_update(changed, ['position', 'points_earned', 'updated_at'])
+            for result in changed:
+                if result.pk in previous_positions:
+                    result.withdraw_position_points(previous_positions[result.pk])
+
+            # Points moved, so the event's share of the global leaderboard changed too
+            schedule_leaderboard_refresh(program.event_id)
+            # bulk_update sends no save signals
+            schedule_data_version_bump(program_id=program.id)
+            publish_ranking_change(program, changed)
+
+        # Marks may have changed even when positions did not
+        schedule_scoreboard_refresh(program.id)
+
+    return changed
+
@@ -0,0 +1,496 @@
+"""
+Caching and background rendering for PDF reports.
+
+Report views are registered with @report_view. Every rendered PDF is stored
+in a content-addressed cache keyed on (report type, params, data version),
+where the data version comes from change counters bumped by every write to
+the event's data (events/data_version.py). Unchanged data is served from the
+cache, with ETag/If-None-Match support so clients can revalidate for free,
+and the least recently used files are evicted once REPORT_CACHE_MAX_BYTES is
+exceeded.
+
+A registered report can also be requested asynchronously (``?async=1`` on the
+report URL, or POST to /api/reports/jobs/): a ReportJob row is queued and the
+``run_report_worker`` management command renders the PDF into the cache.
+Reports registered with ``background=True`` (e.g. the event print pack) are
+always queued, and can record their progress on the job with report_progress().
+
+Jobs are only visible to the user who requested them (and to admins), so a
+request only reuses the requester's own queued or completed jobs; another
+user's rendering of the same data is picked up from the cache instead. A job
+still running REPORT_JOB_LEASE_SECONDS after a worker claimed it is assumed
+lost (worker killed or hung) and marked failed, so it is never reused.
+"""
+import hashlib
+import os
+import threading
+import time
+import traceback
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F, Sum
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+
+# report_type -> {'render': undecorated view function, 'params': URL kwargs it takes,
+#                 'options': optional query parameters, 'background': always queued}
+REPORT_TYPES = {}
+
+# Rendered reports are PDFs, or ZIPs of PDFs
+CONTENT_TYPES = {
+    '.pdf': 'application/pdf',
+    '.zip': 'application/zip',
+}
+
+# Job being rendered by this thread of the report worker (for report_progress)
+_current = threading.local()
+# Minimum seconds between progress writes of a job
+PROGRESS_INTERVAL = 1.0
+
+
+class ReportRenderError(Exception):
+    """Raised when a report view does not return a PDF"""
+
+
+def report_view(report_type, params=('event_id',), options=None, background=False):
+    """
+    Register a PDF report view for caching and background rendering.
+
+    Apply below @api_view/@permission_classes so the wrapper receives the DRF
+    request. The wrapped view answers If-None-Match with 304, serves cached
+    PDFs for unchanged data, caches what it renders, and accepts ``?async=1``
+    to queue a job instead of rendering in the request.
+
+    ``options`` maps optional query parameters to their allowed values (or a
+    function that validates and normalizes the value); they are part of the
+    cache key and passed to the view as keyword arguments. ``background``
+    reports are never rendered in the request.
+    """
+    def decorator(func):
+        REPORT_TYPES[report_type] = {
+            'render': func,
+            'params': tuple(params),
+            'options': dict(options or {}),
+            'background': background,
+        }
+
+        @wraps(func)
+        def wrapper(request, *args, **kwargs):
+            try:
+                job_params = normalize_params(report_type, {**request.query_params.dict(), **kwargs})
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            if str(request.query_params.get('async', '')).lower() in ('1', 'true', 'yes'):
+                user = request.user if getattr(request.user, 'is_authenticated', False) else None
+                job = enqueue_report(report_type, job_params, requested_by=user)
+                return Response(serialize_job(job), status=status.HTTP_202_ACCEPTED)
+
+            data_version = get_data_version(get_event_id(job_params))
+            cache_key = get_cache_key(report_type, job_params, data_version)
+            etag = f'"{cache_key}"'
+
+            if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+                response = HttpResponseNotModified()
+                response['ETag'] = etag
+                return response
+
+            entry = get_cached_report(cache_key)
+            if entry is not None:
+                return cached_file_response(entry)
+
+            if background:
+                user = request.user if getattr(request.user, 'is_authenticated', False) else None
+                job = enqueue_report(report_type, job_params, requested_by=user)
+                return Response(serialize_job(job), status=status.HTTP_202_ACCEPTED)
+
+            options = {name: job_params[name] for name in REPORT_TYPES[report_type]['options'] if name in job_params}
+            response = func(request, *args, **kwargs, **options)
+            if is_pdf_response(response):
+                filename = get_response_filename(response, report_type)
+                store_report(report_type, job_params, data_version, response.content, filename)
+                response['ETag'] = etag
+                response['Cache-Control'] = 'private, no-cache'
+            return response
+
+        return wrapper
+    return decorator
+
+
+def _load_report_views():
+    """Make sure the report views are imported so REPORT_TYPES is populated"""
+    from . import views  # noqa: F401
+
+
+def get_report_types():
+    _load_report_views()
+    return REPORT_TYPES
+
+
+def normalize_params(report_type, params):
+    """Keep only the parameters the report takes: URL parameters as integers, then any options given"""
+    spec = get_report_types()[report_type]
+    normalized = {}
+    for name in spec['params']:
+        if params.get(name) in (None, ''):
+            raise ValueError(f'Missing parameter: {name}')
+        normalized[name] = int(params[name])
+    for name, allowed in spec['options'].items():
+        value = params.get(name)
+        if value in (None, ''):
+            continue
+        if callable(allowed):
+            value = allowed(str(value))
+        elif value not in allowed:
+            raise ValueError(f"Invalid {name}: {value} (expected one of: {', '.join(allowed)})")
+        normalized[name] = value
+    return normalized
+
+
+def get_event_id(params):
+    """Resolve the event a report belongs to from its parameters"""
+    if params.get('event_id'):
+        return params['event_id']
+    if params.get('program_id'):
+        from .models import Program
+        return Program.objects.filter(pk=params['program_id']).values_list('event_id', flat=True).first()
+    return None
+
+
+def get_data_version(event_id=None):
+    """
+    Version stamp for everything an event's reports are built from.
+
+    Built from the event's change counter and the counter of the data all
+    events share (see events/data_version.py), so any edit, addition or
+    deletion gives a new stamp. Without an event the stamp covers all events.
+    """
+    from .data_version import read_data_versions
+
+    stamp = '|'.join(f'{scope}:{version}' for scope, version in read_data_versions(event_id))
+    return hashlib.sha1(f'{event_id or "all"}|{stamp}'.encode()).hexdigest()
+
+
+def get_cache_key(report_type, params, data_version):
+    """Cache key (and ETag) for a report rendered from a given data version"""
+    param_string = '&'.join(f'{name}={params[name]}' for name in sorted(params))
+    return hashlib.sha256(f'{report_type}|{param_string}|{data_version}'.encode()).hexdigest()
+
+
+def is_pdf_response(response):
+    """True for a rendered report (a PDF, or a ZIP of PDFs)"""
+    return response.status_code == 200 and response.get('Content-Type', '').split(';')[0] in CONTENT_TYPES.values()
+
+
+def get_content_type(path):
+    return CONTENT_TYPES.get(os.path.splitext(path)[1].lower(), 'application/pdf')
+
+
+def get_response_filename(response, report_type):
+    """Filename from a response's Content-Disposition header"""
+    disposition = response.get('Content-Disposition', '')
+    if 'filename="' in disposition:
+        return disposition.split('filename="', 1)[1].rstrip('"')
+    return f'{report_type}.pdf'
+
+
+def get_cached_report(cache_key):
+    """Return the cache entry for a key if its file still exists, marking it as used"""
+    from .models import ReportCacheEntry
+
+    entry = ReportCacheEntry.objects.filter(cache_key=cache_key).first()
+    if entry is None:
+        return None
+    if not os.path.exists(entry.file_path):
+        entry.delete()
+        return None
+
+    ReportCacheEntry.objects.filter(pk=entry.pk).update(
+        hits=F('hits') + 1,
+        last_accessed_at=timezone.now()
+    )
+    return entry
+
+
+def store_report(report_type, params, data_version, content, filename):
+    """Store rendered PDF bytes in the content-addressed cache and evict if over budget"""
+    from .models import ReportCacheEntry
+
+    content_hash = hashlib.sha256(content).hexdigest()
+    cache_dir = os.path.join(settings.REPORTS_ROOT, 'cache', content_hash[:2])
+    os.makedirs(cache_dir, exist_ok=True)
+    extension = os.path.splitext(filename or '')[1].lower()
+    file_path = os.path.join(cache_dir, f"{content_hash}{extension if extension in CONTENT_TYPES else '.pdf'}")
+
+    if not os.path.exists(file_path):
+        tmp_path = f'{file_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, file_path)
+
+    event_id = get_event_id(params)
+    cache_key = get_cache_key(report_type, params, data_version)
+    try:
+        entry, created = ReportCacheEntry.objects.update_or_create(
+            cache_key=cache_key,
+            defaults={
+                'report_type': report_type,
+                'params': params,
+                'event_id': event_id,
+                'data_version': data_version,
+                'content_hash': content_hash,
+                'file_path': file_path,
+                'filename': filename,
+                'size': len(content),
+                'last_accessed_at': timezone.now(),
+            }
+        )
+    except IntegrityError:
+        # Stored concurrently by another request for the same data
+        entry = ReportCacheEntry.objects.get(cache_key=cache_key)
+
+    evict_report_cache()
+    return entry
+
+
+def evict_report_cache(max_bytes=None):
+    """Delete least recently used cache entries until the cache fits in max_bytes"""
+    from .models import ReportCacheEntry
+
+    if max_bytes is None:
+        max_bytes = settings.REPORT_CACHE_MAX_BYTES
+
+    total = ReportCacheEntry.objects.aggregate(total=Sum('size'))['total'] or 0
+    if total <= max_bytes:
+        return 0
+
+    evicted = 0
+    for entry in ReportCacheEntry.objects.order_by('last_accessed_at').iterator():
+        if total <= max_bytes:
+            break
+        entry.delete()
+        total -= entry.size
+        evicted += 1
+        # Only remove the file once no other entry shares the same content
+        if not ReportCacheEntry.objects.filter(content_hash=entry.content_hash).exists():
+            try:
+                os.remove(entry.file_path)
+            except FileNotFoundError:
+                pass
+    return evicted
+
+
+def cached_file_response(entry):
+    """Serve a cached PDF with its ETag"""
+    response = FileResponse(open(entry.file_path, 'rb'), content_type=get_content_type(entry.file_path))
+    response['Content-Disposition'] = f'attachment; filename="{entry.filename or os.path.basename(entry.file_path)}"'
+    response['ETag'] = f'"{entry.cache_key}"'
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def jobs_visible_to(user):
+    """Report jobs a user may see: all of them for admins, otherwise their own"""
+    from .models import ReportJob
+
+    jobs = ReportJob.objects.all()
+    if user.role != 'admin':
+        jobs = jobs.filter(requested_by=user)
+    return jobs
+
+
+def expire_stale_jobs():
+    """Mark running jobs failed once they have outlived the worker lease"""
+    from .models import ReportJob
+
+    lease = settings.REPORT_JOB_LEASE_SECONDS
+    now = timezone.now()
+    return ReportJob.objects.filter(
+        status='running',
+        started_at__lt=now - timedelta(seconds=lease)
+    ).update(
+        status='failed',
+        finished_at=now,
+        error=f'Report worker did not finish the job within {lease} seconds'
+    )
+
+
+def find_completed_job(report_type, params, data_version=None, requested_by=None):
+    """Return the requester's completed job for this report and data version whose file still exists"""
+    from .models import ReportJob
+
+    if data_version is None:
+        data_version = get_data_version(get_event_id(params))
+
+    jobs = ReportJob.objects.filter(
+        report_type=report_type,
+        params=params,
+        data_version=data_version,
+        requested_by=requested_by,
+        status='completed'
+    ).order_by('-finished_at')
+    for job in jobs[:5]:
+        if job.file_path and os.path.exists(job.file_path):
+            return job
+    return None
+
+
+def enqueue_report(report_type, params, requested_by=None):
+    """Queue a report, reusing the requester's completed or in-flight job for the same data"""
+    from .models import ReportJob
+
+    event_id = get_event_id(params)
+    data_version = get_data_version(event_id)
+
+    job = find_completed_job(report_type, params, data_version, requested_by=requested_by)
+    if job is not None:
+        return job
+
+    # Jobs lost by a worker must not be handed out again
+    expire_stale_jobs()
+    job = ReportJob.objects.filter(
+        report_type=report_type,
+        params=params,
+        data_version=data_version,
+        requested_by=requested_by,
+        status__in=['pending', 'running']
+    ).order_by('-created_at').first()
+    if job is not None:
+        return job
+
+    # Already rendered for someone else: record a completed job over the cached file
+    entry = get_cached_report(get_cache_key(report_type, params, data_version))
+    if entry is not None:
+        now = timezone.now()
+        return ReportJob.objects.create(
+            report_type=report_type,
+            params=params,
+            event_id=event_id,
+            data_version=data_version,
+            requested_by=requested_by,
+            status='completed',
+            file_path=entry.file_path,
+            filename=entry.filename,
+            started_at=now,
+            finished_at=now
+        )
+
+    return ReportJob.objects.create(
+        report_type=report_type,
+        params=params,
+        event_id=event_id,
+        data_version=data_version,
+        requested_by=requested_by
+    )
+
+
+def render_report(report_type, params):
+    """Render a registered report and return (pdf_bytes, filename)"""
+    spec = get_report_types()[report_type]
+    # Report views build the document from their URL parameters only
+    response = spec['render'](None, **params)
+
+    if not is_pdf_response(response):
+        detail = getattr(response, 'data', None) or response.content[:500]
+        if isinstance(detail, dict):
+            detail = detail.get('error', detail)
+        raise ReportRenderError(f'{report_type} returned {response.status_code}: {detail}')
+
+    return response.content, get_response_filename(response, report_type)
+
+
+def report_progress(done, total):
+    """
+    Record the progress of the job this thread is rendering (done of total
+    steps). Writes are throttled to one per PROGRESS_INTERVAL; outside the
+    report worker this does nothing.
+    """
+    from .models import ReportJob
+
+    job = getattr(_current, 'job', None)
+    if job is None:
+        return
+    now = time.monotonic()
+    if done < total and now - getattr(_current, 'progress_at', 0) < PROGRESS_INTERVAL:
+        return
+    _current.progress_at = now
+    job.progress_done, job.progress_total = done, total
+    ReportJob.objects.filter(pk=job.pk).update(progress_done=done, progress_total=total)
+
+
+def run_job(job):
+    """Render a claimed job into the report cache and record the outcome"""
+    _current.job = job
+    _current.progress_at = 0
+    try:
+        # Another user's job for the same data may have rendered it meanwhile
+        entry = get_cached_report(get_cache_key(job.report_type, job.params, job.data_version))
+        if entry is None:
+            content, filename = render_report(job.report_type, job.params)
+            entry = store_report(job.report_type, job.params, job.data_version, content, filename)
+
+        job.status = 'completed'
+        job.file_path = entry.file_path
+        job.filename = entry.filename
+        job.error = ''
+    except Exception as e:
+        job.status = 'failed'
+        job.error = f'{e}\n{traceback.format_exc()}'
+    finally:
+        _current.job = None
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'file_path', 'filename', 'error', 'finished_at'])
+    return job
+
+
+def claim_next_job():
+    """Atomically claim the oldest pending job, or return None"""
+    from .models import ReportJob
+
+    expire_stale_jobs()
+    while True:
+        job = ReportJob.objects.filter(status='pending').order_by('created_at').first()
+        if job is None:
+            return None
+        now = timezone.now()
+        # Only one worker wins the pending -> running transition
+        claimed = ReportJob.objects.filter(pk=job.pk, status='pending').update(status='running', started_at=now)
+        if claimed:
+            job.status = 'running'
+            job.started_at = now
+            return job
+
+
+def file_response(job):
+    """Serve the rendered PDF of a completed job"""
+    response = FileResponse(open(job.file_path, 'rb'), content_type=get_content_type(job.file_path))
+    response['Content-Disposition'] = f'attachment; filename="{job.filename or os.path.basename(job.file_path)}"'
+    return response
+
+
+def serialize_job(job):
+    data = {
+        'job_id': job.id,
+        'report_type': job.report_type,
+        'params': job.params,
+        'status': job.status,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+        'download_url': f'/api/reports/jobs/{job.id}/download/' if job.status == 'completed' else None,
+    }
+    if job.progress_total:
+        data['progress'] = {
+            'done': job.progress_done,
+            'total': job.progress_total,
+            'percent': 100 if job.status == 'completed' else round(100 * job.progress_done / job.progress_total),
+        }
+    if job.status == 'failed':
+        data['error'] = job.error.splitlines()[0] if job.error else 'Report generation failed'
+    return data
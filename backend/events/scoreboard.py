@@ -0,0 +1,173 @@
+"""
+Denormalized per-program scoreboard.
+
+ScoreboardEntry keeps one row per marked result with the names, team,
+chest number, marks, position and points the results pages and winners
+reports display. Rows are rebuilt for a single program whenever it is
+ranked, so results-day reads hit one indexed table instead of joining
+results, users, teams, assignments and chest numbers per request.
+Renaming a team or student and changing a chest number refresh the programs
+whose rows copied the old value (see the receivers in events/models.py).
+Bulk loads rebuild a whole event at once with refresh_event_scoreboard.
+"""
+import threading
+from contextlib import contextmanager
+from functools import partial
+
+from django.db import transaction
+
+from .data_version import schedule_data_version_bump
+
+# Programs collected by an active batched_scoreboard_refreshes() block in this thread
+_batch = threading.local()
+
+
+def schedule_scoreboard_refresh(program_id, only_existing=False):
+    """Refresh a program's scoreboard once the current transaction commits"""
+    pending = getattr(_batch, 'programs', None)
+    if pending is not None:
+        # A full refresh wins over an only_existing one for the same program
+        pending[program_id] = pending.get(program_id, True) and only_existing
+        return
+    transaction.on_commit(partial(refresh_program_scoreboard, program_id, only_existing=only_existing))
+
+
+def schedule_scoreboard_refresh_for(entries):
+    """Refresh every program with rows in a ScoreboardEntry queryset once the current transaction commits"""
+    for program_id in entries.order_by().values_list('program_id', flat=True).distinct():
+        schedule_scoreboard_refresh(program_id)
+
+
+@contextmanager
+def batched_scoreboard_refreshes():
+    """
+    Schedule each program's refresh once for everything inside the block.
+
+    Bulk deletes fire a post_delete per result; without this every one of
+    them queues its own rebuild of the same program.
+    """
+    if getattr(_batch, 'programs', None) is not None:
+        # Nested block: the outermost one schedules
+        yield
+        return
+    _batch.programs = pending = {}
+    try:
+        yield
+    finally:
+        _batch.programs = None
+    for program_id, only_existing in pending.items():
+        schedule_scoreboard_refresh(program_id, only_existing=only_existing)
+
+
+def refresh_program_scoreboard(program_id, only_existing=False):
+    """
+    Rebuild the scoreboard rows for one program from its marked results.
+
+    With only_existing, programs that have no scoreboard rows yet are skipped
+    (used when a program is edited before any marks were entered).
+    """
+    from .models import Program, ProgramResult, ScoreboardEntry
+    from .serializers import get_program_results_context
+
+    if only_existing and not ScoreboardEntry.objects.filter(program_id=program_id).exists():
+        return
+
+    with transaction.atomic():
+        # Lock the program so concurrent refreshes of the same program run one after another
+        program = Program.objects.select_for_update().filter(pk=program_id).first()
+        if program is None:
+            return
+
+        results = ProgramResult.objects.filter(
+            program=program, average_marks__isnull=False
+        ).select_related('participant', 'team')
+        chest_numbers = get_program_results_context(program)['chest_numbers']
+
+        entries = [
+            _build_entry(program, result, chest_numbers.get(result.participant_id))
+            for result in results
+        ]
+
+        ScoreboardEntry.objects.filter(program=program).delete()
+        ScoreboardEntry.objects.bulk_create(entries, batch_size=1000)
+        # Reports read the scoreboard, which is rebuilt after the change that bumped the version
+        schedule_data_version_bump(program_id=program.id)
+
+
+def refresh_event_scoreboard(event_id):
+    """Rebuild the scoreboard rows for every program in an event in one pass"""
+    from .models import ChestNumber, Program, ProgramAssignment, ProgramResult, ScoreboardEntry
+
+    with transaction.atomic():
+        programs = {
+            program.id: program
+            for program in Program.objects.select_for_update().filter(event_id=event_id)
+        }
+        # Event chest numbers, overridden per program by the assignment's own number
+        # (the same precedence as get_program_results_context)
+        event_chest_numbers = dict(ChestNumber.objects.filter(
+            event_id=event_id
+        ).values_list('student_id', 'chest_number'))
+        program_chest_numbers = {
+            (program_id, student_id): chest_number
+            for program_id, student_id, chest_number in ProgramAssignment.objects.filter(
+                program__event_id=event_id, chest_number__isnull=False
+            ).values_list('program_id', 'student_id', 'chest_number')
+        }
+
+        results = ProgramResult.objects.filter(
+            program__event_id=event_id, average_marks__isnull=False
+        ).select_related('participant', 'team')
+        entries = [
+            _build_entry(
+                programs[result.program_id],
+                result,
+                program_chest_numbers.get(
+                    (result.program_id, result.participant_id), event_chest_numbers.get(result.participant_id)
+                ),
+            )
+            for result in results
+        ]
+
+        ScoreboardEntry.objects.filter(program__event_id=event_id).delete()
+        ScoreboardEntry.objects.bulk_create(entries, batch_size=1000)
+        schedule_data_version_bump(event_id=event_id)
+
+
+def refresh_all_scoreboards():
+    """Rebuild the scoreboard rows for every event"""
+    from .models import Event
+
+    for event_id in Event.objects.values_list('id', flat=True):
+        refresh_event_scoreboard(event_id)
+
+
+def _build_entry(program, result, chest_number):
+    """Unsaved ScoreboardEntry for a marked result (participant and team must be loaded)"""
+    from .models import ScoreboardEntry
+
+    participant = result.participant
+    return ScoreboardEntry(
+        event_id=program.event_id,
+        program=program,
+        result=result,
+        program_name=program.name,
+        program_category=program.category,
+        is_team_based=program.is_team_based,
+        participant=participant,
+        participant_name=participant.get_full_name() or '',
+        participant_display_name=participant.display_name or '',
+        participant_code=participant.student_id,
+        team=result.team,
+        team_name=result.team.name if result.team else None,
+        chest_number=chest_number,
+        result_number=result.result_number,
+        judge1_marks=result.judge1_marks,
+        judge2_marks=result.judge2_marks,
+        judge3_marks=result.judge3_marks,
+        total_marks=result.total_marks,
+        average_marks=result.average_marks,
+        position=result.position,
+        points_earned=result.points_earned,
+        comments=result.comments or '',
+    )
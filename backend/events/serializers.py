@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Event, Team, IndividualParticipation, EventAnnouncement, PointsRecord, TeamProfile, Program, ProgramAssignment, ProgramResult, ChestNumber
+from django.db.models import Q, Count, Prefetch
+from .models import Event, Team, IndividualParticipation, EventAnnouncement, PointsRecord, TeamProfile, Program, ProgramAssignment, ProgramResult, ChestNumber, ScoreboardEntry
 
 User = get_user_model()
 
@@ -275,6 +276,9 @@ class ProgramSerializer(serializers.ModelSerializer):
     event = serializers.SerializerMethodField()
     program_type = serializers.CharField(required=True)
     
+    # Fields built from the program's assignments (prefetched by setup_queryset)
+    ASSIGNMENT_FIELDS = {'assigned_students', 'assignments_per_team'}
+    
     class Meta:
         model = Program
         fields = [
@@ -286,6 +290,53 @@ class ProgramSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'status']
     
+    @classmethod
+    def requested_fields(cls, request):
+        """
+        Field names selected with ?fields=a,b (plus any ?expand=assigned_students),
+        or None when the request asks for every field.
+        """
+        if request is None or not hasattr(request, 'query_params'):
+            return None
+        fields = request.query_params.get('fields')
+        if not fields:
+            return None
+        selected = {name.strip() for name in fields.split(',') if name.strip()}
+        selected.update(name.strip() for name in request.query_params.get('expand', '').split(',') if name.strip())
+        return selected
+    
+    @classmethod
+    def setup_queryset(cls, queryset, request=None):
+        """Load what the serializer needs for a list of programs in a fixed number of queries"""
+        selected = cls.requested_fields(request)
+        queryset = queryset.select_related('event')
+        if selected is None or 'participants_count' in selected:
+            queryset = queryset.annotate(participants_count=Count('assignments', distinct=True))
+        if selected is None or selected & cls.ASSIGNMENT_FIELDS:
+            queryset = queryset.prefetch_related(Prefetch(
+                'assignments',
+                queryset=ProgramAssignment.objects.select_related('student', 'team').order_by('id')
+            ))
+        return queryset
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        
+        # ?fields= only applies to the top-level program (or list of programs), not nested uses
+        root = self.root
+        is_top_level = root is self or (isinstance(root, serializers.ListSerializer) and self.parent is root)
+        if is_top_level:
+            selected = self.requested_fields(self.context.get('request'))
+            if selected:
+                fields = {name: field for name, field in fields.items() if name in selected}
+        return fields
+    
+    def _get_assignments(self, obj):
+        """Use the prefetched assignments when setup_queryset loaded them"""
+        if 'assignments' in getattr(obj, '_prefetched_objects_cache', {}):
+            return list(obj.assignments.all())
+        return list(obj.assignments.select_related('student', 'team'))
+    
     def get_event(self, obj):
         """Get event details"""
         return {
@@ -297,11 +348,14 @@ class ProgramSerializer(serializers.ModelSerializer):
     
     def get_participants_count(self, obj):
         """Get total number of participants in this program"""
+        if hasattr(obj, 'participants_count'):
+            return obj.participants_count
+        if 'assignments' in getattr(obj, '_prefetched_objects_cache', {}):
+            return len(obj.assignments.all())
         return obj.assignments.count()
     
     def get_assigned_students(self, obj):
         """Get list of assigned students with their details"""
-        assignments = obj.assignments.select_related('student', 'team')
         return [
             {
                 'id': assignment.student.id,
@@ -310,22 +364,22 @@ class ProgramSerializer(serializers.ModelSerializer):
                 'team_name': assignment.team.name if assignment.team else None,
                 'chest_number': assignment.chest_number
             }
-            for assignment in assignments
+            for assignment in self._get_assignments(obj)
         ]
     
     def get_assignments_per_team(self, obj):
         """Get assignments grouped by team"""
-        from django.db.models import Count
-        team_assignments = obj.assignments.values('team__name').annotate(
-            count=Count('id')
-        ).order_by('team__name')
+        counts = {}
+        for assignment in self._get_assignments(obj):
+            team_name = assignment.team.name if assignment.team else None
+            counts[team_name] = counts.get(team_name, 0) + 1
         
         return [
             {
-                'team_name': assignment['team__name'] or 'No Team',
-                'count': assignment['count']
+                'team_name': team_name or 'No Team',
+                'count': count
             }
-            for assignment in team_assignments
+            for team_name, count in sorted(counts.items(), key=lambda item: (item[0] is None, item[0] or ''))
         ]
     
     def validate(self, data):
@@ -438,7 +492,88 @@ class ProgramResultSerializer(serializers.ModelSerializer):
         except ChestNumber.DoesNotExist:
             return None
 
-class MarkEntrySerializer(serializers.ModelSerializer):
+def format_position(position):
+    """Display text for a result position (1st, 2nd, 3rd, 4th, ... or Unranked)"""
+    if position == 1:
+        return "1st"
+    elif position == 2:
+        return "2nd"
+    elif position == 3:
+        return "3rd"
+    elif position:
+        return f"{position}th"
+    return "Unranked"
+
+
+def get_program_results_context(program):
+    """
+    Precompute per-program lookups for MarkEntrySerializer / ProgramResultSummarySerializer.
+    
+    Returns serializer context with the program, a {student_id: chest_number}
+    map and a {team_id: assigned member count} map, so a whole sheet is
+    serialized in a constant number of queries. Results passed to the
+    serializer should select_related('participant', 'team').
+    """
+    # Chest numbers from the ChestNumber table, overridden by the program's own assignments
+    # (subqueries rather than joins, which multiply rows across the two relations)
+    chest_numbers = dict(ChestNumber.objects.filter(
+        event_id=program.event_id
+    ).filter(
+        Q(student_id__in=ProgramAssignment.objects.filter(program=program).values('student_id'))
+        | Q(student_id__in=ProgramResult.objects.filter(program=program).values('participant_id'))
+    ).values_list('student_id', 'chest_number'))
+    team_member_counts = {}
+    for student_id, team_id, chest_number in ProgramAssignment.objects.filter(
+        program=program
+    ).values_list('student_id', 'team_id', 'chest_number'):
+        if chest_number:
+            chest_numbers[student_id] = chest_number
+        if team_id is not None:
+            team_member_counts[team_id] = team_member_counts.get(team_id, 0) + 1
+    
+    return {
+        'program': program,
+        'chest_numbers': chest_numbers,
+        'team_member_counts': team_member_counts,
+    }
+
+
+class ProgramResultContextMixin:
+    """Serve program, chest numbers and team counts from get_program_results_context() when provided"""
+    
+    def _get_program(self, obj):
+        program = self.context.get('program')
+        if program is not None and obj.program_id == program.id:
+            return program
+        return obj.program
+    
+    def _get_chest_number(self, obj):
+        """Get chest number for the participant in this event"""
+        chest_numbers = self.context.get('chest_numbers')
+        if chest_numbers is not None and self.context.get('program') is not None \
+                and obj.program_id == self.context['program'].id:
+            return chest_numbers.get(obj.participant_id)
+        
+        program = self._get_program(obj)
+        # First try to get from ProgramAssignment
+        assignment = ProgramAssignment.objects.filter(
+            program=program,
+            student_id=obj.participant_id
+        ).first()
+        
+        if assignment and assignment.chest_number:
+            return assignment.chest_number
+        
+        # Fallback to ChestNumber model
+        chest_number = ChestNumber.objects.filter(
+            event_id=program.event_id,
+            student_id=obj.participant_id
+        ).first()
+        
+        return chest_number.chest_number if chest_number else None
+
+
+class MarkEntrySerializer(ProgramResultContextMixin, serializers.ModelSerializer):
     """Serializer for mark entry - includes participant details"""
     student_name = serializers.SerializerMethodField()
     student_code = serializers.CharField(source='participant.student_id', read_only=True)
@@ -457,7 +592,7 @@ class MarkEntrySerializer(serializers.ModelSerializer):
                 # Check if this is a team-based program result
                 if hasattr(obj, 'is_team_based') and obj.is_team_based:
                     return f"{base_name} and team"
-                elif obj.team and obj.program.is_team_based:
+                elif obj.team_id and self._get_program(obj).is_team_based:
                     return f"{base_name} and team"
                 else:
                     return base_name
@@ -468,18 +603,20 @@ class MarkEntrySerializer(serializers.ModelSerializer):
     
     def get_is_team_based(self, obj):
         """Check if this is a team-based program"""
-        return obj.program.is_team_based if hasattr(obj, 'program') else False
+        return self._get_program(obj).is_team_based if obj.program_id else False
     
     def get_team_member_count(self, obj):
         """Get the number of team members for team-based programs"""
         if hasattr(obj, 'team_member_count'):
             return obj.team_member_count
-        elif obj.team and obj.program.is_team_based:
+        elif obj.team_id and self._get_program(obj).is_team_based:
             # Count team members assigned to this program
-            from events.models import ProgramAssignment
+            team_member_counts = self.context.get('team_member_counts')
+            if team_member_counts is not None and self._get_program(obj) is self.context.get('program'):
+                return team_member_counts.get(obj.team_id, 0)
             return ProgramAssignment.objects.filter(
-                program=obj.program,
-                team=obj.team
+                program_id=obj.program_id,
+                team_id=obj.team_id
             ).count()
         return 1
     
@@ -496,30 +633,15 @@ class MarkEntrySerializer(serializers.ModelSerializer):
     def get_chest_number(self, obj):
         """Get chest number for the participant in this event"""
         # For general category programs, don't show chest numbers
-        if hasattr(obj, 'program') and obj.program.category == 'open':
+        if obj.program_id and self._get_program(obj).category == 'open':
             return None
             
         try:
-            # First try to get from ProgramAssignment
-            assignment = ProgramAssignment.objects.filter(
-                program=obj.program,
-                student=obj.participant
-            ).first()
-            
-            if assignment and assignment.chest_number:
-                return assignment.chest_number
-            
-            # Fallback to ChestNumber model
-            chest_number = ChestNumber.objects.filter(
-                event=obj.program.event,
-                student=obj.participant
-            ).first()
-            
-            return chest_number.chest_number if chest_number else None
+            return self._get_chest_number(obj)
         except:
             return None
 
-class ProgramResultSummarySerializer(serializers.ModelSerializer):
+class ProgramResultSummarySerializer(ProgramResultContextMixin, serializers.ModelSerializer):
     """Serializer for displaying program results summary"""
     participant_name = serializers.CharField(source='participant.get_full_name', read_only=True)
     participant_code = serializers.CharField(source='participant.student_id', read_only=True)
@@ -536,37 +658,26 @@ class ProgramResultSummarySerializer(serializers.ModelSerializer):
         ]
     
     def get_chest_number(self, obj):
-        try:
-            # First try to get from ProgramAssignment
-            assignment = ProgramAssignment.objects.get(
-                program=obj.program,
-                student=obj.participant
-            )
-            if assignment.chest_number:
-                return assignment.chest_number
-        except ProgramAssignment.DoesNotExist:
-            pass
-        
-        # Fallback to ChestNumber model
-        try:
-            chest_num = ChestNumber.objects.get(
-                event=obj.program.event,
-                student=obj.participant
-            )
-            return chest_num.chest_number
-        except ChestNumber.DoesNotExist:
-            return None
+        return self._get_chest_number(obj)
+    
+    def get_position_display(self, obj):
+        return format_position(obj.position)
+
+class ScoreboardEntrySerializer(serializers.ModelSerializer):
+    """Results summary rows served from the denormalized scoreboard (same shape as ProgramResultSummarySerializer)"""
+    id = serializers.IntegerField(source='result_id', read_only=True)
+    position_display = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ScoreboardEntry
+        fields = [
+            'id', 'result_number', 'participant_name', 'participant_code', 'team_name', 'chest_number',
+            'judge1_marks', 'judge2_marks', 'judge3_marks', 'total_marks', 'average_marks',
+            'position', 'position_display', 'points_earned'
+        ]
     
     def get_position_display(self, obj):
-        if obj.position == 1:
-            return "1st"
-        elif obj.position == 2:
-            return "2nd"
-        elif obj.position == 3:
-            return "3rd"
-        elif obj.position:
-            return f"{obj.position}th"
-        return "Unranked"
+        return format_position(obj.position)
 
 # Enhanced Event Serializer with programs
 class EventWithProgramsSerializer(EventDetailSerializer):
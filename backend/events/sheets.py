@@ -0,0 +1,321 @@
+"""
+Calling and evaluation (valuation) sheets.
+
+The per-program sheet views and the event-wide print pack share the builders
+here. A program's assignments are first reduced to sheet entries
+(chest number, participant name, team name) with chest numbers looked up from
+a prefetched map; the sheet stories are then built from those entries, so
+rendering needs no database access.
+
+The print pack loads every selected program's assignments in one query and
+renders the programs in a process pool (PRINT_PACK_WORKERS processes), then
+merges the sheets into one PDF or packs them into a ZIP. It is rendered by the
+report worker as a background job and reports its progress on the job.
+"""
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+
+from django.utils.dateparse import parse_date
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, Spacer
+
+from . import pdf_engine
+
+# Page margins of the calling and evaluation sheets
+SHEET_MARGINS = dict(rightMargin=80, leftMargin=80, topMargin=50, bottomMargin=50)
+
+SHEET_KINDS = ('calling', 'evaluation')
+# Below this many programs the pack is rendered in the worker process itself
+MIN_PARALLEL_PROGRAMS = 4
+
+
+def chest_number_map(event_id, student_ids):
+    """{student_id: chest number} from the event's ChestNumber rows, in one query"""
+    from .models import ChestNumber
+
+    student_ids = set(student_ids)
+    if not student_ids:
+        return {}
+    return dict(ChestNumber.objects.filter(
+        event_id=event_id, student_id__in=student_ids
+    ).values_list('student_id', 'chest_number'))
+
+
+def fallback_student_ids(assignments):
+    """Students whose assignment has no chest number and need the ChestNumber lookup"""
+    return [assignment.student_id for assignment in assignments if not assignment.chest_number]
+
+
+def sheet_entries(program, assignments, chest_numbers):
+    """
+    Rows of a program's sheets as (chest number, participant name, team name).
+
+    Assignments (ordered by chest number and name) are grouped by team; team
+    based programs get one row per team named after its first member
+    ("... and team"), individual programs one row per student.
+    """
+    team_groups = {}
+    for assignment in assignments:
+        team_name = assignment.team.name if assignment.team else 'Individual'
+        team_groups.setdefault(team_name, []).append(assignment)
+
+    entries = []
+    for team_name, team_assignments in team_groups.items():
+        if program.is_team_based:
+            main_assignment = team_assignments[0]
+            main_name = main_assignment.student.get_full_name()
+            participant_name = f"{main_name} and team" if len(team_assignments) > 1 else main_name
+            rows = [(main_assignment, participant_name)]
+        else:
+            rows = [(assignment, assignment.student.get_full_name()) for assignment in team_assignments]
+
+        for assignment, participant_name in rows:
+            chest_no = assignment.chest_number or chest_numbers.get(assignment.student_id) or ''
+            entries.append((str(chest_no) if chest_no else 'N/A', participant_name, team_name))
+    return entries
+
+
+def calling_sheet_story(program, entries, template):
+    """Flowables of a program's calling sheet"""
+    elements = []
+    elements.extend(template.create_header(event_title=program.event.title, extra_title=f'Calling Sheet - {program.name}'))
+
+    # Program info row with three columns
+    elements.append(pdf_engine.program_info_table(program))
+    elements.append(Spacer(1, 20))  # Increased gap before the participant list table
+
+    if entries:
+        # For general category, don't show chest number
+        if program.category == 'open':
+            table = pdf_engine.DataTable(['Participant Name', 'Team Name', 'Code Letter'],
+                                         col_widths=[2.6*inch, 1.2*inch, 1.2*inch], style='sheet')
+            for chest_no, participant_name, team_name in entries:
+                table.add_row([participant_name, team_name, ''])
+        else:
+            # Green header, same as the valuation sheet
+            table = pdf_engine.DataTable(['Chest No.', 'Participant Name', 'Team Name', 'Code Letter'],
+                                         col_widths=[0.8*inch, 1.8*inch, 1.2*inch, 1.2*inch], style='sheet')
+            for chest_no, participant_name, team_name in entries:
+                table.add_row([chest_no, participant_name, team_name, ''])
+        elements.extend(table.flowables())
+    else:
+        elements.append(Paragraph("No participants assigned to this program.", pdf_engine.paragraph_style('Normal')))
+    return elements
+
+
+def evaluation_sheet_story(program, entries, template):
+    """Flowables of a program's evaluation (valuation) sheet"""
+    elements = []
+    elements.extend(template.create_header(event_title=program.event.title, extra_title=f'Valuation Sheet - {program.name}'))
+    elements.append(Paragraph("Valuation Sheet", pdf_engine.paragraph_style('sheet_title')))
+    elements.append(Paragraph("Stage No: _______", pdf_engine.paragraph_style('stage')))
+    program_type = "Team" if program.is_team_based else "Individual"
+
+    # Centered program info lines
+    program_info_style = pdf_engine.paragraph_style('info_center')
+    elements.append(Paragraph(f"<b>{program.name.upper()}</b>", program_info_style))
+    elements.append(Paragraph(f"<b>{program.get_category_display().upper()}</b>", program_info_style))
+    elements.append(Paragraph(f"<b>{program_type}</b>", program_info_style))
+    elements.append(Spacer(1, 15))
+
+    if entries:
+        # For general category, judges see participant names instead of chest numbers
+        if program.category == 'open':
+            table = pdf_engine.DataTable(['Participant Name', 'Judge 1', 'Judge 2', 'Judge 3', 'Remarks'],
+                                         col_widths=[2.3*inch, 1.5*inch, 1.5*inch, 1.5*inch, 2*inch], style='valuation_sheet')
+            for chest_no, participant_name, team_name in entries:
+                table.add_row([participant_name, '', '', '', ''])
+        else:
+            table = pdf_engine.DataTable(['Chest No.', 'Judge 1', 'Judge 2', 'Judge 3', 'Remarks'],
+                                         col_widths=[1.5*inch, 1.5*inch, 1.5*inch, 1.5*inch, 2*inch], style='valuation_sheet')
+            for chest_no, participant_name, team_name in entries:
+                table.add_row([chest_no, '', '', '', ''])
+        elements.extend(table.flowables())
+    else:
+        elements.append(Paragraph("No participants assigned to this program.", pdf_engine.paragraph_style('Normal')))
+    return elements
+
+
+SHEET_STORIES = {
+    'calling': calling_sheet_story,
+    'evaluation': evaluation_sheet_story,
+}
+
+
+def render_sheet(kind, program, entries, school_settings):
+    """PDF bytes of one program sheet ('calling' or 'evaluation')"""
+    template = pdf_engine.get_template(school_settings)
+    return pdf_engine.render_pdf(SHEET_STORIES[kind](program, entries, template), **SHEET_MARGINS)
+
+
+def sheet_filename(kind, program):
+    """Download name of a program sheet (as used by the per-program sheet views)"""
+    if kind == 'calling':
+        return f"{program.name.replace(' ', '_')}_formatted_calling_sheet.pdf"
+    return f"{program.name.replace(' ', '_')}_evaluation_sheet.pdf"
+
+
+# Print pack
+
+def _iso_date(value):
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(f'Invalid date: {value} (expected YYYY-MM-DD)')
+    return parsed.isoformat()
+
+
+# Query options of the print pack report (see reports.report_view)
+PRINT_PACK_OPTIONS = {
+    'category': ('hs', 'hss', 'general'),
+    'program_type': ('stage', 'off_stage'),
+    'date': _iso_date,
+    'sheets': ('calling', 'evaluation', 'both'),
+    'output': ('pdf', 'zip'),
+}
+
+
+def get_print_pack_programs(event_id, category=None, program_type=None, date=None):
+    """The event's active programs selected for a print pack, in schedule order"""
+    from .models import Program
+
+    programs = Program.objects.filter(event_id=event_id, is_active=True).select_related('event')
+    if category:
+        programs = programs.filter(category=category)
+    if program_type:
+        programs = programs.filter(program_type=program_type)
+    if date:
+        programs = programs.filter(start_time__date=date)
+    return list(programs.order_by('start_time', 'name', 'id'))
+
+
+def load_print_pack_entries(programs):
+    """{program_id: sheet entries} for all programs from one assignments query (plus one chest number query)"""
+    from .models import ProgramAssignment
+
+    if not programs:
+        return {}
+    assignments_by_program = {program.id: [] for program in programs}
+    assignments = ProgramAssignment.objects.filter(
+        program_id__in=assignments_by_program
+    ).select_related('student', 'team').order_by('program_id', 'chest_number', 'student__first_name')
+    for assignment in assignments:
+        assignments_by_program[assignment.program_id].append(assignment)
+
+    chest_numbers = chest_number_map(programs[0].event_id, [
+        student_id
+        for program_assignments in assignments_by_program.values()
+        for student_id in fallback_student_ids(program_assignments)
+    ])
+    return {
+        program.id: sheet_entries(program, assignments_by_program[program.id], chest_numbers)
+        for program in programs
+    }
+
+
+def _init_pack_worker():
+    """Process pool initializer; spawned (not forked) workers need Django set up"""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def _render_program_sheets(kinds, program, entries, school_settings):
+    """[(kind, pdf bytes)] for one program; runs in a pool process without database access"""
+    return [(kind, render_sheet(kind, program, entries, school_settings)) for kind in kinds]
+
+
+def _pack_workers(program_count):
+    from django.conf import settings
+
+    workers = settings.PRINT_PACK_WORKERS or os.cpu_count() or 1
+    return max(1, min(workers, program_count))
+
+
+def render_program_sheets(programs, entries, kinds, school_settings, progress=None):
+    """
+    Render the sheets of every program, in a process pool when worthwhile.
+
+    Returns {program_id: [(kind, pdf bytes)]}. `progress(done, total)` is
+    called as programs finish.
+    """
+    from django.db import connections
+
+    total = len(programs)
+    rendered = {}
+    workers = _pack_workers(total)
+
+    if workers == 1 or total < MIN_PARALLEL_PROGRAMS:
+        for done, program in enumerate(programs, start=1):
+            rendered[program.id] = _render_program_sheets(kinds, program, entries[program.id], school_settings)
+            if progress:
+                progress(done, total)
+        return rendered
+
+    # Forked pool processes must not inherit open database connections
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_pack_worker) as executor:
+        futures = {
+            executor.submit(_render_program_sheets, kinds, program, entries[program.id], school_settings): program.id
+            for program in programs
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            rendered[futures[future]] = future.result()
+            if progress:
+                progress(done, total)
+    return rendered
+
+
+def merge_pdfs(documents):
+    """Concatenate PDF documents (bytes) into one PDF"""
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for document in documents:
+        writer.append(BytesIO(document))
+    buffer = BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def zip_sheets(programs, rendered):
+    """ZIP with one folder per sheet kind, numbered in print order"""
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for index, program in enumerate(programs, start=1):
+            for kind, document in rendered[program.id]:
+                filename = re.sub(r'[^\w.-]+', '_', sheet_filename(kind, program))
+                archive.writestr(f'{kind}_sheets/{index:03d}_{filename}', document)
+    return buffer.getvalue()
+
+
+def build_print_pack(event_id, category=None, program_type=None, date=None, sheets='both', output='pdf', progress=None):
+    """
+    Calling and evaluation sheets of an event's programs as one file.
+
+    Returns (content, content_type, program_count). The merged PDF has each
+    program's calling sheet followed by its evaluation sheet; the ZIP holds
+    the individual sheet PDFs.
+    """
+    from accounts.models import SchoolSettings
+
+    programs = get_print_pack_programs(event_id, category=category, program_type=program_type, date=date)
+    kinds = SHEET_KINDS if sheets == 'both' else (sheets,)
+    if not programs:
+        return None, None, 0
+
+    entries = load_print_pack_entries(programs)
+    school_settings = SchoolSettings.get_settings()
+    rendered = render_program_sheets(programs, entries, kinds, school_settings, progress=progress)
+
+    if output == 'zip':
+        return zip_sheets(programs, rendered), 'application/zip', len(programs)
+    documents = [document for program in programs for kind, document in rendered[program.id]]
+    return merge_pdfs(documents), 'application/pdf', len(programs)
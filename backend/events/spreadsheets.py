@@ -0,0 +1,103 @@
+"""
+Streaming readers for uploaded Excel/CSV files.
+
+Bulk uploads read the sheet one row at a time (openpyxl read_only mode for
+.xlsx, the csv module for .csv) and process it in fixed-size chunks, so an
+import never holds the whole workbook or a DataFrame of it in memory.
+"""
+import csv
+import io
+from itertools import islice
+
+# Rows validated and written per chunk by the bulk upload views
+IMPORT_CHUNK_SIZE = 500
+
+SPREADSHEET_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+
+
+class SpreadsheetError(Exception):
+    """Raised when an uploaded file cannot be read as a spreadsheet"""
+
+
+def _cell_to_str(value):
+    """Render a cell the way pandas did (blank cells are '', whole floats lose their .0)"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _iter_xlsx(file):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(getattr(file, 'file', file), read_only=True, data_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield [_cell_to_str(value) for value in row]
+    finally:
+        workbook.close()
+
+
+def _iter_xls(file):
+    # Legacy .xls has no streaming reader; these files are small by nature
+    import xlrd
+
+    book = xlrd.open_workbook(file_contents=file.read(), on_demand=True)
+    sheet = book.sheet_by_index(0)
+    for index in range(sheet.nrows):
+        yield [_cell_to_str(value) for value in sheet.row_values(index)]
+
+
+def _iter_csv(file):
+    text = io.TextIOWrapper(getattr(file, 'file', file), encoding='utf-8-sig', newline='')
+    try:
+        for row in csv.reader(text):
+            yield [_cell_to_str(value) for value in row]
+    finally:
+        text.detach()
+
+
+def read_spreadsheet(file):
+    """
+    Open an uploaded .xlsx, .xls or .csv file for streaming.
+
+    Returns (headers, rows) where rows yields (row_number, values) for every
+    non-empty data row; row_number is the spreadsheet row (header is row 1).
+    Raises SpreadsheetError if the file cannot be read.
+    """
+    name = file.name.lower()
+    if name.endswith('.csv'):
+        reader = _iter_csv
+    elif name.endswith('.xlsx'):
+        reader = _iter_xlsx
+    elif name.endswith('.xls'):
+        reader = _iter_xls
+    else:
+        raise SpreadsheetError('Please upload an Excel (.xlsx, .xls) or CSV (.csv) file')
+
+    file.seek(0)
+    try:
+        row_iter = reader(file)
+        headers = next(row_iter, None)
+    except Exception as e:
+        raise SpreadsheetError(f'Error reading file: {str(e)}. Please ensure the file is a valid spreadsheet and not corrupted.')
+    if not headers:
+        raise SpreadsheetError('The uploaded file is empty')
+
+    def rows():
+        for row_number, values in enumerate(row_iter, start=2):
+            if any(values):
+                yield row_number, values
+
+    return headers, rows()
+
+
+def iter_chunks(iterable, size=IMPORT_CHUNK_SIZE):
+    """Yield lists of up to `size` items from an iterable"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
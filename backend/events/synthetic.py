@@ -0,0 +1,280 @@
+"""
+Deterministic synthetic fest data for load and performance testing.
+
+build_fest() writes students, teams, events, programs, assignments with chest
+numbers and judged results entirely with bulk_create, then derives positions,
+points, ledger totals, scoreboards and leaderboards the same way the app does.
+The same seed and options always produce the same dataset, so benchmark
+numbers from different runs and machines are comparable.
+"""
+import io
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+# Everything generated here is named with this prefix so flush_fest() can find it
+SEED_PREFIX = 'seed'
+
+FIRST_NAMES = [
+    'Aisha', 'Arjun', 'Fathima', 'Hana', 'Ibrahim', 'Lakshmi', 'Meera', 'Muhammed', 'Nihal', 'Rahul',
+    'Riya', 'Sahla', 'Sneha', 'Vishnu', 'Zainab', 'Adil', 'Anjali', 'Devika', 'Farhan', 'Nandana',
+]
+LAST_NAMES = ['K', 'P', 'M', 'T', 'V', 'A', 'C', 'N', 'R', 'S']
+
+STAGE_PROGRAMS = ['Elocution', 'Light Music', 'Mappilappattu', 'Mono Act', 'Recitation', 'Group Song', 'Oppana', 'Quiz']
+OFF_STAGE_PROGRAMS = ['Essay Writing', 'Story Writing', 'Poem Writing', 'Pencil Drawing', 'Water Colour', 'Calligraphy']
+
+# A team can hand out at most this many chest numbers per event (team N uses N*100..N*100+99)
+CHEST_NUMBERS_PER_TEAM = 100
+
+
+def build_fest(students=1000, teams=8, events=1, programs=100, participants_per_team=2,
+               finished=0.8, seed=1, start_date=None, batch_size=1000, log=None):
+    """
+    Generate a complete fest dataset and return counts of what was created.
+
+    Students are split between HS and HSS and spread round-robin over the
+    teams. Programs are split over the events; `finished` is the fraction of
+    programs that already have three judges' marks for every participant.
+    Call flush_fest() first to replace a previous dataset.
+    """
+    from django.contrib.auth.hashers import make_password
+    from django.core.management import call_command
+    from django.db.models import Max
+    from accounts.models import SchoolSettings, User
+    from .leaderboard import refresh_event_leaderboard
+    from .models import ChestNumber, Event, PointsRecord, Program, ProgramAssignment, ProgramResult, Team
+    from .ranking import points_for_position
+    from .scoreboard import refresh_event_scoreboard
+
+    log = log or (lambda message: None)
+    rng = random.Random(seed)
+    start_date = start_date or date.today()
+    # One unusable hash shared by every generated account; nobody logs in as them
+    password = make_password(None)
+
+    with transaction.atomic():
+        admin, _ = User.objects.get_or_create(
+            username=f'{SEED_PREFIX}_admin',
+            defaults={'email': f'{SEED_PREFIX}_admin@example.com', 'role': 'admin', 'is_staff': True, 'name': 'Seed Admin', 'password': password}
+        )
+        # Manages the first team, for the team-manager screens
+        team_manager, _ = User.objects.get_or_create(
+            username=f'{SEED_PREFIX}_team_manager',
+            defaults={'email': f'{SEED_PREFIX}_team_manager@example.com', 'role': 'team_manager', 'name': 'Seed Team Manager', 'password': password}
+        )
+
+        # Report headers need the school settings row; keep a real one if present
+        if not SchoolSettings.objects.exists():
+            SchoolSettings.objects.create(school_name=f'{SEED_PREFIX.title()} School')
+
+        # Teams continue after any real teams so numbers and chest ranges don't clash
+        first_number = (Team.objects.aggregate(last=Max('team_number'))['last'] or 0) + 1
+        team_objects = Team.objects.bulk_create([
+            Team(
+                name=f'{SEED_PREFIX.title()} Team {index + 1}',
+                team_number=first_number + index,
+                team_username=f'{SEED_PREFIX}_team_{index + 1}_team',
+                team_password=''.join(rng.choice('abcdefghjkmnpqrstuvwxyz23456789') for _ in range(8)),
+                team_manager=team_manager if index == 0 else None,
+            )
+            for index in range(teams)
+        ])
+        log(f'{len(team_objects)} teams')
+
+        student_objects = []
+        for index in range(students):
+            category = 'hs' if index % 2 == 0 else 'hss'
+            student_objects.append(User(
+                username=f'{SEED_PREFIX}_student_{index + 1}',
+                email=f'{SEED_PREFIX}_student_{index + 1}@example.com',
+                role='student',
+                name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                student_id=f'{SEED_PREFIX.upper()}{index + 1:05d}',
+                category=category,
+                grade=str(rng.randint(8, 10) if category == 'hs' else rng.randint(11, 12)),
+                section=rng.choice('ABCD'),
+                password=password,
+            ))
+        student_objects = User.objects.bulk_create(student_objects, batch_size=batch_size)
+        log(f'{len(student_objects)} students')
+
+        members = {team.id: [] for team in team_objects}
+        for index, student in enumerate(student_objects):
+            if team_objects:
+                members[team_objects[index % len(team_objects)].id].append(student)
+        Membership = Team.members.through
+        Membership.objects.bulk_create([
+            Membership(team_id=team_id, user_id=student.id)
+            for team_id, team_members in members.items() for student in team_members
+        ], batch_size=batch_size)
+
+        event_objects = Event.objects.bulk_create([
+            Event(
+                title=f'{SEED_PREFIX.title()} Fest {index + 1}',
+                description='Synthetic fest for load testing',
+                event_type='cultural',
+                status='ongoing',
+                start_date=start_date + timedelta(days=index * 7),
+                end_date=start_date + timedelta(days=index * 7 + 2),
+                venue='Main Campus',
+                created_by=admin,
+            )
+            for index in range(events)
+        ])
+
+        program_objects = []
+        for index in range(programs):
+            event = event_objects[index % len(event_objects)]
+            program_type = 'stage' if rng.random() < 0.6 else 'off_stage'
+            category = rng.choice(['hs', 'hs', 'hss', 'hss', 'general'])
+            is_team_based = category == 'general' and rng.random() < 0.5
+            # Eight 45-minute slots a day over the event's three days
+            slot = index // len(event_objects)
+            start = timezone.make_aware(datetime.combine(
+                event.start_date + timedelta(days=(slot // 8) % 3), time(9)
+            )) + timedelta(minutes=45 * (slot % 8))
+            base_name = rng.choice(STAGE_PROGRAMS if program_type == 'stage' else OFF_STAGE_PROGRAMS)
+            program_objects.append(Program(
+                event=event,
+                name=f'{base_name} {category.upper()} {index + 1}',
+                category=category,
+                program_type=program_type,
+                is_team_based=is_team_based,
+                team_size=rng.randint(3, 6) if is_team_based else None,
+                max_participants_per_team=participants_per_team if not is_team_based else None,
+                venue=f'Stage {rng.randint(1, 4)}' if program_type == 'stage' else f'Hall {rng.randint(1, 4)}',
+                start_time=start,
+                end_time=start + timedelta(minutes=40),
+                is_finished=rng.random() < finished,
+            ))
+        program_objects = Program.objects.bulk_create(program_objects, batch_size=batch_size)
+        log(f'{len(event_objects)} events, {len(program_objects)} programs')
+
+        # Each team fields participants from a pool that fits its chest number range
+        pools = {}
+        for event in event_objects:
+            for team in team_objects:
+                pool = rng.sample(members[team.id], min(CHEST_NUMBERS_PER_TEAM, len(members[team.id])))
+                pools[event.id, team.id] = {
+                    'hs': [student for student in pool if student.category == 'hs'],
+                    'hss': [student for student in pool if student.category == 'hss'],
+                    'general': pool,
+                }
+
+        # A student keeps one chest number per event, numbered in order of first appearance
+        chest_numbers = {}
+        next_number = {}
+        chest_number_objects = []
+        assignments = []
+        for program in program_objects:
+            for team in team_objects:
+                pool = pools[program.event_id, team.id][program.category]
+                count = program.team_size if program.is_team_based else participants_per_team
+                for student in rng.sample(pool, min(count, len(pool))):
+                    key = (program.event_id, student.id)
+                    if key not in chest_numbers:
+                        number = next_number.get((program.event_id, team.id), team.team_number * 100)
+                        next_number[program.event_id, team.id] = number + 1
+                        chest_numbers[key] = number
+                        chest_number_objects.append(ChestNumber(
+                            event_id=program.event_id, student=student, team=team,
+                            chest_number=number, assigned_by=admin
+                        ))
+                    assignments.append(ProgramAssignment(
+                        program=program, student=student, team=team,
+                        chest_number=chest_numbers[key], assigned_by=admin
+                    ))
+        ChestNumber.objects.bulk_create(chest_number_objects, batch_size=batch_size)
+        ProgramAssignment.objects.bulk_create(assignments, batch_size=batch_size)
+        log(f'{len(assignments)} assignments, {len(chest_number_objects)} chest numbers')
+
+        # Judge finished programs and rank them in memory (as rank_program would)
+        by_program = {}
+        for assignment in assignments:
+            by_program.setdefault(assignment.program_id, []).append(assignment)
+        results = []
+        points_records = []
+        result_numbers = {}
+        for program in program_objects:
+            if not program.is_finished or program.id not in by_program:
+                continue
+            result_number = result_numbers.get(program.event_id, 0) + 1
+            result_numbers[program.event_id] = result_number
+
+            program_results = []
+            for assignment in by_program[program.id]:
+                marks = [Decimal(rng.randint(3000, 10000)) / 100 for _ in range(3)]
+                total = sum(marks)
+                program_results.append(ProgramResult(
+                    program=program, participant_id=assignment.student_id, team=assignment.team,
+                    result_number=result_number,
+                    judge1_marks=marks[0], judge2_marks=marks[1], judge3_marks=marks[2],
+                    total_marks=total, average_marks=(total / 3).quantize(Decimal('0.01')),
+                    entered_by=admin,
+                ))
+            program_results.sort(key=lambda result: (-result.average_marks, -result.total_marks))
+            for position, result in enumerate(program_results, 1):
+                result.position = position
+                result.points_earned = points_for_position(program.category, position)
+                if result.points_earned:
+                    points_records.extend(_points_records(program, result, admin))
+            results.extend(program_results)
+
+        ProgramResult.objects.bulk_create(results, batch_size=batch_size)
+        PointsRecord.objects.bulk_create(points_records, batch_size=batch_size)
+        log(f'{len(results)} results, {len(points_records)} points records')
+
+    # Derived tables, rebuilt the same way as after a real fest day
+    call_command('reconcile_points', stdout=io.StringIO())
+    for event in event_objects:
+        refresh_event_scoreboard(event.id)
+        refresh_event_leaderboard(event.id)
+
+    return {
+        'teams': len(team_objects),
+        'students': len(student_objects),
+        'events': len(event_objects),
+        'programs': len(program_objects),
+        'assignments': len(assignments),
+        'chest_numbers': len(chest_number_objects),
+        'results': len(results),
+        'points_records': len(points_records),
+    }
+
+
+def flush_fest():
+    """Delete everything a previous build_fest() created; returns the number of rows deleted"""
+    from accounts.models import User
+    from .models import Event, Team
+
+    with transaction.atomic():
+        deleted = Event.objects.filter(created_by__username=f'{SEED_PREFIX}_admin').delete()[0]
+        deleted += Team.objects.filter(team_username__startswith=f'{SEED_PREFIX}_team_').delete()[0]
+        deleted += User.objects.filter(username__startswith=f'{SEED_PREFIX}_').delete()[0]
+    return deleted
+
+
+def _points_records(program, result, admin):
+    """Ledger rows for a placed result, matching ProgramResult.distribute_points_to_team_and_members"""
+    from .models import PointsRecord
+
+    position = result.position
+    point_type = 'event_winner' if position == 1 else 'event_runner_up' if position == 2 else 'event_participation'
+    position_text = 'Winner' if position == 1 else 'Runner-up' if position == 2 else f'{position}rd place'
+    records = [PointsRecord(
+        student_id=result.participant_id, event_id=program.event_id, points=result.points_earned,
+        point_type=point_type, reason=f'{program.name} - {position_text}',
+        description=f'Individual points for {position_text} in {program.name}', awarded_by=admin
+    )]
+    if result.team_id:
+        records.append(PointsRecord(
+            team_id=result.team_id, event_id=program.event_id, points=result.points_earned,
+            point_type=point_type, reason=f'{program.name} - {position_text}',
+            description=f'Points earned in {program.name}', awarded_by=admin
+        ))
+    return records
+
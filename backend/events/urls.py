@@ -22,6 +22,9 @@ programs_router.register(r'results', views.ProgramResultViewSet, basename='progr
 
 # Additional URL patterns for utility views
 urlpatterns = [
+    # Ahead of the router, whose events/<pk>/ route would match it first
+    path('events/test-list/', views.test_events_list, name='test_events_list'),
+
     path('', include(router.urls)),
     path('', include(events_router.urls)),
     path('', include(programs_router.urls)),
@@ -30,6 +33,10 @@ urlpatterns = [
     path('events/<int:pk>/points/teams/', views.EventViewSet.as_view({'get': 'points_teams'}), name='event-points-teams'),
     path('events/<int:pk>/points/students/', views.EventViewSet.as_view({'get': 'points_students'}), name='event-points-students'),
     
+    # Live results push channel (server-sent events)
+    path('events/<int:event_id>/live/', views.event_live_updates, name='event_live_updates'),
+    path('events/<int:event_id>/live/token/', views.event_live_token, name='event_live_token'),
+    
     # Program utility endpoints
     path('programs/<int:program_id>/calling-sheet/', views.generate_calling_sheet, name='generate_calling_sheet'),
     path('programs/<int:program_id>/formatted-calling-sheet/', views.generate_formatted_calling_sheet, name='generate_formatted_calling_sheet'),
@@ -44,7 +51,6 @@ urlpatterns = [
     path('custom-template-demo/', views.generate_custom_template_demo, name='generate_custom_template_demo'),
 
     # Report generation endpoints
-    path('events/test-list/', views.test_events_list, name='test_events_list'),
     path('events/<int:event_id>/reports/test/', views.test_report_generation, name='test_report_generation'),
     path('events/<int:event_id>/reports/test-pdf/', views.test_pdf_generation, name='test_pdf_generation'),
     path('events/<int:event_id>/reports/program-details/', views.generate_program_details_report, name='generate_program_details_report'),
@@ -54,9 +60,18 @@ urlpatterns = [
     path('events/<int:event_id>/reports/third-place/', views.generate_third_place_report, name='generate_third_place_report'),
     path('events/<int:event_id>/reports/all-results/', views.generate_all_results_report, name='generate_all_results_report'),
     path('events/<int:event_id>/reports/participants-team/', views.generate_participants_team_report, name='generate_participants_team_report'),
+    path('events/<int:event_id>/reports/print-pack/', views.generate_print_pack, name='generate_print_pack'),
     path('events/<int:event_id>/reports/backup/', views.generate_event_backup, name='generate_event_backup'),
     path('events/reports/all-events/', views.generate_all_events_report, name='generate_all_events_report'),
     
+    # Request metrics (RequestMetricsMiddleware, admin only)
+    path('metrics/requests/', views.request_metrics, name='request_metrics'),
+    
+    # Background report jobs
+    path('reports/jobs/', views.report_jobs, name='report_jobs'),
+    path('reports/jobs/<int:job_id>/', views.report_job_detail, name='report_job_detail'),
+    path('reports/jobs/<int:job_id>/download/', views.report_job_download, name='report_job_download'),
+    
     # Executable report endpoints
     path('events/<int:event_id>/reports/program-details-executable/', views.generate_program_details_executable, name='generate_program_details_executable'),
     path('events/<int:event_id>/reports/complete-results-executable/', views.generate_complete_results_executable, name='generate_complete_results_executable'),
@@ -5,13 +5,14 @@ from django.utils import timezone
 from django.http import HttpResponse
 from django.contrib.auth import get_user_model
 from rest_framework import viewsets, permissions, status, filters
-from rest_framework.decorators import action, api_view, permission_classes, authentication_classes
+from rest_framework.decorators import action, api_view, permission_classes, authentication_classes, renderer_classes
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 import django_filters
-from .models import Event, Team, IndividualParticipation, EventAnnouncement, Program, ProgramAssignment, ProgramResult, PointsRecord, TeamProfile, ChestNumber
+from .models import Event, Team, IndividualParticipation, EventAnnouncement, Program, ProgramAssignment, ProgramResult, PointsRecord, TeamProfile, ChestNumber, ScoreboardEntry
 from .serializers import (
     EventListSerializer, EventDetailSerializer, EventCreateUpdateSerializer,
     TeamSerializer, TeamCreateSerializer, TeamCreateUpdateSerializer, IndividualParticipationSerializer,
@@ -19,7 +20,7 @@ from .serializers import (
     ProgramSerializer, ProgramAssignmentSerializer, ProgramResultSerializer,
     PointsRecordSerializer, PointsRecordCreateSerializer, TeamProfileSerializer,
     EventWithProgramsSerializer, ChestNumberSerializer, MarkEntrySerializer,
-    ProgramResultSummarySerializer
+    ProgramResultSummarySerializer, ScoreboardEntrySerializer, get_program_results_context
 )
 from .permissions import IsAdminOrEventManager, IsTeamManagerOrAdmin, TeamManagerAuthentication
 from accounts.models import User
@@ -31,12 +32,13 @@ from openpyxl.styles import Font, PatternFill, Alignment
 from collections import defaultdict
 # from .pdf_utils import build_pdf_header
 from .pagination import StandardPagination, LargePagination, SmallPagination, CustomPagination
-# from reportlab.lib import colors
-# from reportlab.lib.pagesizes import letter, A4
-# from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-# from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-# from reportlab.lib.units import inch
-# from reportlab.pdfgen import canvas
+from .reports import report_view
+from .sheets import PRINT_PACK_OPTIONS
+from .live import EventStreamRenderer
+from .data_version import schedule_data_version_bump
+from . import pdf_engine
+from reportlab.platypus import Paragraph, Spacer
+from reportlab.lib.units import inch
 import json
 from datetime import datetime
 
@@ -192,11 +194,13 @@ class EventViewSet(viewsets.ModelViewSet):
         
         if event.is_team_based:
             teams = Team.objects.filter(program_assignments__program__event=event).distinct().prefetch_related('members')
-            serializer = TeamSerializer(teams, many=True)
+            page = self.paginate_queryset(teams)
+            serializer = TeamSerializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         else:
             participants = IndividualParticipation.objects.filter(event=event).select_related('participant')
-            serializer = IndividualParticipationSerializer(participants, many=True)
+            page = self.paginate_queryset(participants)
+            serializer = IndividualParticipationSerializer(page, many=True)
             return self.get_paginated_response(serializer.data)
     
     @action(detail=True, methods=['get'])
@@ -204,7 +208,8 @@ class EventViewSet(viewsets.ModelViewSet):
         """Get event announcements"""
         event = self.get_object()
         announcements = EventAnnouncement.objects.filter(event=event).select_related('created_by')
-        serializer = EventAnnouncementSerializer(announcements, many=True)
+        page = self.paginate_queryset(announcements)
+        serializer = EventAnnouncementSerializer(page, many=True)
         return self.get_paginated_response(serializer.data)
     
     @action(detail=True, methods=['post'], permission_classes=[IsAdminOrEventManager])
@@ -225,7 +230,7 @@ class EventViewSet(viewsets.ModelViewSet):
         
         stats = {
             'total_participants': event.current_participants,
-            'registration_progress': (event.current_participants / event.max_participants) * 100,
+            'registration_progress': (event.current_participants / (event.max_participants or 1)) * 100,
             'status': event.status,
             'days_until_start': (event.start_date - timezone.now().date()).days,
             'is_registration_open': event.is_registration_open,
@@ -244,70 +249,79 @@ class EventViewSet(viewsets.ModelViewSet):
         """Get comprehensive analytics for an event"""
         event = self.get_object()
         
-        # Basic statistics
-        programs = event.programs.filter(is_active=True)
-        total_programs = programs.count()
-        programs_with_results = programs.filter(results__isnull=False).distinct().count()
-        
-        # Participation statistics
-        total_assignments = ProgramAssignment.objects.filter(program__event=event).count()
-        unique_participants = ProgramAssignment.objects.filter(
-            program__event=event
-        ).values('student').distinct().count()
+        categories = [category for category, _ in Program.CATEGORY_CHOICES]
         
-        # Team statistics
-        participating_teams = Team.objects.filter(
-            program_assignments__program__event=event
-        ).distinct().count()
+        # Basic statistics and per-category program counts in one query
+        programs = event.programs.filter(is_active=True)
+        program_counts = programs.aggregate(
+            total_programs=Count('id', distinct=True),
+            programs_with_results=Count('id', filter=Q(results__isnull=False), distinct=True),
+            **{
+                f'{category}_programs': Count('id', filter=Q(category=category), distinct=True)
+                for category in categories
+            }
+        )
+        total_programs = program_counts['total_programs']
+        programs_with_results = program_counts['programs_with_results']
+        
+        # Participation, team and per-category assignment statistics in one query
+        active_assignment = Q(program__is_active=True)
+        assignment_counts = ProgramAssignment.objects.filter(program__event=event).aggregate(
+            total_assignments=Count('id'),
+            unique_participants=Count('student', distinct=True),
+            participating_teams=Count('team', distinct=True),
+            **{
+                f'{category}_participants': Count('id', filter=active_assignment & Q(program__category=category))
+                for category in categories
+            },
+            **{
+                f'{category}_teams': Count('team', filter=active_assignment & Q(program__category=category), distinct=True)
+                for category in categories
+            }
+        )
+        total_assignments = assignment_counts['total_assignments']
+        unique_participants = assignment_counts['unique_participants']
+        participating_teams = assignment_counts['participating_teams']
         
         # Category breakdown
         category_stats = {}
-        for category, _ in Program.CATEGORY_CHOICES:
-            category_programs = programs.filter(category=category)
+        for category in categories:
             category_stats[category] = {
-                'programs': category_programs.count(),
-                'participants': ProgramAssignment.objects.filter(
-                    program__in=category_programs
-                ).count(),
-                'teams': Team.objects.filter(
-                    program_assignments__program__in=category_programs
-                ).distinct().count()
+                'programs': program_counts[f'{category}_programs'],
+                'participants': assignment_counts[f'{category}_participants'],
+                'teams': assignment_counts[f'{category}_teams']
             }
         
         # Performance metrics
         results = ProgramResult.objects.filter(program__event=event)
-        avg_score = results.aggregate(avg=Avg('marks'))['avg'] or 0
-        highest_score = results.aggregate(max=models.Max('marks'))['max'] or 0
-        total_winners = results.filter(position__lte=3).count()
-        
-        # Team rankings for this event
-        team_points = {}
-        for result in results.filter(team__isnull=False):
-            team_id = result.team.id
-            if team_id not in team_points:
-                team_points[team_id] = {
-                    'team': result.team,
-                    'total_points': 0,
-                    'programs_participated': set(),
-                    'programs_won': 0
-                }
-            team_points[team_id]['total_points'] += result.points_earned
-            team_points[team_id]['programs_participated'].add(result.program.id)
-            if result.position == 1:
-                team_points[team_id]['programs_won'] += 1
+        performance = results.aggregate(
+            avg_score=Avg('marks'),
+            highest_score=Max('marks'),
+            total_winners=Count('id', filter=Q(position__lte=3))
+        )
+        avg_score = performance['avg_score'] or 0
+        highest_score = performance['highest_score'] or 0
+        total_winners = performance['total_winners']
+        
+        # Team rankings for this event, grouped in the database
+        team_totals = results.filter(team__isnull=False).values('team_id', 'team__name').annotate(
+            total_points=Sum('points_earned'),
+            programs_participated=Count('program', distinct=True),
+            programs_won=Count('id', filter=Q(position=1))
+        ).order_by('-total_points', 'team__name')
         
-        # Convert to list and sort
         team_rankings = []
-        for team_data in team_points.values():
+        for team_data in team_totals[:10]:  # Top 10 teams
             team_rankings.append({
-                'id': team_data['team'].id,
-                'name': team_data['team'].name,
-                'total_points': team_data['total_points'],
-                'programs_participated': len(team_data['programs_participated']),
+                'id': team_data['team_id'],
+                'name': team_data['team__name'],
+                'total_points': team_data['total_points'] or 0,
+                'programs_participated': team_data['programs_participated'],
                 'programs_won': team_data['programs_won'],
-                'win_rate': (team_data['programs_won'] / len(team_data['programs_participated']) * 100) if team_data['programs_participated'] else 0
+                'win_rate': (team_data['programs_won'] / team_data['programs_participated'] * 100) if team_data['programs_participated'] else 0
             })
-        team_rankings.sort(key=lambda x: x['total_points'], reverse=True)
+        
+        total_students = User.objects.filter(role='student').count()
         
         return Response({
             'total_programs': total_programs,
@@ -315,13 +329,13 @@ class EventViewSet(viewsets.ModelViewSet):
             'programs_with_results': programs_with_results,
             'total_participants': unique_participants,
             'total_teams': participating_teams,
-            'participation_rate': (unique_participants / User.objects.filter(role='student').count() * 100) if User.objects.filter(role='student').count() > 0 else 0,
+            'participation_rate': (unique_participants / total_students * 100) if total_students > 0 else 0,
             'avg_programs_per_student': (total_assignments / unique_participants) if unique_participants > 0 else 0,
             'category_stats': category_stats,
             'avg_score': round(avg_score, 2),
             'highest_score': highest_score,
             'total_winners': total_winners,
-            'team_rankings': team_rankings[:10],  # Top 10 teams
+            'team_rankings': team_rankings,
             'close_competitions': results.filter(
                 position__lte=3
             ).values('program').annotate(
@@ -876,9 +890,11 @@ class EventViewSet(viewsets.ModelViewSet):
         programs = event.programs.filter(is_active=True)
         if category:
             programs = programs.filter(category=category)
-        # Only include programs with at least one result with average_marks not null
-        programs_with_results = programs.filter(results__average_marks__isnull=False).distinct()
-        serializer = ProgramSerializer(programs_with_results, many=True)
+        # Only include programs with at least one result with average_marks not null (on the scoreboard)
+        programs_with_results = ProgramSerializer.setup_queryset(
+            programs.filter(id__in=ScoreboardEntry.objects.filter(event=event).values('program_id')), request
+        )
+        serializer = ProgramSerializer(programs_with_results, many=True, context={'request': request})
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
@@ -1101,18 +1117,22 @@ class TeamViewSet(viewsets.ModelViewSet):
     def deletion_preview(self, request, pk=None):
         """Preview what will be deleted when this team is removed"""
         team = self.get_object()
-        
-        # Get summary of related data
-        related_data = team.get_related_data_summary()
-        
-        return Response({
-            'team_id': team.id,
-            'team_name': team.name,
+        return Response(self._deletion_preview_data(team))
+    
+    def _deletion_preview_data(self, team):
+        preview = team.delete(dry_run=True)
+        total = preview['total_records']
+        return {
+            **preview,
             'warning': 'This action will permanently delete the team and all related data.',
-            'related_data': related_data,
-            'total_records': sum(related_data.values()),
-            'message': f'Deleting this team will remove {sum(related_data.values())} related records including program assignments, results, chest numbers, and points records.'
-        })
+            'message': f'Deleting this team will remove {total} related records including program assignments, results, chest numbers, and points records.'
+        }
+    
+    def destroy(self, request, *args, **kwargs):
+        """Delete a team; with ?dry_run=true only report what would be deleted"""
+        if request.query_params.get('dry_run', '').lower() in ('1', 'true', 'yes'):
+            return Response(self._deletion_preview_data(self.get_object()))
+        return super().destroy(request, *args, **kwargs)
     
     @action(detail=False, methods=['post'], permission_classes=[IsAdminOrEventManager])
     def reset_numbering(self, request):
@@ -1480,6 +1500,10 @@ class ProgramViewSet(viewsets.ModelViewSet):
         if event_pk:
             queryset = queryset.filter(event_id=event_pk)
         
+        # Counts, event and assignments for the serializer, loaded up front
+        if self.action in ['list', 'retrieve', 'by_category', 'by_time_status']:
+            queryset = ProgramSerializer.setup_queryset(queryset, self.request)
+        
         return queryset
     
     def list(self, request, *args, **kwargs):
@@ -1545,59 +1569,71 @@ class ProgramViewSet(viewsets.ModelViewSet):
         })
     
     @action(detail=False, methods=['get'])
-    def by_category(self, request):
+    def by_category(self, request, event_pk=None):
         """Get programs grouped by category"""
-        categories = Program.objects.values('category').annotate(
-            count=Count('id'),
-            category_display=models.Case(
-                models.When(category='hs', then=models.Value('High School')),
-                models.When(category='hss', then=models.Value('Higher Secondary School')),
-                models.When(category='general', then=models.Value('General')),
-                default=models.Value('Unknown'),
-                output_field=models.CharField()
-            )
-        ).order_by('category')
+        category_names = {
+            'hs': 'High School',
+            'hss': 'Higher Secondary School',
+            'general': 'General',
+        }
+        
+        # Serialize every program once and group the rows in memory
+        programs = self.get_queryset().order_by('category', 'start_time')
+        serializer = self.get_serializer(programs, many=True)
         
         result = {}
-        for category in categories:
-            cat_programs = Program.objects.filter(category=category['category']).order_by('start_time')
-            result[category['category']] = {
-                'display_name': category['category_display'],
-                'count': category['count'],
-                'programs': ProgramSerializer(cat_programs, many=True).data
-            }
+        for program, data in zip(programs, serializer.data):
+            category = result.setdefault(program.category, {
+                'display_name': category_names.get(program.category, 'Unknown'),
+                'count': 0,
+                'programs': []
+            })
+            category['count'] += 1
+            category['programs'].append(data)
         
         return Response(result)
     
     @action(detail=False, methods=['get'])
-    def by_time_status(self, request):
+    def by_time_status(self, request, event_pk=None):
         """Get programs grouped by time status (upcoming, ongoing, finished)"""
         now = timezone.now()
         
-        upcoming = Program.objects.filter(start_time__gt=now, is_finished=False).order_by('start_time')
-        ongoing = Program.objects.filter(start_time__lte=now, end_time__gte=now, is_finished=False).order_by('start_time')
-        finished = Program.objects.filter(is_finished=True).order_by('-end_time')
+        # One query for the programs in any of the three groups, split in memory
+        programs = list(self.get_queryset().filter(
+            Q(is_finished=True) | Q(start_time__gt=now) | Q(start_time__lte=now, end_time__gte=now)
+        ).order_by('start_time'))
+        
+        upcoming = [p for p in programs if not p.is_finished and p.start_time and p.start_time > now]
+        ongoing = [
+            p for p in programs
+            if not p.is_finished and p.start_time and p.end_time and p.start_time <= now <= p.end_time
+        ]
+        finished = sorted(
+            (p for p in programs if p.is_finished),
+            key=lambda p: (p.end_time is not None, p.end_time),
+            reverse=True
+        )
         
         return Response({
             'upcoming': {
-                'count': upcoming.count(),
-                'programs': ProgramSerializer(upcoming, many=True).data
+                'count': len(upcoming),
+                'programs': self.get_serializer(upcoming, many=True).data
             },
             'ongoing': {
-                'count': ongoing.count(),
-                'programs': ProgramSerializer(ongoing, many=True).data
+                'count': len(ongoing),
+                'programs': self.get_serializer(ongoing, many=True).data
             },
             'finished': {
-                'count': finished.count(),
-                'programs': ProgramSerializer(finished, many=True).data
+                'count': len(finished),
+                'programs': self.get_serializer(finished, many=True).data
             }
         })
     
     @action(detail=False, methods=['get'])
-    def category_counts(self, request):
+    def category_counts(self, request, event_pk=None):
         """Get category counts for programs in the current event"""
-        # Get the event from the URL parameters
-        event_pk = self.kwargs.get('event_pk')
+        # Nested under the event (/events/<event_pk>/programs/) or ?event_id= on /programs/
+        event_pk = event_pk or request.query_params.get('event_id')
         
         if not event_pk:
             return Response({'error': 'Event ID is required'}, status=status.HTTP_400_BAD_REQUEST)
@@ -1820,72 +1856,84 @@ class ProgramAssignmentViewSet(viewsets.ModelViewSet):
         return Response(response_data, status=status.HTTP_200_OK if assignments else status.HTTP_400_BAD_REQUEST)
     
     @action(detail=False, methods=['post'])
-    def bulk_upload(self, request, program_pk=None):
-        """AI-powered bulk upload students to a program with Excel support"""
+    def bulk_upload(self, request, event_pk=None, program_pk=None):
+        """AI-powered bulk upload students to a program with Excel/CSV support"""
+        from django.db import transaction
+        from .chest_numbers import ChestNumberRangeFull
+        from .spreadsheets import read_spreadsheet, iter_chunks, SpreadsheetError, SPREADSHEET_EXTENSIONS
+        
         if 'file' not in request.FILES:
             return Response({'error': 'No file uploaded'}, status=status.HTTP_400_BAD_REQUEST)
         
         file = request.FILES['file']
-        if not file.name.endswith(('.xlsx', '.xls')):
-            return Response({'error': 'Please upload an Excel file (.xlsx or .xls)'}, status=status.HTTP_400_BAD_REQUEST)
+        if not file.name.lower().endswith(SPREADSHEET_EXTENSIONS):
+            return Response({'error': 'Please upload an Excel (.xlsx, .xls) or CSV (.csv) file'}, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            program = Program.objects.get(id=program_pk)
+            program = Program.objects.select_related('event').get(id=program_pk)
             
-            # Read Excel file
+            # Stream the rows instead of loading the whole sheet into memory
             try:
-                df = pd.read_excel(file, engine='openpyxl' if file.name.endswith('.xlsx') else 'xlrd')
-            except Exception as e:
-                return Response({'error': f'Error reading Excel file: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
+                headers, rows = read_spreadsheet(file)
+            except SpreadsheetError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
             
-            # AI-powered column detection and data validation
-            results = self._process_excel_with_ai(df, program)
+            # AI-powered column detection
+            columns = [header.lower() for header in headers]
+            column_mapping = self._detect_columns(columns)
             
-            if results['errors']:
+            if not column_mapping['student_id']:
                 return Response({
                     'error': 'Data validation failed',
-                    'details': results['errors'],
-                    'suggestions': results['suggestions']
+                    'details': ['Could not find student ID column. Expected columns: student_id, id, student_number, or similar.'],
+                    'suggestions': ['Please ensure your Excel file has a column for student IDs named: "student_id", "id", "student_number", or "roll_number"']
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Process successful assignments
+            total_processed = 0
+            errors = []
             assignments = []
             skipped = []
+            seen_student_ids = set()
+            match_cache = {}
             
-            for student_data in results['valid_students']:
-                try:
-                    student = student_data['student']
-                    
-                    # Check if already assigned
-                    if ProgramAssignment.objects.filter(program=program, student=student).exists():
-                        skipped.append({
-                            'student_id': student.student_id,
-                            'name': student.get_full_name(),
-                            'reason': 'Already assigned to this program'
-                        })
-                        continue
-                    
-                    # Find student's team (teams are no longer linked to events)
-                    team = None
-                    try:
-                        team = Team.objects.get(members=student)
-                    except Team.DoesNotExist:
-                        pass
-                    
-                    assignment = ProgramAssignment.objects.create(
-                        program=program,
-                        student=student,
-                        team=team,
-                        assigned_by=request.user
-                    )
-                    assignments.append(assignment)
+            # Validate and write one chunk at a time. Nothing is assigned if any row
+            # is invalid: after the first error the remaining rows are only validated
+            # so every error can be reported, and the transaction is rolled back.
+            try:
+                with transaction.atomic():
+                    for chunk in iter_chunks(rows):
+                        valid_students = self._validate_assignment_rows(
+                            chunk, columns, column_mapping, program, errors, match_cache
+                        )
+                        total_processed += len(valid_students)
+                        if errors or not valid_students:
+                            continue
+                        
+                        chunk_assignments, chunk_skipped = self._assign_students_chunk(
+                            program, valid_students, seen_student_ids, request.user
+                        )
+                        assignments.extend(chunk_assignments)
+                        skipped.extend(chunk_skipped)
                     
-                except Exception as e:
-                    skipped.append({
-                        'student_id': student_data.get('student_id', 'Unknown'),
-                        'name': student_data.get('name', 'Unknown'),
-                        'reason': f'Error creating assignment: {str(e)}'
-                    })
+                    if errors:
+                        transaction.set_rollback(True)
+            except ChestNumberRangeFull as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            
+            if errors:
+                suggestions = []
+                if total_processed == 0:
+                    suggestions = [
+                        'Check if student IDs in the Excel file match exactly with those in the system',
+                        'Ensure there are no extra spaces or special characters in student IDs',
+                        'Verify that students exist in the system and have the correct category',
+                        'Download the template file for the correct format'
+                    ]
+                return Response({
+                    'error': 'Data validation failed',
+                    'details': errors,
+                    'suggestions': suggestions
+                }, status=status.HTTP_400_BAD_REQUEST)
             
             serializer = self.get_serializer(assignments, many=True)
             return Response({
@@ -1894,7 +1942,7 @@ class ProgramAssignmentViewSet(viewsets.ModelViewSet):
                 'assignments': serializer.data,
                 'skipped': skipped,
                 'summary': {
-                    'total_processed': len(results['valid_students']),
+                    'total_processed': total_processed,
                     'successful_assignments': len(assignments),
                     'skipped_assignments': len(skipped),
                     'program_name': program.name,
@@ -1907,64 +1955,86 @@ class ProgramAssignmentViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({'error': f'Unexpected error: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    def _process_excel_with_ai(self, df, program):
-        """AI-powered processing of Excel data with smart column detection and validation"""
-        results = {
-            'valid_students': [],
-            'errors': [],
-            'suggestions': []
+    def _validate_assignment_rows(self, chunk, columns, column_mapping, program, errors, match_cache):
+        """Match one chunk of spreadsheet rows to students, appending row errors to `errors`"""
+        parsed_rows = []
+        for row_number, values in chunk:
+            row = dict(zip(columns, values))
+            student_identifier = str(row.get(column_mapping['student_id'], '')).strip()
+            if student_identifier == '' or student_identifier.lower() == 'nan':
+                continue
+            parsed_rows.append((row_number, row, student_identifier))
+        
+        # Direct student_id matches for the whole chunk in one query
+        students_by_id = {
+            student.student_id: student
+            for student in User.objects.filter(
+                role='student', student_id__in=[identifier for _, _, identifier in parsed_rows]
+            ).prefetch_related('team_memberships')
         }
         
-        # Clean column names
-        df.columns = df.columns.str.strip().str.lower()
-        
-        # AI-powered column mapping
-        column_mapping = self._detect_columns(df.columns.tolist())
-        
-        if not column_mapping['student_id']:
-            results['errors'].append('Could not find student ID column. Expected columns: student_id, id, student_number, or similar.')
-            results['suggestions'].append('Please ensure your Excel file has a column for student IDs named: "student_id", "id", "student_number", or "roll_number"')
-            return results
-        
-        # Process each row
-        for index, row in df.iterrows():
+        valid_students = []
+        for row_number, row, student_identifier in parsed_rows:
             try:
-                # Extract student identifier
-                student_identifier = str(row[column_mapping['student_id']]).strip()
-                if pd.isna(student_identifier) or student_identifier == '' or student_identifier.lower() == 'nan':
-                    continue
-                
                 # Smart student matching with AI
-                student = self._find_student_with_ai(student_identifier, row, column_mapping)
+                student = students_by_id.get(student_identifier)
+                if student is None:
+                    student = self._find_student_with_ai(student_identifier, row, column_mapping, match_cache)
                 
                 if student:
                     # Validate student category against program requirements
                     if self._validate_student_for_program(student, program):
-                        results['valid_students'].append({
+                        valid_students.append({
                             'student': student,
                             'student_id': student.student_id,
                             'name': student.get_full_name(),
                             'category': student.category,
-                            'row_number': index + 2  # Excel row number (1-indexed + header)
+                            'row_number': row_number
                         })
                     else:
-                        results['errors'].append(f'Row {index + 2}: Student {student.student_id} ({student.get_full_name()}) does not meet program category requirements')
+                        errors.append(f'Row {row_number}: Student {student.student_id} ({student.get_full_name()}) does not meet program category requirements')
                 else:
-                    results['errors'].append(f'Row {index + 2}: Could not find student with identifier "{student_identifier}"')
+                    errors.append(f'Row {row_number}: Could not find student with identifier "{student_identifier}"')
                     
             except Exception as e:
-                results['errors'].append(f'Row {index + 2}: Error processing data - {str(e)}')
-        
-        # Add suggestions for common issues
-        if len(results['valid_students']) == 0 and len(results['errors']) > 0:
-            results['suggestions'].extend([
-                'Check if student IDs in the Excel file match exactly with those in the system',
-                'Ensure there are no extra spaces or special characters in student IDs',
-                'Verify that students exist in the system and have the correct category',
-                'Download the template file for the correct format'
-            ])
+                errors.append(f'Row {row_number}: Error processing data - {str(e)}')
         
-        return results
+        return valid_students
+    
+    def _assign_students_chunk(self, program, valid_students, seen_student_ids, assigned_by):
+        """Assign one chunk of matched students with bulk writes, returning (assignments, skipped)"""
+        already_assigned = set(ProgramAssignment.objects.filter(
+            program=program,
+            student_id__in=[student_data['student'].id for student_data in valid_students]
+        ).values_list('student_id', flat=True))
+        
+        new_assignments = []
+        skipped = []
+        for student_data in valid_students:
+            student = student_data['student']
+            
+            # Check if already assigned (earlier in the system or earlier in this file)
+            if student.id in already_assigned or student.id in seen_student_ids:
+                skipped.append({
+                    'student_id': student.student_id,
+                    'name': student.get_full_name(),
+                    'reason': 'Already assigned to this program'
+                })
+                continue
+            seen_student_ids.add(student.id)
+            
+            # Find student's team (teams are no longer linked to events)
+            memberships = list(student.team_memberships.all())
+            new_assignments.append(ProgramAssignment(
+                program=program,
+                student=student,
+                team=memberships[0] if memberships else None,
+                assigned_by=assigned_by
+            ))
+        
+        if not new_assignments:
+            return [], skipped
+        return self._create_assignments(program, new_assignments, assigned_by), skipped
     
     def _detect_columns(self, columns):
         """AI-powered column detection using pattern matching"""
@@ -1998,8 +2068,11 @@ class ProgramAssignmentViewSet(viewsets.ModelViewSet):
         
         return mapping
     
-    def _find_student_with_ai(self, identifier, row, column_mapping):
+    def _find_student_with_ai(self, identifier, row, column_mapping, cache=None):
         """Smart student matching using multiple strategies"""
+        if cache is None:
+            cache = {}
+        
         # Strategy 1: Direct student_id match
         try:
             return User.objects.get(student_id=identifier, role='student')
@@ -2011,11 +2084,16 @@ class ProgramAssignmentViewSet(viewsets.ModelViewSet):
         clean_identifier = re.sub(r'[^\w]', '', clean_identifier)  # Remove special chars
         
         try:
-            students = User.objects.filter(role='student')
-            for student in students:
-                clean_student_id = re.sub(r'[^\w]', '', student.student_id.lower())
-                if clean_student_id == clean_identifier:
-                    return student
+            # Build the cleaned student_id lookup once per upload instead of once per row
+            if 'clean_ids' not in cache:
+                cache['clean_ids'] = {}
+                for student in User.objects.filter(role='student').exclude(
+                    student_id__isnull=True
+                ).prefetch_related('team_memberships'):
+                    clean_student_id = re.sub(r'[^\w]', '', student.student_id.lower())
+                    cache['clean_ids'].setdefault(clean_student_id, student)
+            if clean_identifier in cache['clean_ids']:
+                return cache['clean_ids'][clean_identifier]
         except:
             pass
         
@@ -2055,7 +2133,7 @@ class ProgramAssignmentViewSet(viewsets.ModelViewSet):
         return True
     
     @action(detail=False, methods=['get'])
-    def download_template(self, request, program_pk=None):
+    def download_template(self, request, program_pk=None, event_pk=None):
         """Generate and download Excel template for bulk upload"""
         try:
             program = Program.objects.get(id=program_pk)
@@ -2073,7 +2151,7 @@ class ProgramAssignmentViewSet(viewsets.ModelViewSet):
             df = pd.DataFrame(template_data)
             
             # Create Excel file in memory
-            output = io.BytesIO()
+            output = BytesIO()
             with pd.ExcelWriter(output, engine='openpyxl') as writer:
                 df.to_excel(writer, sheet_name='Students', index=False)
                 
@@ -2091,7 +2169,7 @@ class ProgramAssignmentViewSet(viewsets.ModelViewSet):
                         f'Program: {program.name}',
                         f'Event: {program.event.title if program.event else "No Event"}',
                         f'Category Requirement: {program.get_category_display()}',
-                        f'Type: {program.get_type_display()}',
+                        f'Type: {program.get_program_type_display()}',
                         f'Team Based: {"Yes" if program.is_team_based else "No"}'
                     ]
                 })
@@ -2144,7 +2222,10 @@ class ProgramAssignmentViewSet(viewsets.ModelViewSet):
         return self.bulk_assign_internal(request, program, student_ids)
     
     def bulk_assign_internal(self, request, program, student_ids):
-        """Internal method for bulk assignment logic"""
+        """Internal method for bulk assignment logic (set-based: a handful of queries per batch)"""
+        from django.db import transaction
+        from .chest_numbers import ChestNumberRangeFull
+        
         if not student_ids:
             return Response({
                 'error': 'No students provided for assignment'
@@ -2161,50 +2242,70 @@ class ProgramAssignmentViewSet(viewsets.ModelViewSet):
                     'error': f'Team with ID {team_id} not found'
                 }, status=status.HTTP_400_BAD_REQUEST)
         
+        # Prefetch the students and their team memberships in two queries
+        students_by_id = {
+            student.id: student
+            for student in User.objects.filter(
+                id__in=student_ids, role='student'
+            ).prefetch_related('team_memberships')
+        }
+        
+        def get_student_team(student):
+            if specified_team:
+                return specified_team
+            memberships = list(student.team_memberships.all())
+            return memberships[0] if memberships else None
+        
+        # Keep the requested order, skipping duplicates and unknown students
+        students = []
+        seen_ids = set()
+        for student_id in student_ids:
+            try:
+                student_id = int(student_id)
+            except (TypeError, ValueError):
+                continue
+            if student_id in students_by_id and student_id not in seen_ids:
+                seen_ids.add(student_id)
+                students.append(students_by_id[student_id])
+        
         # For team-based programs, validate team assignment requirements
         if program.is_team_based:
             # Group students by team
             team_assignments = {}
-            for student_id in student_ids:
-                try:
-                    student = User.objects.get(id=student_id, role='student')
-                    
-                    # If a specific team is specified, use that team
-                    if specified_team:
-                        team = specified_team
-                    else:
-                        team = student.team_memberships.first()
-                    
-                    if not team:
-                        return Response({
-                            'error': f'Student {student.get_full_name()} is not assigned to any team. Team-based programs require all participants to be team members.'
-                        }, status=status.HTTP_400_BAD_REQUEST)
-                    
-                    if team.id not in team_assignments:
-                        team_assignments[team.id] = {'team': team, 'students': []}
-                    team_assignments[team.id]['students'].append(student)
-                except User.DoesNotExist:
-                    continue
+            for student in students:
+                team = get_student_team(student)
+                if not team:
+                    return Response({
+                        'error': f'Student {student.get_full_name()} is not assigned to any team. Team-based programs require all participants to be team members.'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                
+                if team.id not in team_assignments:
+                    team_assignments[team.id] = {'team': team, 'students': []}
+                team_assignments[team.id]['students'].append(student)
+            
+            # Teams that already have assignments for this program, in one query
+            assigned_team_ids = set(ProgramAssignment.objects.filter(
+                program=program, team_id__in=team_assignments.keys()
+            ).values_list('team_id', flat=True))
             
             # Validate team size requirements
             for team_id, team_data in team_assignments.items():
                 team = team_data['team']
-                students = team_data['students']
+                team_students = team_data['students']
                 
                 # Check if all team members are being assigned (for team-based programs)
-                if program.team_size and len(students) != program.team_size:
+                if program.team_size and len(team_students) != program.team_size:
                     return Response({
-                        'error': f'Team "{team.name}" must have exactly {program.team_size} members for this program. Currently assigning: {len(students)}'
+                        'error': f'Team "{team.name}" must have exactly {program.team_size} members for this program. Currently assigning: {len(team_students)}'
                     }, status=status.HTTP_400_BAD_REQUEST)
                 
-                if program.team_size_max and len(students) > program.team_size_max:
+                if program.max_participants_per_team and len(team_students) > program.max_participants_per_team:
                     return Response({
-                        'error': f'Team "{team.name}" cannot have more than {program.team_size_max} members for this program. Currently assigning: {len(students)}'
+                        'error': f'Team "{team.name}" cannot have more than {program.max_participants_per_team} members for this program. Currently assigning: {len(team_students)}'
                     }, status=status.HTTP_400_BAD_REQUEST)
                 
                 # Check if team already has assignments for this program
-                existing_assignments = ProgramAssignment.objects.filter(program=program, team=team)
-                if existing_assignments.exists():
+                if team_id in assigned_team_ids:
                     return Response({
                         'error': f'Team "{team.name}" is already assigned to this program. Remove existing assignments first.'
                     }, status=status.HTTP_400_BAD_REQUEST)
@@ -2223,28 +2324,23 @@ class ProgramAssignmentViewSet(viewsets.ModelViewSet):
                 
                 # Group students by team and check limits
                 team_assignments = {}
-                for student_id in student_ids:
-                    try:
-                        student = User.objects.get(id=student_id, role='student')
-                        # Try to find student's team (teams are no longer linked to events)
-                        team = None
-                        try:
-                            # Check if student is a member of any team
-                            team = Team.objects.get(members=student)
-                        except Team.DoesNotExist:
-                            pass
-                        
-                        if team:
-                            if team.id not in team_assignments:
-                                team_assignments[team.id] = {'team': team, 'students': []}
-                            team_assignments[team.id]['students'].append(student)
-                    except User.DoesNotExist:
-                        continue
+                for student in students:
+                    memberships = list(student.team_memberships.all())
+                    if memberships:
+                        team = memberships[0]
+                        if team.id not in team_assignments:
+                            team_assignments[team.id] = {'team': team, 'students': []}
+                        team_assignments[team.id]['students'].append(student)
+                
+                # Current assignments per team, in one query
+                current_counts = dict(ProgramAssignment.objects.filter(
+                    program=program, team_id__in=team_assignments.keys()
+                ).values('team_id').annotate(count=Count('id')).values_list('team_id', 'count'))
                 
                 # Check each team's limit
                 for team_id, team_data in team_assignments.items():
                     team = team_data['team']
-                    current_team_assignments = ProgramAssignment.objects.filter(program=program, team=team).count()
+                    current_team_assignments = current_counts.get(team_id, 0)
                     new_assignments_for_team = len(team_data['students'])
                     
                     if current_team_assignments + new_assignments_for_team > per_team_limit:
@@ -2252,52 +2348,52 @@ class ProgramAssignmentViewSet(viewsets.ModelViewSet):
                             'error': f'Team "{team.name}" would exceed the maximum limit of {per_team_limit} participants per team (out of {program.max_participants} total across {total_teams} teams). Current: {current_team_assignments}, Trying to add: {new_assignments_for_team}, Limit: {per_team_limit}'
                         }, status=status.HTTP_400_BAD_REQUEST)
         
-        assignments = []
         errors = []
-        
         for student_id in student_ids:
             try:
-                student = User.objects.get(id=student_id, role='student')
-                
-                # Validation: Check category compatibility
-                if program.category != 'open' and student.category != program.category:
-                    category_names = {
-                        'hs': 'High School',
-                        'hss': 'Higher Secondary School',
-                        'open': 'Open Category'
-                    }
-                    errors.append(f'Student {student.get_full_name()} ({student.student_id}) is {category_names.get(student.category, student.category)} but program is for {category_names.get(program.category, program.category)} category')
-                    continue
-                
-                # Check if already assigned
-                if ProgramAssignment.objects.filter(program=program, student=student).exists():
-                    errors.append(f'Student {student.get_full_name()} ({student.student_id}) is already assigned to this program')
-                    continue
-                
-                # Determine which team to assign
-                team = None
-                if specified_team:
-                    # Use the specified team
-                    team = specified_team
-                else:
-                    # Try to find student's team (teams are no longer linked to events)
-                    try:
-                        # Check if student is a member of any team
-                        team = Team.objects.get(members=student)
-                    except Team.DoesNotExist:
-                        pass
-                
-                assignment = ProgramAssignment.objects.create(
-                    program=program,
-                    student=student,
-                    team=team,
-                    assigned_by=request.user
-                )
-                assignments.append(assignment)
-                
-            except User.DoesNotExist:
+                if int(student_id) not in students_by_id:
+                    errors.append(f'Student with ID {student_id} not found')
+            except (TypeError, ValueError):
                 errors.append(f'Student with ID {student_id} not found')
+        
+        # Students already assigned to this program, in one query
+        already_assigned = set(ProgramAssignment.objects.filter(
+            program=program, student_id__in=students_by_id.keys()
+        ).values_list('student_id', flat=True))
+        
+        category_names = {
+            'hs': 'High School',
+            'hss': 'Higher Secondary School',
+            'general': 'General',
+            'open': 'Open Category'
+        }
+        
+        new_assignments = []
+        for student in students:
+            # Validation: Check category compatibility (general programs are open to every category)
+            if program.category not in ('open', 'general') and student.category != program.category:
+                errors.append(f'Student {student.get_full_name()} ({student.student_id}) is {category_names.get(student.category, student.category)} but program is for {category_names.get(program.category, program.category)} category')
+                continue
+            
+            # Check if already assigned
+            if student.id in already_assigned:
+                errors.append(f'Student {student.get_full_name()} ({student.student_id}) is already assigned to this program')
                 continue
+            
+            new_assignments.append(ProgramAssignment(
+                program=program,
+                student=student,
+                team=get_student_team(student),
+                assigned_by=request.user
+            ))
+        
+        assignments = []
+        if new_assignments:
+            try:
+                with transaction.atomic():
+                    assignments = self._create_assignments(program, new_assignments, request.user)
+            except ChestNumberRangeFull as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         response_data = {
             'message': f'Successfully assigned {len(assignments)} students',
@@ -2310,6 +2406,31 @@ class ProgramAssignmentViewSet(viewsets.ModelViewSet):
         
         return Response(response_data, status=status.HTTP_200_OK if assignments else status.HTTP_400_BAD_REQUEST)
 
+    def _create_assignments(self, program, new_assignments, assigned_by):
+        """Number and insert a batch of unsaved assignments with bulk writes (call inside a transaction)"""
+        from .chest_numbers import allocate_chest_numbers, assign_chest_codes
+        
+        # Allocate chest numbers for the whole batch, then write everything in bulk
+        new_chest_numbers = allocate_chest_numbers(program.event, new_assignments, assigned_by=assigned_by)
+        
+        # Generate chest codes for students that don't have one yet
+        students_with_codes = assign_chest_codes([assignment.student for assignment in new_assignments])
+        if students_with_codes:
+            User.objects.bulk_update(students_with_codes, ['chest_code'])
+        
+        assignments = ProgramAssignment.objects.bulk_create(new_assignments)
+        ChestNumber.objects.bulk_create(new_chest_numbers)
+        # Bulk writes send no save signals
+        schedule_data_version_bump(event_id=program.event_id, shared=bool(students_with_codes))
+        if new_assignments:
+            from .scoreboard import schedule_scoreboard_refresh_for
+            # Numbered students' marked results elsewhere in the event, and in this program
+            schedule_scoreboard_refresh_for(ScoreboardEntry.objects.filter(
+                models.Q(event_id=program.event_id, participant_id__in=[number.student_id for number in new_chest_numbers])
+                | models.Q(program=program, participant_id__in=[assignment.student_id for assignment in new_assignments])
+            ))
+        return assignments
+
 class ProgramResultViewSet(viewsets.ModelViewSet):
     """ViewSet for managing program results and marks"""
     serializer_class = ProgramResultSerializer
@@ -2326,17 +2447,17 @@ class ProgramResultViewSet(viewsets.ModelViewSet):
         if self.action == 'mark_entry':
             return MarkEntrySerializer
         elif self.action == 'results_summary':
-            return ProgramResultSummarySerializer
+            return ScoreboardEntrySerializer
         return ProgramResultSerializer
     
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy', 'mark_entry', 'bulk_mark_entry']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'mark_entry', 'materialize_results', 'bulk_mark_entry']:
             return [IsAdminOrEventManager()]
         return [IsAuthenticated()]
     
     @action(detail=False, methods=['get'])
     def mark_entry(self, request, event_pk=None, program_pk=None):
-        """Get participants for mark entry with their current marks"""
+        """Get participants for mark entry with their current marks (read only)"""
         try:
             program = Program.objects.get(id=program_pk, event_id=event_pk)
         except Program.DoesNotExist:
@@ -2345,44 +2466,63 @@ class ProgramResultViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Get all assignments for this program
-        assignments = ProgramAssignment.objects.filter(program=program)
+        results = self._build_mark_entry_rows(program)
+        serializer = MarkEntrySerializer(results, many=True, context=get_program_results_context(program))
+        return Response(serializer.data)
+    
+    @action(detail=False, methods=['post'])
+    def materialize_results(self, request, event_pk=None, program_pk=None):
+        """Create the missing result rows for a program when it is opened for judging"""
+        try:
+            program = Program.objects.get(id=program_pk, event_id=event_pk)
+        except Program.DoesNotExist:
+            return Response(
+                {'error': 'Program not found'}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        self._materialize_results(program)
+        results = self._build_mark_entry_rows(program)
+        serializer = MarkEntrySerializer(results, many=True, context=get_program_results_context(program))
+        return Response(serializer.data)
+    
+    def _build_mark_entry_rows(self, program):
+        """
+        Left join the program's assignments to its results.
+        
+        Returns one ProgramResult per participant (one per team for team-based
+        programs) in assignment order. Assignments without a result get an
+        unsaved placeholder row (id None); existing rows carry the team and
+        representative they should have, without being saved.
+        """
+        assignments = ProgramAssignment.objects.filter(
+            program=program
+        ).select_related('student', 'team').prefetch_related('student__team_memberships').order_by('id')
+        existing_results = list(ProgramResult.objects.filter(
+            program=program
+        ).select_related('participant', 'team', 'entered_by').order_by('id'))
+        for result in existing_results:
+            result.program = program
         
         # For team-based programs, group by team and show one entry per team
         if program.is_team_based:
-            team_results = {}
+            results_by_team = {}
+            for result in existing_results:
+                if result.team_id is not None:
+                    results_by_team.setdefault(result.team_id, result)
             
+            team_results = {}
             for assignment in assignments:
                 team = assignment.team
                 if not team:
                     continue
                 
                 if team.id not in team_results:
-                    # Get the first student from the team as the representative
+                    # The first student from the team is the representative
                     first_student = assignment.student
-                    
-                    # Try to get existing result for this team, or create new one
-                    # First try to find an existing result with this team
-                    existing_result = ProgramResult.objects.filter(
-                        program=program,
-                        team=team
-                    ).first()
-                    
-                    if existing_result:
-                        result = existing_result
-                        created = False
-                        # Update participant if needed
-                        if result.participant != first_student:
-                            result.participant = first_student
-                            result.save()
-                    else:
-                        # Create new result
-                        result = ProgramResult.objects.create(
-                            program=program,
-                            team=team,
-                            participant=first_student
-                        )
-                        created = True
+                    result = results_by_team.get(team.id)
+                    if result is None:
+                        result = ProgramResult(program=program, team=team, participant=first_student)
                     
                     team_results[team.id] = {
                         'result': result,
@@ -2405,7 +2545,7 @@ class ProgramResultViewSet(viewsets.ModelViewSet):
                 # Create a special result object for team-based programs
                 team_result = ProgramResult(
                     id=result.id,
-                    program=result.program,
+                    program=program,
                     participant=representative,
                     team=team,
                     judge1_marks=result.judge1_marks,
@@ -2429,41 +2569,74 @@ class ProgramResultViewSet(viewsets.ModelViewSet):
                 team_result.is_team_based = True
                 
                 results.append(team_result)
+            return results
         
         # For individual programs, show each student separately
-        else:
-            results = []
-            for assignment in assignments:
-                # Get the student's team for this event
-                student_team = assignment.team or assignment.student.team_memberships.filter(event=program.event).first()
-                
-                # Try to get existing result, or create new one
-                # First try to find an existing result with this participant
-                existing_result = ProgramResult.objects.filter(
-                    program=program,
-                    participant=assignment.student
-                ).first()
-                
-                if existing_result:
-                    result = existing_result
-                    created = False
-                    # Update team if needed
-                    if result.team != student_team:
-                        result.team = student_team
-                        result.save()
-                else:
-                    # Create new result
-                    result = ProgramResult.objects.create(
-                        program=program,
-                        participant=assignment.student,
-                        team=student_team
-                    )
-                    created = True
-                
-                results.append(result)
+        results_by_participant = {}
+        for result in existing_results:
+            results_by_participant.setdefault(result.participant_id, result)
         
-        serializer = MarkEntrySerializer(results, many=True)
-        return Response(serializer.data)
+        results = []
+        for assignment in assignments:
+            # Get the student's team
+            student_team = assignment.team
+            if student_team is None:
+                memberships = list(assignment.student.team_memberships.all())
+                student_team = memberships[0] if memberships else None
+            
+            result = results_by_participant.get(assignment.student_id)
+            if result is None:
+                result = ProgramResult(program=program, participant=assignment.student, team=student_team)
+            elif result.team_id != (student_team.id if student_team else None):
+                result.team = student_team
+            results.append(result)
+        return results
+    
+    def _materialize_results(self, program):
+        """Insert placeholder result rows and sync stale team/representative fields in bulk"""
+        from django.db import transaction
+        
+        rows = self._build_mark_entry_rows(program)
+        new_results = []
+        stale_results = {}
+        for row in rows:
+            if row.id is None:
+                new_results.append(ProgramResult(program=program, participant=row.participant, team=row.team))
+            else:
+                stale_results[row.id] = row
+        
+        with transaction.atomic():
+            if new_results:
+                # Rows created concurrently by another judge opening the program are skipped
+                ProgramResult.objects.bulk_create(new_results, ignore_conflicts=True)
+                schedule_data_version_bump(program_id=program.id)
+            
+            if stale_results:
+                changed = []
+                previous = {}
+                for result in ProgramResult.objects.filter(id__in=stale_results.keys()).select_related('program__event'):
+                    row = stale_results[result.id]
+                    if result.participant_id != row.participant_id or result.team_id != row.team_id:
+                        previous[result.id] = (result.team_id, result.participant_id)
+                        result.participant = row.participant
+                        result.team = row.team
+                        result.updated_at = timezone.now()
+                        changed.append(result)
+                if changed:
+                    from .leaderboard import schedule_leaderboard_refresh
+                    from .scoreboard import schedule_scoreboard_refresh
+                    
+                    ProgramResult.objects.bulk_update(changed, ['participant', 'team', 'updated_at'])
+                    schedule_data_version_bump(program_id=program.id)
+                    # Points follow the result to its new team/participant; the old ones'
+                    # records go first, as they are keyed on the team/participant
+                    for result in changed:
+                        if result.points_earned > 0:
+                            result.withdraw_points(*previous[result.id])
+                            result.distribute_points_to_team_and_members()
+                    schedule_leaderboard_refresh(program.event_id)
+                    schedule_scoreboard_refresh(program.id)
+        return len(new_results)
     
     @action(detail=False, methods=['post'])
     def bulk_mark_entry(self, request, event_pk=None, program_pk=None):
@@ -2476,54 +2649,134 @@ class ProgramResultViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
+        from decimal import Decimal, InvalidOperation
+        from django.db import transaction
+        from .ranking import rank_program
+        
         marks_data = request.data.get('marks', [])
+        judge_fields = ['judge1_marks', 'judge2_marks', 'judge3_marks']
+        
+        # Rows that were only placeholders on the mark entry sheet are addressed by participant
+        participant_ids = [m['participant'] for m in marks_data if m.get('id') is None and m.get('participant') is not None]
+        if participant_ids:
+            self._materialize_results(program)
+        
+        # Load all targeted results in one query
+        result_ids = [m['id'] for m in marks_data if m.get('id') is not None]
+        team_ids = [m['team_id'] for m in marks_data if program.is_team_based and m.get('team_id') is not None]
+        results = ProgramResult.objects.filter(
+            program=program
+        ).filter(
+            Q(id__in=result_ids) | Q(team_id__in=team_ids) | Q(participant_id__in=participant_ids)
+        ).select_related(
+            'participant', 'team', 'program__event__created_by', 'entered_by'
+        ).prefetch_related('participant__team_memberships').order_by('id')
+        
+        results_by_id = {}
+        results_by_team = {}
+        results_by_participant = {}
+        for result in results:
+            results_by_id[result.id] = result
+            results_by_participant[result.participant_id] = result
+            if result.team_id is not None:
+                results_by_team.setdefault(result.team_id, result)
+        
+        # Validate and apply all marks in memory
         updated_results = []
+        updated_ids = set()
+        errors = []
+        for index, mark_data in enumerate(marks_data):
+            # For team-based programs, find result by team
+            if program.is_team_based and 'team_id' in mark_data:
+                result = results_by_team.get(mark_data['team_id'])
+            elif mark_data.get('id') is not None:
+                # For individual programs or fallback
+                result = results_by_id.get(mark_data['id'])
+            else:
+                result = results_by_participant.get(mark_data.get('participant'))
+            
+            if result is None:
+                continue
+            
+            for field in judge_fields:
+                if field not in mark_data:
+                    continue
+                value = mark_data[field]
+                if value is None or value == '':
+                    setattr(result, field, None)
+                    continue
+                try:
+                    value = Decimal(str(value))
+                except (InvalidOperation, TypeError, ValueError):
+                    errors.append({'index': index, 'id': result.id, 'field': field, 'error': f'Invalid marks value: {mark_data[field]}'})
+                    continue
+                if value < 0 or value > 100:
+                    errors.append({'index': index, 'id': result.id, 'field': field, 'error': 'Marks must be between 0 and 100'})
+                    continue
+                setattr(result, field, value)
+            
+            if 'position' in mark_data:
+                result.position = mark_data['position']
+            if 'points_earned' in mark_data:
+                result.points_earned = mark_data['points_earned'] or 0
+            if 'comments' in mark_data:
+                result.comments = mark_data['comments'] or ''
+            
+            if result.id not in updated_ids:
+                updated_ids.add(result.id)
+                updated_results.append(result)
+        
+        if errors:
+            return Response({
+                'error': 'Invalid marks submitted. No changes were saved.',
+                'errors': errors
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        for mark_data in marks_data:
-            try:
-                # For team-based programs, find result by team
-                if program.is_team_based and 'team_id' in mark_data:
-                    result = ProgramResult.objects.get(
-                        program=program,
-                        team_id=mark_data['team_id']
-                    )
-                else:
-                    # For individual programs or fallback
-                    result = ProgramResult.objects.get(
-                        id=mark_data['id'],
-                        program=program
-                    )
-                
-                # Update marks
-                if 'judge1_marks' in mark_data:
-                    result.judge1_marks = mark_data['judge1_marks']
-                if 'judge2_marks' in mark_data:
-                    result.judge2_marks = mark_data['judge2_marks']
-                if 'judge3_marks' in mark_data:
-                    result.judge3_marks = mark_data['judge3_marks']
-                if 'total_marks' in mark_data:
-                    result.total_marks = mark_data['total_marks']
-                if 'average_marks' in mark_data:
-                    result.average_marks = mark_data['average_marks']
-                if 'position' in mark_data:
-                    result.position = mark_data['position']
-                if 'points_earned' in mark_data:
-                    result.points_earned = mark_data['points_earned']
-                if 'comments' in mark_data:
-                    result.comments = mark_data['comments']
+        with transaction.atomic():
+            now = timezone.now()
+            result_number = None
+            for result in updated_results:
+                # Auto-sync team assignment from global team membership if not set
+                if not result.team:
+                    memberships = list(result.participant.team_memberships.all())
+                    if memberships:
+                        result.team = memberships[0]
                 
-                result.save()  # This will trigger points distribution via the save() method
-                updated_results.append(result)
+                # Assign result number once for the program, shared by all rows
+                if not result.result_number and result.has_marks():
+                    if result_number is None:
+                        result.assign_result_number()
+                        result_number = result.result_number
+                    result.result_number = result_number
                 
-            except ProgramResult.DoesNotExist:
-                continue
-        
-        # Trigger points distribution for all updated results
-        for result in updated_results:
-            if result.points_earned > 0:
+                result.calculate_marks()
+                result.updated_at = now
+            
+            ProgramResult.objects.bulk_update(updated_results, [
+                'team', 'result_number', 'judge1_marks', 'judge2_marks', 'judge3_marks',
+                'total_marks', 'average_marks', 'position', 'points_earned', 'comments', 'updated_at'
+            ])
+            schedule_data_version_bump(program_id=program.id)
+            
+            # Rank the program once and pick up the new positions and points
+            changed = rank_program(program)
+            changed_by_id = {result.id: result for result in changed}
+            for result in updated_results:
+                ranked = changed_by_id.get(result.id)
+                if ranked is not None:
+                    result.position = ranked.position
+                    result.points_earned = ranked.points_earned
+            
+            # Distribute points once for every result whose ranking moved or whose marks changed
+            to_distribute = list(changed)
+            to_distribute.extend(
+                result for result in updated_results
+                if result.id not in changed_by_id and result.points_earned > 0
+            )
+            for result in to_distribute:
                 result.distribute_points_to_team_and_members()
         
-        serializer = MarkEntrySerializer(updated_results, many=True)
+        serializer = MarkEntrySerializer(updated_results, many=True, context=get_program_results_context(program))
         return Response({
             'message': f'Updated marks for {len(updated_results)} participants. Points distributed to teams and members.',
             'results': serializer.data
@@ -2540,36 +2793,15 @@ class ProgramResultViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # For team-based programs, group results by team
+        # Served from the scoreboard projection, refreshed whenever the program is ranked
+        entries = ScoreboardEntry.objects.filter(program=program)
+        
+        # For team-based programs, only show team results
         if program.is_team_based:
-            # Get unique team results
-            team_results = ProgramResult.objects.filter(
-                program=program,
-                team__isnull=False
-            ).exclude(
-                average_marks__isnull=True
-            ).order_by('result_number', 'position', '-average_marks')
-            
-            # Add team information to each result
-            for result in team_results:
-                if result.team:
-                    result.participant_name = f"{result.participant.get_full_name()} & Team"
-                    result.team_name = result.team.name
-                    result.is_team_based = True
-        else:
-            # For individual programs, show individual results
-            team_results = ProgramResult.objects.filter(
-                program=program
-            ).exclude(
-                average_marks__isnull=True
-            ).order_by('result_number', 'position', '-average_marks')
-            
-            # Add individual information
-            for result in team_results:
-                result.participant_name = result.participant.get_full_name()
-                result.is_team_based = False
+            entries = entries.filter(team__isnull=False)
+        entries = entries.order_by('result_number', 'position', '-average_marks')
         
-        serializer = ProgramResultSummarySerializer(team_results, many=True)
+        serializer = ScoreboardEntrySerializer(entries, many=True)
         return Response({
             'program': ProgramSerializer(program).data,
             'results': serializer.data
@@ -2588,40 +2820,17 @@ class ProgramResultViewSet(viewsets.ModelViewSet):
         
         # Get results ordered by result_number
         results = ProgramResult.objects.filter(
-            program=program
-        ).exclude(
-            average_marks__isnull=True
+            program=program, average_marks__isnull=False
         ).order_by('result_number', 'position', '-average_marks')
         
         # Generate PDF
         from django.http import HttpResponse
-        from reportlab.lib.pagesizes import letter, A4
-        from reportlab.lib import colors
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-        from reportlab.lib.units import inch
-        from io import BytesIO
-        
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-        
-        # Styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            alignment=1  # Center alignment
-        )
+        from accounts.models import SchoolSettings
         
         # Content
         story = []
-        from accounts.models import SchoolSettings
-        from .pdf_utils import build_custom_pdf_template
-        
         school_settings = SchoolSettings.get_settings()
-        template = build_custom_pdf_template(school_settings)
+        template = pdf_engine.get_template(school_settings)
         
         # Add header using custom template with program name prominently displayed
         story.extend(template.create_header(
@@ -2630,77 +2839,15 @@ class ProgramResultViewSet(viewsets.ModelViewSet):
         ))
 
         # Add program info row (Program Name | Category | Type)
-        from reportlab.lib.styles import ParagraphStyle
-        from reportlab.platypus import Paragraph, Table, TableStyle, Spacer
-        from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
-        from reportlab.lib import colors
-        left_style = ParagraphStyle(
-            'LeftAlign',
-            parent=styles['Normal'],
-            fontSize=12,
-            spaceAfter=5,
-            alignment=TA_LEFT,
-            textColor=colors.black,
-            fontName='Helvetica-Bold'
-        )
-        center_style = ParagraphStyle(
-            'CenterAlign',
-            parent=styles['Normal'],
-            fontSize=12,
-            spaceAfter=5,
-            alignment=TA_CENTER,
-            textColor=colors.black,
-            fontName='Helvetica-Bold'
-        )
-        right_style = ParagraphStyle(
-            'RightAlign',
-            parent=styles['Normal'],
-            fontSize=12,
-            spaceAfter=5,
-            alignment=TA_RIGHT,
-            textColor=colors.black,
-            fontName='Helvetica-Bold'
-        )
-        program_type = "Team" if program.is_team_based else "Individual"
-        program_info_row = [
-            Paragraph(f"<b>{program.name.upper()}</b>", left_style),
-            Paragraph(f"<b>{program.get_category_display().upper()}</b>", center_style),
-            Paragraph(f"<b>{program_type}</b>", right_style)
-        ]
-        program_info_table = Table([program_info_row], colWidths=[2.5*inch, 2.5*inch, 2.5*inch])
-        program_info_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 15),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-            # Enhanced styling
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F8F9FA')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
-            ('BOX', (0, 0), (-1, -1), 1.5, colors.HexColor('#3498DB')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#BDC3C7')),
-        ]))
-        story.append(program_info_table)
+        story.append(pdf_engine.program_info_table(program))
         story.append(Spacer(1, 20))  # Gap before the results table
         
         # Add result number as title at the top
-        if results.exists():
+        first_result = results.first()
+        if first_result:
             # Get the first result number to display as title
-            first_result = results.first()
             result_number = first_result.result_number if first_result.result_number else "N/A"
-            
-            result_title_style = ParagraphStyle(
-                'ResultTitle',
-                parent=styles['Heading1'],
-                fontSize=16,
-                spaceAfter=15,
-                alignment=TA_CENTER,
-                textColor=colors.black,
-                fontName='Helvetica-Bold'
-            )
-            story.append(Paragraph(f"Result No: {result_number}", result_title_style))
+            story.append(Paragraph(f"Result No: {result_number}", pdf_engine.paragraph_style('result_title')))
             story.append(Spacer(1, 10))
         
         # Results table using custom template - simplified columns
@@ -2797,41 +2944,14 @@ class ProgramResultViewSet(viewsets.ModelViewSet):
         
         # Create table with green header (same as calling and valuation sheets)
         if data:
-            table = Table([headers] + data, colWidths=col_widths)
-            table.setStyle(TableStyle([
-                # Header styling (green background, white text - same as calling and valuation sheets)
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#27AE60')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 15),
-                ('TOPPADDING', (0, 0), (-1, 0), 15),
-                
-                # Data row styling
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 11),
-                ('GRID', (0, 0), (-1, -1), 1.5, colors.black),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 12),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-                ('TOPPADDING', (0, 1), (-1, -1), 12),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 12),
-                
-                # Alternating row colors (white and light gray)
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-                
-                # Border styling
-                ('BOX', (0, 0), (-1, -1), 2, colors.black),
-                ('LINEBELOW', (0, 0), (-1, 0), 2, colors.black),
-            ]))
-            story.append(table)
+            table = pdf_engine.DataTable(headers, col_widths=col_widths, style='sheet')
+            table.extend(data)
+            story.extend(table.flowables())
         else:
-            story.append(Paragraph("No results available for this program.", styles['Normal']))
-        doc.build(story)
+            story.append(Paragraph("No results available for this program.", pdf_engine.paragraph_style('Normal')))
+        pdf = pdf_engine.render_pdf(story, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
         
-        buffer.seek(0)
-        response = HttpResponse(buffer.read(), content_type='application/pdf')
+        response = HttpResponse(pdf, content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="results_{program.name.replace(" ", "_")}.pdf"'
         return response
 
@@ -2866,234 +2986,24 @@ def generate_calling_sheet(request, program_id):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@report_view('calling_sheet', params=('program_id',))
 def generate_formatted_calling_sheet(request, program_id):
     """Generate formatted calling sheet PDF with school logo and proper layout"""
     try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib import colors
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-        from io import BytesIO
         from accounts.models import SchoolSettings
-        from .pdf_utils import build_custom_pdf_template
-        from datetime import datetime
+        from .sheets import chest_number_map, fallback_student_ids, sheet_entries, render_sheet, sheet_filename
         import traceback
         
-        program = Program.objects.get(id=program_id)
-        assignments = ProgramAssignment.objects.filter(program=program).select_related('student', 'team').order_by('chest_number', 'student__first_name')
-        
-        # DEBUG: Check school settings
-        school_settings = SchoolSettings.get_settings()
-        print(f"DEBUG: School settings: {school_settings}")
-        
-        # DEBUG: Check template creation
-        template = build_custom_pdf_template(school_settings)
-        print(f"DEBUG: Template: {template}")
-        
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(
-            buffer, 
-            pagesize=A4, 
-            rightMargin=80, 
-            leftMargin=80, 
-            topMargin=50, 
-            bottomMargin=50
-        )
-        elements = []
-        
-        # FIXED: Handle template creation properly
-        if template is not None:
-            # Use the template header if available
-            elements.extend(template.create_header(event_title=program.event.title, extra_title=f'Calling Sheet - {program.name}'))
-        else:
-            # FALLBACK: Create a simple header without template
-            print("WARNING: Using fallback header - template is None")
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'TitleStyle',
-                parent=styles['Heading1'],
-                fontSize=16,
-                spaceAfter=20,
-                alignment=TA_CENTER,
-                textColor=colors.black,
-                fontName='Helvetica-Bold'
-            )
-            
-            # Simple header without template
-            header_text = f"{program.event.title}<br/>Calling Sheet - {program.name}"
-            header_paragraph = Paragraph(header_text, title_style)
-            elements.append(header_paragraph)
-            elements.append(Spacer(1, 20))
-        
-        styles = getSampleStyleSheet()
-        details_style = ParagraphStyle(
-            'Details',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=3,
-            alignment=TA_LEFT,
-            textColor=colors.black
-        )
-        program_type = "Team" if program.is_team_based else "Individual"
-        
-        # Create styles for program info
-        left_style = ParagraphStyle(
-            'LeftAlign',
-            parent=styles['Normal'],
-            fontSize=12,
-            spaceAfter=5,
-            alignment=TA_LEFT,
-            textColor=colors.black,
-            fontName='Helvetica-Bold'
-        )
-        
-        center_style = ParagraphStyle(
-            'CenterAlign',
-            parent=styles['Normal'],
-            fontSize=12,
-            spaceAfter=5,
-            alignment=TA_CENTER,
-            textColor=colors.black,
-            fontName='Helvetica-Bold'
-        )
-        
-        right_style = ParagraphStyle(
-            'RightAlign',
-            parent=styles['Normal'],
-            fontSize=12,
-            spaceAfter=5,
-            alignment=TA_RIGHT,
-            textColor=colors.black,
-            fontName='Helvetica-Bold'
-        )
-        
-        # Create a table with three columns but no borders
-        program_info_row = [
-            Paragraph(f"<b>{program.name.upper()}</b>", left_style),
-            Paragraph(f"<b>{program.get_category_display().upper()}</b>", center_style),
-            Paragraph(f"<b>{program_type}</b>", right_style)
-        ]
-        program_info_table = Table([program_info_row], colWidths=[2.5*inch, 2.5*inch, 2.5*inch])
-        program_info_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 15),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-            # Enhanced styling
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F8F9FA')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2C3E50')),
-            ('BOX', (0, 0), (-1, -1), 1.5, colors.HexColor('#3498DB')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#BDC3C7')),
-        ]))
-        elements.append(program_info_table)
-        elements.append(Spacer(1, 20))  # Increased gap before the participant list table
-        
-        if assignments.exists():
-            # Single table with all information
-            if program.category == 'open':
-                table_data = [['Participant Name', 'Team Name', 'Code Letter']]
-            else:
-                table_data = [['Chest No.', 'Participant Name', 'Team Name', 'Code Letter']]
-            
-            # For all programs, group by team and show only main name with "and team" suffix
-            team_groups = {}
-            for assignment in assignments:
-                team_name = assignment.team.name if assignment.team else 'Individual'
-                if team_name not in team_groups:
-                    team_groups[team_name] = []
-                team_groups[team_name].append(assignment)
-            
-            for team_name, team_assignments in team_groups.items():
-                # For individual programs (HS/HSS), show each student separately
-                if not program.is_team_based:
-                    for assignment in team_assignments:
-                        participant_name = assignment.student.get_full_name()
-                        
-                        # For general category, don't show chest number
-                        if program.category == 'open':
-                            table_data.append([participant_name, team_name, ''])
-                        else:
-                            # For HS/HSS programs, show chest number
-                            chest_no = assignment.chest_number
-                            if not chest_no:
-                                try:
-                                    chest_record = ChestNumber.objects.get(event=program.event, student=assignment.student)
-                                    chest_no = chest_record.chest_number
-                                except ChestNumber.DoesNotExist:
-                                    chest_no = ''
-                            chest_no_display = str(chest_no) if chest_no else 'N/A'
-                            table_data.append([chest_no_display, participant_name, team_name, ''])
-                else:
-                    # For team-based programs, show main name with team indicator
-                    main_assignment = team_assignments[0]
-                    main_name = main_assignment.student.get_full_name()
-                    if len(team_assignments) > 1:
-                        participant_name = f"{main_name} and team"
-                    else:
-                        participant_name = main_name
-                    
-                    # For general category, don't show chest number
-                    if program.category == 'open':
-                        table_data.append([participant_name, team_name, ''])
-                    else:
-                        # For HS/HSS programs, show chest number
-                        chest_no = main_assignment.chest_number
-                        if not chest_no:
-                            try:
-                                chest_record = ChestNumber.objects.get(event=program.event, student=main_assignment.student)
-                                chest_no = chest_record.chest_number
-                            except ChestNumber.DoesNotExist:
-                                chest_no = ''
-                        chest_no_display = str(chest_no) if chest_no else 'N/A'
-                        table_data.append([chest_no_display, participant_name, team_name, ''])
-            
-            if program.category == 'open':
-                table = Table(table_data, colWidths=[2.6*inch, 1.2*inch, 1.2*inch])
-            else:
-                table = Table(table_data, colWidths=[0.8*inch, 1.8*inch, 1.2*inch, 1.2*inch])
-            table.setStyle(TableStyle([
-                # Header styling (green background, white text - same as valuation sheet)
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#27AE60')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 15),
-                ('TOPPADDING', (0, 0), (-1, 0), 15),
-                
-                # Data row styling
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 11),
-                ('GRID', (0, 0), (-1, -1), 1.5, colors.black),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 12),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-                ('TOPPADDING', (0, 1), (-1, -1), 12),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 12),
-                
-                # Alternating row colors (white and light gray)
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-                
-                # Border styling
-                ('BOX', (0, 0), (-1, -1), 2, colors.black),
-                ('LINEBELOW', (0, 0), (-1, 0), 2, colors.black),
-            ]))
-            elements.append(table)
-        else:
-            elements.append(Paragraph("No participants assigned to this program.", styles['Normal']))
+        program = Program.objects.select_related('event').get(id=program_id)
+        assignments = list(ProgramAssignment.objects.filter(program=program).select_related('student', 'team').order_by('chest_number', 'student__first_name'))
         
-        doc.build(elements)
-        pdf_data = buffer.getvalue()
-        buffer.close()
+        # Missing chest numbers come from the event's ChestNumber rows in one query
+        chest_numbers = chest_number_map(program.event_id, fallback_student_ids(assignments))
+        entries = sheet_entries(program, assignments, chest_numbers)
+        pdf_data = render_sheet('calling', program, entries, SchoolSettings.get_settings())
         
         response = HttpResponse(pdf_data, content_type='application/pdf')
-        filename = f"{program.name.replace(' ', '_')}_formatted_calling_sheet.pdf"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['Content-Disposition'] = f'attachment; filename="{sheet_filename("calling", program)}"'
         return response
         
     except Program.DoesNotExist:
@@ -3131,183 +3041,23 @@ def get_program_participants(request, program_id):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@report_view('evaluation_sheet', params=('program_id',))
 def generate_formatted_evaluation_sheet(request, program_id):
     """Generate formatted evaluation/valuation sheet PDF with school logo and proper layout"""
     try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib import colors
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-        from io import BytesIO
         from accounts.models import SchoolSettings
-        from .pdf_utils import build_custom_pdf_template
-        from datetime import datetime
+        from .sheets import chest_number_map, fallback_student_ids, sheet_entries, render_sheet, sheet_filename
         import traceback
         
-        program = Program.objects.get(id=program_id)
-        assignments = ProgramAssignment.objects.filter(program=program).select_related('student', 'team').order_by('chest_number', 'student__first_name')
-        school_settings = SchoolSettings.get_settings()
-        template = build_custom_pdf_template(school_settings)
-        
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(
-            buffer, 
-            pagesize=A4, 
-            rightMargin=80, 
-            leftMargin=80, 
-            topMargin=50, 
-            bottomMargin=50
-        )
-        elements = []
-        elements.extend(template.create_header(event_title=program.event.title, extra_title=f'Valuation Sheet - {program.name}'))
-        styles = getSampleStyleSheet()
-        details_style = ParagraphStyle(
-            'Details',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=3,
-            alignment=TA_LEFT,
-            textColor=colors.black
-        )
-        valuation_title_style = ParagraphStyle(
-            'ValuationTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            textColor=colors.black,
-            fontName='Helvetica-Bold'
-        )
-        stage_style = ParagraphStyle(
-            'Stage',
-            parent=styles['Normal'],
-            fontSize=12,
-            spaceAfter=20,
-            alignment=TA_RIGHT,
-            textColor=colors.black,
-            fontName='Helvetica-Bold'
-        )
-        elements.append(Paragraph("Valuation Sheet", valuation_title_style))
-        elements.append(Paragraph("Stage No: _______", stage_style))
-        program_type = "Team" if program.is_team_based else "Individual"
-        
-        # Create a centered style for program info
-        program_info_style = ParagraphStyle(
-            'ProgramInfo',
-            parent=styles['Normal'],
-            fontSize=12,
-            spaceAfter=5,
-            alignment=TA_CENTER,
-            textColor=colors.black,
-            fontName='Helvetica-Bold'
-        )
+        program = Program.objects.select_related('event').get(id=program_id)
+        assignments = list(ProgramAssignment.objects.filter(program=program).select_related('student', 'team').order_by('chest_number', 'student__first_name'))
+        
+        chest_numbers = chest_number_map(program.event_id, fallback_student_ids(assignments))
+        entries = sheet_entries(program, assignments, chest_numbers)
+        pdf_data = render_sheet('evaluation', program, entries, SchoolSettings.get_settings())
         
-        elements.append(Paragraph(f"<b>{program.name.upper()}</b>", program_info_style))
-        elements.append(Paragraph(f"<b>{program.get_category_display().upper()}</b>", program_info_style))
-        elements.append(Paragraph(f"<b>{program_type}</b>", program_info_style))
-        elements.append(Spacer(1, 15))
-        if assignments.exists():
-            if program.category == 'open':
-                table_data = [['Participant Name', 'Judge 1', 'Judge 2', 'Judge 3', 'Remarks']]
-            else:
-                table_data = [['Chest No.', 'Judge 1', 'Judge 2', 'Judge 3', 'Remarks']]
-            
-            # For all programs, group by team and show only main name with "and team" suffix
-            team_groups = {}
-            for assignment in assignments:
-                team_name = assignment.team.name if assignment.team else 'Individual'
-                if team_name not in team_groups:
-                    team_groups[team_name] = []
-                team_groups[team_name].append(assignment)
-            
-            for team_name, team_assignments in team_groups.items():
-                # For individual programs (HS/HSS), show each student separately
-                if not program.is_team_based:
-                    for assignment in team_assignments:
-                        participant_name = assignment.student.get_full_name()
-                        
-                        # For general category, don't show chest number
-                        if program.category == 'open':
-                            table_data.append([participant_name, '', '', '', ''])
-                        else:
-                            # For HS/HSS programs, show chest number
-                            chest_no = assignment.chest_number
-                            if not chest_no:
-                                try:
-                                    chest_record = ChestNumber.objects.get(event=program.event, student=assignment.student)
-                                    chest_no = chest_record.chest_number
-                                except ChestNumber.DoesNotExist:
-                                    chest_no = ''
-                            chest_no_display = str(chest_no) if chest_no else 'N/A'
-                            table_data.append([chest_no_display, '', '', '', ''])
-                else:
-                    # For team-based programs, show main name with team indicator
-                    main_assignment = team_assignments[0]
-                    main_name = main_assignment.student.get_full_name()
-                    if len(team_assignments) > 1:
-                        participant_name = f"{main_name} and team"
-                    else:
-                        participant_name = main_name
-                    
-                    # For general category, don't show chest number
-                    if program.category == 'open':
-                        table_data.append([participant_name, '', '', '', ''])
-                    else:
-                        # For HS/HSS programs, show chest number
-                        chest_no = main_assignment.chest_number
-                        if not chest_no:
-                            try:
-                                chest_record = ChestNumber.objects.get(event=program.event, student=main_assignment.student)
-                                chest_no = chest_record.chest_number
-                            except ChestNumber.DoesNotExist:
-                                chest_no = ''
-                        chest_no_display = str(chest_no) if chest_no else 'N/A'
-                        table_data.append([chest_no_display, '', '', '', ''])
-            if program.category == 'open':
-                table = Table(table_data, colWidths=[2.3*inch, 1.5*inch, 1.5*inch, 1.5*inch, 2*inch])
-            else:
-                table = Table(table_data, colWidths=[1.5*inch, 1.5*inch, 1.5*inch, 1.5*inch, 2*inch])
-            table.setStyle(TableStyle([
-                # Header styling
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#27AE60')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 15),
-                ('TOPPADDING', (0, 0), (-1, 0), 15),
-                
-                # Data row styling
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 11),
-                ('GRID', (0, 0), (-1, -1), 1.5, colors.HexColor('#34495E')),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 12),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-                ('TOPPADDING', (0, 1), (-1, -1), 12),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 12),
-                
-                # Alternating row colors
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.HexColor('#FEF9E7'), colors.white]),
-                
-                # Border styling
-                ('BOX', (0, 0), (-1, -1), 2, colors.HexColor('#2C3E50')),
-                ('LINEBELOW', (0, 0), (-1, 0), 2, colors.HexColor('#2C3E50')),
-                
-                # Judge columns highlighting
-                ('BACKGROUND', (1, 1), (3, -1), colors.HexColor('#F8F9FA')),
-            ]))
-            elements.append(table)
-        else:
-            elements.append(Paragraph("No participants assigned to this program.", styles['Normal']))
-        doc.build(elements)
-        pdf_data = buffer.getvalue()
-        buffer.close()
         response = HttpResponse(pdf_data, content_type='application/pdf')
-        filename = f"{program.name.replace(' ', '_')}_evaluation_sheet.pdf"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['Content-Disposition'] = f'attachment; filename="{sheet_filename("evaluation", program)}"'
         return response
     except Program.DoesNotExist:
         return Response({'error': 'Program not found'}, status=404)
@@ -3316,7 +3066,42 @@ def generate_formatted_evaluation_sheet(request, program_id):
         print(f"Traceback: {traceback.format_exc()}")
         return Response({'error': f'Error generating evaluation sheet: {str(e)}'}, status=500)
 
-class TeamManagerViewSet(viewsets.ViewSet):
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@report_view('print_pack', params=('event_id',), options=PRINT_PACK_OPTIONS, background=True)
+def generate_print_pack(request, event_id, category=None, program_type=None, date=None, sheets='both', output='pdf'):
+    """
+    Calling and evaluation sheets of all (or the filtered) programs of an event
+    in one merged PDF or a ZIP of PDFs.
+
+    Always rendered by the report worker: the request queues a job (202) whose
+    progress and download are under /api/reports/jobs/<id>/, or is served from
+    the report cache when the pack was already rendered for the current data.
+    Filters: ?category=hs|hss|general, ?program_type=stage|off_stage,
+    ?date=YYYY-MM-DD; ?sheets=calling|evaluation|both, ?output=pdf|zip.
+    """
+    from .reports import report_progress
+    from .sheets import build_print_pack
+    
+    event = Event.objects.filter(id=event_id).first()
+    if event is None:
+        return Response({'error': 'Event not found'}, status=404)
+    
+    content, content_type, program_count = build_print_pack(
+        event_id, category=category, program_type=program_type, date=date,
+        sheets=sheets, output=output, progress=report_progress
+    )
+    if not program_count:
+        return Response({'error': 'No programs match the selected filters'}, status=404)
+    
+    response = HttpResponse(content, content_type=content_type)
+    suffix = '_'.join(filter(None, [category, program_type, date]))
+    filename = f"{event.title.replace(' ', '_')}_{sheets}_sheets{'_' + suffix if suffix else ''}.{output}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+class TeamManagerViewSet(viewsets.GenericViewSet):
     """ViewSet for Team Manager specific functionality"""
     permission_classes = []  # Temporarily disable permissions for testing
     authentication_classes = []  # Temporarily disable authentication for testing
@@ -3328,7 +3113,7 @@ class TeamManagerViewSet(viewsets.ViewSet):
         if request.user.role != 'team_manager':
             return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        teams = Team.objects.filter(team_manager=request.user).select_related('event').prefetch_related('members')
+        teams = Team.objects.filter(team_manager=request.user).prefetch_related('members')
         
         # Calculate global points for each team
         from events.models import ProgramResult
@@ -3344,10 +3129,10 @@ class TeamManagerViewSet(viewsets.ViewSet):
             
             total_global_percentage = 0
             events_participated = 0
+            event_breakdown = {}
             
             if team_results.exists():
                 # Group by event
-                event_breakdown = {}
                 for result in team_results:
                     event_name = result.program.event.title
                     if event_name not in event_breakdown:
@@ -3374,12 +3159,13 @@ class TeamManagerViewSet(viewsets.ViewSet):
             team_data = {
                 'id': team.id,
                 'name': team.name,
-                'team_id': team.team_id,
+                'team_id': team.id,
                 'member_count': team.member_count,
                 'points_earned': team.points_earned,  # Keep original points for backward compatibility
                 'global_points': round(total_global_percentage, 2),  # Add global points
                 'events_participated': events_participated,
-                'event': team.event.title if team.event else None,
+                # Teams join events through their program assignments
+                'event': ', '.join(event_breakdown) or None,
                 'created_at': team.created_at,
                 'updated_at': team.updated_at
             }
@@ -3846,7 +3632,7 @@ class TeamManagerViewSet(viewsets.ViewSet):
         
         # Teams are no longer linked to events, so get all events and their programs
         # Get all programs from all events
-        programs = Program.objects.all().select_related('event')
+        programs = ProgramSerializer.setup_queryset(Program.objects.all(), request)
         
         # Debug: Print the count and some sample programs
         print(f"DEBUG: Total programs in database: {programs.count()}")
@@ -4060,52 +3846,18 @@ class TeamManagerViewSet(viewsets.ViewSet):
         # Get teams managed by this team manager
         managed_teams = Team.objects.filter(team_manager=request.user)
         
-        # Calculate global points for each team
-        from events.models import ProgramResult
-        from django.db.models import Sum
+        # Global points for each team come from the shared materialized leaderboard
+        from .leaderboard import get_global_leaderboard
+        global_points = get_global_leaderboard(teams=managed_teams, include_students=False)
         
         teams_with_global_points = []
-        for team in managed_teams:
-            # Calculate percentage-based global points
-            team_results = ProgramResult.objects.filter(
-                team=team,
-                points_earned__gt=0
-            ).select_related('program__event')
-            
-            total_global_percentage = 0
-            events_participated = 0
-            
-            if team_results.exists():
-                # Group by event
-                event_breakdown = {}
-                for result in team_results:
-                    event_name = result.program.event.title
-                    if event_name not in event_breakdown:
-                        event_breakdown[event_name] = {
-                            'team_points': 0,
-                            'total_event_points': 0
-                        }
-                    event_breakdown[event_name]['team_points'] += result.points_earned
-                
-                # Calculate total event points for each event
-                for event_name in event_breakdown:
-                    total_event_points = ProgramResult.objects.filter(
-                        program__event__title=event_name,
-                        points_earned__gt=0
-                    ).aggregate(total=Sum('points_earned'))['total'] or 0
-                    
-                    # Calculate percentage for this event
-                    if total_event_points > 0:
-                        event_percentage = (event_breakdown[event_name]['team_points'] / total_event_points) * 100
-                        total_global_percentage += event_percentage
-                        events_participated += 1
-            
+        for team in global_points['teams']:
             teams_with_global_points.append({
-                'id': team.id,
-                'name': team.name,
-                'points': round(total_global_percentage, 2),  # Global points
-                'members': team.member_count,
-                'events_participated': events_participated
+                'id': team['id'],
+                'name': team['name'],
+                'points': team['global_points'],  # Global points
+                'members': team['members'],
+                'events_participated': team['events_participated']
             })
         
         # Sort by global points (descending)
@@ -4118,6 +3870,7 @@ class TeamManagerViewSet(viewsets.ViewSet):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@report_view('team_list', params=('event_id', 'team_id'))
 def generate_team_list_pdf(request, event_id, team_id):
     """Generate team list PDF organized by category and grade with participant details"""
     try:
@@ -4132,30 +3885,12 @@ def generate_team_list_pdf(request, event_id, team_id):
         
         # Generate PDF using custom template
         from django.http import HttpResponse
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib import colors
-        from reportlab.lib.units import inch
-        from reportlab.platypus import Table, TableStyle
-        from io import BytesIO
         from accounts.models import SchoolSettings
-        from .pdf_utils import build_custom_pdf_template
         from collections import defaultdict
         
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(
-            buffer, 
-            pagesize=A4, 
-            rightMargin=50, 
-            leftMargin=50, 
-            topMargin=50, 
-            bottomMargin=50
-        )
-        
         # Get school settings and create template
         school_settings = SchoolSettings.get_settings()
-        template = build_custom_pdf_template(school_settings)
+        template = pdf_engine.get_template(school_settings)
         
         # Build PDF content
         story = []
@@ -4197,26 +3932,8 @@ def generate_team_list_pdf(request, event_id, team_id):
                 category_grade_assignments[category][grade].append(assignment)
             
             # Create styles
-            styles = getSampleStyleSheet()
-            category_style = ParagraphStyle(
-                'Category',
-                parent=styles['Heading2'],
-                fontSize=14,
-                spaceAfter=10,
-                spaceBefore=20,
-                textColor=colors.darkblue,
-                fontName='Helvetica-Bold'
-            )
-            
-            grade_style = ParagraphStyle(
-                'Grade',
-                parent=styles['Heading3'],
-                fontSize=12,
-                spaceAfter=8,
-                spaceBefore=15,
-                textColor=colors.darkgreen,
-                fontName='Helvetica-Bold'
-            )
+            category_style = pdf_engine.paragraph_style('category_heading')
+            grade_style = pdf_engine.paragraph_style('grade_heading')
             
             # Process each category
             for category in ['hs', 'hss', 'open']:
@@ -4328,10 +4045,9 @@ def generate_team_list_pdf(request, event_id, team_id):
                         ))
         
         # Build PDF
-        doc.build(story)
-        buffer.seek(0)
+        pdf = pdf_engine.render_pdf(story, rightMargin=50, leftMargin=50, topMargin=50, bottomMargin=50)
         
-        response = HttpResponse(buffer.read(), content_type='application/pdf')
+        response = HttpResponse(pdf, content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="team_list_{team.name.replace(" ", "_")}.pdf"'
         return response
         
@@ -4347,27 +4063,11 @@ def generate_custom_template_demo(request):
     """Demo endpoint showing the full capabilities of the custom PDF template system"""
     try:
         from django.http import HttpResponse
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate
-        from reportlab.lib.units import inch
-        from io import BytesIO
         from accounts.models import SchoolSettings
-        from .pdf_utils import build_custom_pdf_template
         
         # Setup
         school_settings = SchoolSettings.get_settings()
-        template = build_custom_pdf_template(school_settings)
-        
-        # Create PDF buffer
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(
-            buffer, 
-            pagesize=A4, 
-            rightMargin=50, 
-            leftMargin=50, 
-            topMargin=50, 
-            bottomMargin=50
-        )
+        template = pdf_engine.get_template(school_settings)
         
         # Build content
         story = []
@@ -4425,10 +4125,9 @@ def generate_custom_template_demo(request):
         ))
         
         # Generate PDF
-        doc.build(story)
-        buffer.seek(0)
+        pdf = pdf_engine.render_pdf(story, rightMargin=50, leftMargin=50, topMargin=50, bottomMargin=50)
         
-        response = HttpResponse(buffer.read(), content_type='application/pdf')
+        response = HttpResponse(pdf, content_type='application/pdf')
         response['Content-Disposition'] = 'attachment; filename="custom_template_demo.pdf"'
         return response
         
@@ -4469,6 +4168,7 @@ def test_report_generation(request, event_id):
 @api_view(['GET'])
 @permission_classes([])
 @authentication_classes([])
+@report_view('program_details')
 def generate_program_details_report(request, event_id):
     """Generate complete program details report with participants and teams as PDF"""
     try:
@@ -4483,10 +4183,8 @@ def generate_program_details_report(request, event_id):
         school_settings = SchoolSettings.objects.first()
         
         # Create PDF using custom template
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=30, rightMargin=30)
         story = []
-        styles = getSampleStyleSheet()
+        styles = pdf_engine.stylesheet()
         
         # Add custom header with logo
         from .pdf_utils import build_pdf_header
@@ -4523,16 +4221,8 @@ def generate_program_details_report(request, event_id):
                     ['Description', program.description or 'N/A']
                 ]
                 
-                program_table = Table(program_data, colWidths=[2*inch, 4*inch])
-                program_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ]))
-                story.append(program_table)
+                program_table = pdf_engine.DataTable(None, col_widths=[2*inch, 4*inch], style='details')
+                story.extend(program_table.extend(program_data).flowables())
                 story.append(Spacer(1, 10))
                 
                 # Get participants for this program
@@ -4543,29 +4233,22 @@ def generate_program_details_report(request, event_id):
                     story.append(Paragraph("Participants:", styles['Heading5']))
                     story.append(Spacer(1, 5))
                     
-                    participants_data = [['Student Name', 'Team', 'Student ID', 'Grade']]
+                    participants_table = pdf_engine.DataTable(
+                        ['Student Name', 'Team', 'Student ID', 'Grade'],
+                        col_widths=[2*inch, 1.5*inch, 1.5*inch, 1*inch],
+                        style='results'
+                    )
                     for assignment in assignments:
                         student = assignment.student
                         team = assignment.team
-                        participants_data.append([
+                        participants_table.add_row([
                             student.display_name,
                             team.name if team else 'N/A',
                             student.student_id if hasattr(student, 'student_id') and student.student_id else 'N/A',
                             student.grade if hasattr(student, 'grade') and student.grade else 'N/A'
                         ])
                     
-                    participants_table = Table(participants_data, colWidths=[2*inch, 1.5*inch, 1.5*inch, 1*inch])
-                    participants_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, -1), 9),
-                        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                    ]))
-                    story.append(participants_table)
+                    story.extend(participants_table.flowables())
                 else:
                     story.append(Paragraph("No participants assigned yet.", styles['Normal']))
                 
@@ -4573,10 +4256,9 @@ def generate_program_details_report(request, event_id):
                 story.append(Paragraph("=" * 80, styles['Normal']))
                 story.append(Spacer(1, 10))
         
-        doc.build(story)
-        buffer.seek(0)
+        pdf = pdf_engine.render_pdf(story, leftMargin=30, rightMargin=30)
         
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+        response = HttpResponse(pdf, content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="Eventloo_Complete_Programs_{event.title}_{datetime.now().strftime("%Y%m%d")}.pdf"'
         return response
         
@@ -4589,6 +4271,7 @@ def generate_program_details_report(request, event_id):
 @api_view(['GET'])
 @permission_classes([])
 @authentication_classes([])
+@report_view('all_events', params=())
 def generate_all_events_report(request):
     """Generate comprehensive report of all events"""
     try:
@@ -4599,10 +4282,8 @@ def generate_all_events_report(request):
         school_settings = SchoolSettings.objects.first()
         
         # Create PDF using custom template
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
         story = []
-        styles = getSampleStyleSheet()
+        styles = pdf_engine.stylesheet()
         
         # Add custom header with logo
         from .pdf_utils import build_pdf_header
@@ -4613,13 +4294,17 @@ def generate_all_events_report(request):
         story.append(Spacer(1, 20))
         
         # Events summary table
-        data = [['Event Title', 'Category', 'Start Date', 'End Date', 'Programs', 'Teams', 'Status']]
+        table = pdf_engine.DataTable(
+            ['Event Title', 'Category', 'Start Date', 'End Date', 'Programs', 'Teams', 'Status'],
+            col_widths=[2*inch, 1*inch, 1*inch, 1*inch, 0.8*inch, 0.8*inch, 0.8*inch],
+            style='events'
+        )
         for event in events:
             program_count = Program.objects.filter(event=event).count()
             team_count = Team.objects.filter(program_assignments__program__event=event).distinct().count()
             status = "Active" if event.status == 'active' else "Inactive"
             
-            data.append([
+            table.add_row([
                 event.title,
                 event.event_type,
                 event.start_date.strftime('%Y-%m-%d'),
@@ -4629,23 +4314,11 @@ def generate_all_events_report(request):
                 status
             ])
         
-        table = Table(data, colWidths=[2*inch, 1*inch, 1*inch, 1*inch, 0.8*inch, 0.8*inch, 0.8*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(table)
-        
-        doc.build(story)
-        buffer.seek(0)
-        
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+        story.extend(table.flowables())
+        
+        pdf = pdf_engine.render_pdf(story)
+        
+        response = HttpResponse(pdf, content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="Eventloo_All_Events_Report_{datetime.now().strftime("%Y%m%d")}.pdf"'
         return response
         
@@ -4655,24 +4328,24 @@ def generate_all_events_report(request):
 @api_view(['GET'])
 @permission_classes([])
 @authentication_classes([])
+@report_view('complete_results')
 def generate_complete_results_report(request, event_id):
     """Generate complete results report with only 1st, 2nd, 3rd places and participant names"""
     try:
         event = Event.objects.get(id=event_id)
-        results = ProgramResult.objects.filter(
-            program__event=event,
+        # Winners come from the scoreboard projection (one indexed query)
+        results = ScoreboardEntry.objects.filter(
+            event=event,
             position__in=[1, 2, 3]  # Only 1st, 2nd, 3rd places
-        ).order_by('program__category', 'program__name', 'position')
+        ).order_by('program_category', 'program_name', 'position')
         
         # Get school settings for custom template
         from accounts.models import SchoolSettings
         school_settings = SchoolSettings.objects.first()
         
         # Create PDF using custom template
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=30, rightMargin=30)
         story = []
-        styles = getSampleStyleSheet()
+        styles = pdf_engine.stylesheet()
         
         # Add custom header with logo
         from .pdf_utils import build_pdf_header
@@ -4685,8 +4358,8 @@ def generate_complete_results_report(request, event_id):
         # Group results by category and program
         categories = {}
         for result in results:
-            category = result.program.category
-            program_name = result.program.name
+            category = result.program_category
+            program_name = result.program_name
             
             if category not in categories:
                 categories[category] = {}
@@ -4704,20 +4377,24 @@ def generate_complete_results_report(request, event_id):
                 story.append(Spacer(1, 5))
                 
                 # Results table for this program
-                data = [['Rank', 'Participant Name', 'Team Name', 'Points', 'Remarks']]
+                table = pdf_engine.DataTable(
+                    ['Rank', 'Participant Name', 'Team Name', 'Points', 'Remarks'],
+                    col_widths=[0.8*inch, 2*inch, 1.5*inch, 1*inch, 1.7*inch],
+                    style='results'
+                )
                 for result in sorted(program_results, key=lambda x: x.position):
                     # Get participant name
                     participant_name = "N/A"
-                    if result.participant:
+                    if result.participant_display_name:
                         # Use the display_name property which prioritizes name, then email, then username
-                        participant_name = result.participant.display_name
-                    elif result.team:
-                        participant_name = f"Team: {result.team.name}"
+                        participant_name = result.participant_display_name
+                    elif result.team_name:
+                        participant_name = f"Team: {result.team_name}"
                     
                     # Get team name
-                    team_name = result.team.name if result.team else 'N/A'
+                    team_name = result.team_name or 'N/A'
                     
-                    data.append([
+                    table.add_row([
                         f"{result.position}",
                         participant_name,
                         team_name,
@@ -4725,26 +4402,14 @@ def generate_complete_results_report(request, event_id):
                         result.comments or 'N/A'
                     ])
                 
-                table = Table(data, colWidths=[0.8*inch, 2*inch, 1.5*inch, 1*inch, 1.7*inch])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                story.append(table)
+                story.extend(table.flowables())
                 story.append(Spacer(1, 15))
                 story.append(Paragraph("=" * 80, styles['Normal']))
                 story.append(Spacer(1, 10))
         
-        doc.build(story)
-        buffer.seek(0)
+        pdf = pdf_engine.render_pdf(story, leftMargin=30, rightMargin=30)
         
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+        response = HttpResponse(pdf, content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="Eventloo_Winners_Report_{event.title}_{datetime.now().strftime("%Y%m%d")}.pdf"'
         return response
         
@@ -4757,24 +4422,24 @@ def generate_complete_results_report(request, event_id):
 @api_view(['GET'])
 @permission_classes([])
 @authentication_classes([])
+@report_view('first_place')
 def generate_first_place_report(request, event_id):
     """Generate report with only 1st place winners"""
     try:
         event = Event.objects.get(id=event_id)
-        results = ProgramResult.objects.filter(
-            program__event=event,
+        # Winners come from the scoreboard projection (one indexed query)
+        results = ScoreboardEntry.objects.filter(
+            event=event,
             position=1  # Only 1st place
-        ).order_by('program__category', 'program__name')
+        ).order_by('program_category', 'program_name')
         
         # Get school settings for custom template
         from accounts.models import SchoolSettings
         school_settings = SchoolSettings.objects.first()
         
         # Create PDF using custom template
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=30, rightMargin=30)
         story = []
-        styles = getSampleStyleSheet()
+        styles = pdf_engine.stylesheet()
         
         # Add custom header with logo
         from .pdf_utils import build_pdf_header
@@ -4787,8 +4452,8 @@ def generate_first_place_report(request, event_id):
         # Group results by category and program
         categories = {}
         for result in results:
-            category = result.program.category
-            program_name = result.program.name
+            category = result.program_category
+            program_name = result.program_name
             
             if category not in categories:
                 categories[category] = {}
@@ -4806,19 +4471,23 @@ def generate_first_place_report(request, event_id):
                 story.append(Spacer(1, 5))
                 
                 # Results table for this program
-                data = [['🥇 1st Place', 'Participant Name', 'Team Name', 'Points', 'Remarks']]
+                table = pdf_engine.DataTable(
+                    ['🥇 1st Place', 'Participant Name', 'Team Name', 'Points', 'Remarks'],
+                    col_widths=[1.2*inch, 2*inch, 1.5*inch, 1*inch, 1.5*inch],
+                    style='results'
+                )
                 for result in program_results:
                     # Get participant name
                     participant_name = "N/A"
-                    if result.participant:
-                        participant_name = result.participant.display_name
-                    elif result.team:
-                        participant_name = f"Team: {result.team.name}"
+                    if result.participant_display_name:
+                        participant_name = result.participant_display_name
+                    elif result.team_name:
+                        participant_name = f"Team: {result.team_name}"
                     
                     # Get team name
-                    team_name = result.team.name if result.team else 'N/A'
+                    team_name = result.team_name or 'N/A'
                     
-                    data.append([
+                    table.add_row([
                         "🥇 1st Place",
                         participant_name,
                         team_name,
@@ -4826,26 +4495,14 @@ def generate_first_place_report(request, event_id):
                         result.comments or 'N/A'
                     ])
                 
-                table = Table(data, colWidths=[1.2*inch, 2*inch, 1.5*inch, 1*inch, 1.5*inch])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                story.append(table)
+                story.extend(table.flowables())
                 story.append(Spacer(1, 15))
                 story.append(Paragraph("=" * 80, styles['Normal']))
                 story.append(Spacer(1, 10))
         
-        doc.build(story)
-        buffer.seek(0)
+        pdf = pdf_engine.render_pdf(story, leftMargin=30, rightMargin=30)
         
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+        response = HttpResponse(pdf, content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="Eventloo_1st_Place_Winners_{event.title}_{datetime.now().strftime("%Y%m%d")}.pdf"'
         return response
         
@@ -4858,24 +4515,24 @@ def generate_first_place_report(request, event_id):
 @api_view(['GET'])
 @permission_classes([])
 @authentication_classes([])
+@report_view('second_place')
 def generate_second_place_report(request, event_id):
     """Generate report with only 2nd place winners"""
     try:
         event = Event.objects.get(id=event_id)
-        results = ProgramResult.objects.filter(
-            program__event=event,
+        # Winners come from the scoreboard projection (one indexed query)
+        results = ScoreboardEntry.objects.filter(
+            event=event,
             position=2  # Only 2nd place
-        ).order_by('program__category', 'program__name')
+        ).order_by('program_category', 'program_name')
         
         # Get school settings for custom template
         from accounts.models import SchoolSettings
         school_settings = SchoolSettings.objects.first()
         
         # Create PDF using custom template
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=30, rightMargin=30)
         story = []
-        styles = getSampleStyleSheet()
+        styles = pdf_engine.stylesheet()
         
         # Add custom header with logo
         from .pdf_utils import build_pdf_header
@@ -4888,8 +4545,8 @@ def generate_second_place_report(request, event_id):
         # Group results by category and program
         categories = {}
         for result in results:
-            category = result.program.category
-            program_name = result.program.name
+            category = result.program_category
+            program_name = result.program_name
             
             if category not in categories:
                 categories[category] = {}
@@ -4907,19 +4564,23 @@ def generate_second_place_report(request, event_id):
                 story.append(Spacer(1, 5))
                 
                 # Results table for this program
-                data = [['🥈 2nd Place', 'Participant Name', 'Team Name', 'Points', 'Remarks']]
+                table = pdf_engine.DataTable(
+                    ['🥈 2nd Place', 'Participant Name', 'Team Name', 'Points', 'Remarks'],
+                    col_widths=[1.2*inch, 2*inch, 1.5*inch, 1*inch, 1.5*inch],
+                    style='results'
+                )
                 for result in program_results:
                     # Get participant name
                     participant_name = "N/A"
-                    if result.participant:
-                        participant_name = result.participant.display_name
-                    elif result.team:
-                        participant_name = f"Team: {result.team.name}"
+                    if result.participant_display_name:
+                        participant_name = result.participant_display_name
+                    elif result.team_name:
+                        participant_name = f"Team: {result.team_name}"
                     
                     # Get team name
-                    team_name = result.team.name if result.team else 'N/A'
+                    team_name = result.team_name or 'N/A'
                     
-                    data.append([
+                    table.add_row([
                         "🥈 2nd Place",
                         participant_name,
                         team_name,
@@ -4927,26 +4588,14 @@ def generate_second_place_report(request, event_id):
                         result.comments or 'N/A'
                     ])
                 
-                table = Table(data, colWidths=[1.2*inch, 2*inch, 1.5*inch, 1*inch, 1.5*inch])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                story.append(table)
+                story.extend(table.flowables())
                 story.append(Spacer(1, 15))
                 story.append(Paragraph("=" * 80, styles['Normal']))
                 story.append(Spacer(1, 10))
         
-        doc.build(story)
-        buffer.seek(0)
+        pdf = pdf_engine.render_pdf(story, leftMargin=30, rightMargin=30)
         
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+        response = HttpResponse(pdf, content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="Eventloo_2nd_Place_Winners_{event.title}_{datetime.now().strftime("%Y%m%d")}.pdf"'
         return response
         
@@ -4959,24 +4608,24 @@ def generate_second_place_report(request, event_id):
 @api_view(['GET'])
 @permission_classes([])
 @authentication_classes([])
+@report_view('third_place')
 def generate_third_place_report(request, event_id):
     """Generate report with only 3rd place winners"""
     try:
         event = Event.objects.get(id=event_id)
-        results = ProgramResult.objects.filter(
-            program__event=event,
+        # Winners come from the scoreboard projection (one indexed query)
+        results = ScoreboardEntry.objects.filter(
+            event=event,
             position=3  # Only 3rd place
-        ).order_by('program__category', 'program__name')
+        ).order_by('program_category', 'program_name')
         
         # Get school settings for custom template
         from accounts.models import SchoolSettings
         school_settings = SchoolSettings.objects.first()
         
         # Create PDF using custom template
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=30, rightMargin=30)
         story = []
-        styles = getSampleStyleSheet()
+        styles = pdf_engine.stylesheet()
         
         # Add custom header with logo
         from .pdf_utils import build_pdf_header
@@ -4989,8 +4638,8 @@ def generate_third_place_report(request, event_id):
         # Group results by category and program
         categories = {}
         for result in results:
-            category = result.program.category
-            program_name = result.program.name
+            category = result.program_category
+            program_name = result.program_name
             
             if category not in categories:
                 categories[category] = {}
@@ -5008,19 +4657,23 @@ def generate_third_place_report(request, event_id):
                 story.append(Spacer(1, 5))
                 
                 # Results table for this program
-                data = [['🥉 3rd Place', 'Participant Name', 'Team Name', 'Points', 'Remarks']]
+                table = pdf_engine.DataTable(
+                    ['🥉 3rd Place', 'Participant Name', 'Team Name', 'Points', 'Remarks'],
+                    col_widths=[1.2*inch, 2*inch, 1.5*inch, 1*inch, 1.5*inch],
+                    style='results'
+                )
                 for result in program_results:
                     # Get participant name
                     participant_name = "N/A"
-                    if result.participant:
-                        participant_name = result.participant.display_name
-                    elif result.team:
-                        participant_name = f"Team: {result.team.name}"
+                    if result.participant_display_name:
+                        participant_name = result.participant_display_name
+                    elif result.team_name:
+                        participant_name = f"Team: {result.team_name}"
                     
                     # Get team name
-                    team_name = result.team.name if result.team else 'N/A'
+                    team_name = result.team_name or 'N/A'
                     
-                    data.append([
+                    table.add_row([
                         "🥉 3rd Place",
                         participant_name,
                         team_name,
@@ -5028,26 +4681,14 @@ def generate_third_place_report(request, event_id):
                         result.comments or 'N/A'
                     ])
                 
-                table = Table(data, colWidths=[1.2*inch, 2*inch, 1.5*inch, 1*inch, 1.5*inch])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                story.append(table)
+                story.extend(table.flowables())
                 story.append(Spacer(1, 15))
                 story.append(Paragraph("=" * 80, styles['Normal']))
                 story.append(Spacer(1, 10))
         
-        doc.build(story)
-        buffer.seek(0)
+        pdf = pdf_engine.render_pdf(story, leftMargin=30, rightMargin=30)
         
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+        response = HttpResponse(pdf, content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="Eventloo_3rd_Place_Winners_{event.title}_{datetime.now().strftime("%Y%m%d")}.pdf"'
         return response
         
@@ -5060,6 +4701,7 @@ def generate_third_place_report(request, event_id):
 @api_view(['GET'])
 @permission_classes([])
 @authentication_classes([])
+@report_view('participants_team')
 def generate_participants_team_report(request, event_id):
     """Generate participants team report showing team-wise participants and their program participation"""
     try:
@@ -5072,10 +4714,8 @@ def generate_participants_team_report(request, event_id):
         school_settings = SchoolSettings.objects.first()
         
         # Create PDF using custom template
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
         story = []
-        styles = getSampleStyleSheet()
+        styles = pdf_engine.stylesheet()
         
         # Add custom header with logo
         from .pdf_utils import build_pdf_header
@@ -5098,18 +4738,8 @@ def generate_participants_team_report(request, event_id):
             ['End Date', event.end_date.strftime('%B %d, %Y') if event.end_date else 'N/A']
         ]
         
-        summary_table = Table(summary_data, colWidths=[2*inch, 3*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('BACKGROUND', (1, 0), (1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(summary_table)
+        summary_table = pdf_engine.DataTable(None, col_widths=[2*inch, 3*inch], style='event_details')
+        story.extend(summary_table.extend(summary_data).flowables())
         story.append(Spacer(1, 20))
         
         # Team-wise participants and their programs
@@ -5124,39 +4754,36 @@ def generate_participants_team_report(request, event_id):
                 story.append(Paragraph("Team Members:", styles['Heading5']))
                 story.append(Spacer(1, 5))
                 
-                members_data = [['Student Name', 'Student ID', 'Grade', 'Section']]
+                members_table = pdf_engine.DataTable(
+                    ['Student Name', 'Student ID', 'Grade', 'Section'],
+                    col_widths=[2*inch, 1.5*inch, 1*inch, 1*inch],
+                    style='members'
+                )
                 for member in team_members:
                     # Use proper name fields instead of display_name
                     student_name = member.get_full_name() if hasattr(member, 'get_full_name') else f"{member.first_name} {member.last_name}".strip()
                     if not student_name or student_name.strip() == '':
                         student_name = member.name or f"Student {member.student_id}" if member.student_id else "Unknown Student"
                     
-                    members_data.append([
+                    members_table.add_row([
                         student_name,
                         member.student_id if hasattr(member, 'student_id') and member.student_id else 'N/A',
                         member.grade if hasattr(member, 'grade') and member.grade else 'N/A',
                         member.section if hasattr(member, 'section') and member.section else 'N/A'
                     ])
                 
-                members_table = Table(members_data, colWidths=[2*inch, 1.5*inch, 1*inch, 1*inch])
-                members_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgreen),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                story.append(members_table)
+                story.extend(members_table.flowables())
                 story.append(Spacer(1, 15))
                 
                 # Program participation for each member
                 story.append(Paragraph("Program Participation:", styles['Heading5']))
                 story.append(Spacer(1, 5))
                 
-                participation_data = [['Student Name', 'Program Name', 'Category', 'Venue', 'Time']]
+                participation_table = pdf_engine.DataTable(
+                    ['Student Name', 'Program Name', 'Category', 'Venue', 'Time'],
+                    col_widths=[1.5*inch, 1.5*inch, 1*inch, 1*inch, 1.5*inch],
+                    style='participation'
+                )
                 
                 for member in team_members:
                     # Get programs this member is assigned to
@@ -5173,7 +4800,7 @@ def generate_participants_team_report(request, event_id):
                     if member_assignments.exists():
                         for assignment in member_assignments:
                             program = assignment.program
-                            participation_data.append([
+                            participation_table.add_row([
                                 student_name,
                                 program.name,
                                 program.category,
@@ -5181,7 +4808,7 @@ def generate_participants_team_report(request, event_id):
                                 f"{program.start_time.strftime('%I:%M %p') if program.start_time else 'N/A'} - {program.end_time.strftime('%I:%M %p') if program.end_time else 'N/A'}"
                             ])
                     else:
-                        participation_data.append([
+                        participation_table.add_row([
                             student_name,
                             'No programs assigned',
                             'N/A',
@@ -5189,27 +4816,15 @@ def generate_participants_team_report(request, event_id):
                             'N/A'
                         ])
                 
-                participation_table = Table(participation_data, colWidths=[1.5*inch, 1.5*inch, 1*inch, 1*inch, 1.5*inch])
-                participation_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightyellow),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 8),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                story.append(participation_table)
+                story.extend(participation_table.flowables())
             else:
                 story.append(Paragraph("No members assigned to this team.", styles['Normal']))
             
             story.append(Spacer(1, 20))
         
-        doc.build(story)
-        buffer.seek(0)
+        pdf = pdf_engine.render_pdf(story)
         
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+        response = HttpResponse(pdf, content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="Eventloo_Participants_Team_{event.title}_{datetime.now().strftime("%Y%m%d")}.pdf"'
         return response
         
@@ -5230,7 +4845,7 @@ def generate_event_backup(request, event_id):
         programs = Program.objects.filter(event=event).prefetch_related('assignments', 'results')
         teams = Team.objects.filter(program_assignments__program__event=event).distinct().prefetch_related('members', 'program_assignments')
         results = ProgramResult.objects.filter(program__event=event).select_related('team', 'program')
-        points_data = PointsRecord.objects.filter(program__event=event).select_related('team', 'program')
+        points_data = PointsRecord.objects.filter(event=event).select_related('team', 'student')
         
         # Create comprehensive backup data
         backup_data = {
@@ -5327,50 +4942,34 @@ def test_pdf_generation(request, event_id):
             return Response({'error': 'No programs found for this event'}, status=404)
         
         # Create a simple PDF
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
         story = []
-        styles = getSampleStyleSheet()
+        styles = pdf_engine.stylesheet()
         
         # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=1
-        )
+        title_style = pdf_engine.paragraph_style('test_title')
         story.append(Paragraph(f"Eventloo - Test PDF Generation", title_style))
         story.append(Paragraph(f"Event: {event.title}", styles['Heading2']))
         story.append(Paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", styles['Normal']))
         story.append(Spacer(1, 20))
         
         # Simple table
-        data = [['Program Name', 'Category', 'Type']]
+        table = pdf_engine.DataTable(
+            ['Program Name', 'Category', 'Type'],
+            col_widths=[2*inch, 1.5*inch, 1.5*inch],
+            style='test'
+        )
         for program in programs[:5]:  # Limit to first 5 programs
-            data.append([
+            table.add_row([
                 program.name or 'N/A',
                 program.category or 'N/A',
                 program.program_type or 'N/A'
             ])
         
-        table = Table(data, colWidths=[2*inch, 1.5*inch, 1.5*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(table)
-        
-        doc.build(story)
-        buffer.seek(0)
-        
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+        story.extend(table.flowables())
+        
+        pdf = pdf_engine.render_pdf(story)
+        
+        response = HttpResponse(pdf, content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="test_pdf_{event.title}_{datetime.now().strftime("%Y%m%d")}.pdf"'
         return response
         
@@ -5383,6 +4982,7 @@ def test_pdf_generation(request, event_id):
 @api_view(['GET'])
 @permission_classes([])
 @authentication_classes([])
+@report_view('all_results')
 def generate_all_results_report(request, event_id):
     """Generate report with all results (all positions)"""
     try:
@@ -5397,10 +4997,8 @@ def generate_all_results_report(request, event_id):
         school_settings = SchoolSettings.objects.first()
         
         # Create PDF using custom template
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=30, rightMargin=30)
         story = []
-        styles = getSampleStyleSheet()
+        styles = pdf_engine.stylesheet()
         
         # Add custom header with logo
         from .pdf_utils import build_pdf_header
@@ -5432,7 +5030,11 @@ def generate_all_results_report(request, event_id):
                 story.append(Spacer(1, 5))
                 
                 # Results table for this program
-                data = [['Position', 'Participant Name', 'Team Name', 'Points', 'Remarks']]
+                table = pdf_engine.DataTable(
+                    ['Position', 'Participant Name', 'Team Name', 'Points', 'Remarks'],
+                    col_widths=[1*inch, 2*inch, 1.5*inch, 1*inch, 1.5*inch],
+                    style='results'
+                )
                 for result in sorted(program_results, key=lambda x: x.position):
                     # Get participant name
                     participant_name = "N/A"
@@ -5459,7 +5061,7 @@ def generate_all_results_report(request, event_id):
                     else:
                         position_display = f"{result.position}th"
                     
-                    data.append([
+                    table.add_row([
                         position_display,
                         participant_name,
                         team_name,
@@ -5467,26 +5069,14 @@ def generate_all_results_report(request, event_id):
                         result.comments or 'N/A'
                     ])
                 
-                table = Table(data, colWidths=[1*inch, 2*inch, 1.5*inch, 1*inch, 1.5*inch])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                story.append(table)
+                story.extend(table.flowables())
                 story.append(Spacer(1, 15))
                 story.append(Paragraph("=" * 80, styles['Normal']))
                 story.append(Spacer(1, 10))
         
-        doc.build(story)
-        buffer.seek(0)
+        pdf = pdf_engine.render_pdf(story, leftMargin=30, rightMargin=30)
         
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+        response = HttpResponse(pdf, content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="Eventloo_All_Results_{event.title}_{datetime.now().strftime("%Y%m%d")}.pdf"'
         return response
         
@@ -5496,3 +5086,156 @@ def generate_all_results_report(request, event_id):
         import traceback
         return Response({'error': f'PDF generation failed: {str(e)}', 'traceback': traceback.format_exc()}, status=500)
 
+
+@api_view(['POST'])
+@authentication_classes([JWTAuthentication, TeamManagerAuthentication])
+@permission_classes([IsAuthenticated])
+def event_live_token(request, event_id):
+    """
+    Stream token for opening an event's live updates stream.
+    
+    The token only opens the stream of this event and expires after
+    LIVE_STREAM_TOKEN_MAX_AGE seconds; request a new one for every reconnect.
+    """
+    from django.conf import settings
+    from .live import make_stream_token
+    
+    if not Event.objects.filter(pk=event_id).exists():
+        return Response({'error': 'Event not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response({
+        'stream_token': make_stream_token(event_id, request.user),
+        'expires_in': settings.LIVE_STREAM_TOKEN_MAX_AGE,
+    })
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([])
+@renderer_classes([EventStreamRenderer, JSONRenderer])
+def event_live_updates(request, event_id):
+    """
+    Server-sent event stream of live results updates for an event.
+    
+    Sends a `ranking` message with the new positions/points when a program's
+    ranking changes and a `program_finished` message when a program is marked
+    finished; clients re-fetch only what changed. Open it with a token from
+    event_live_token as ?stream_token= (EventSource cannot set headers);
+    access tokens are not accepted here. Reconnects resume from Last-Event-ID.
+    Under WSGI, when every stream slot is taken the answer is 503 with
+    Retry-After and clients should poll until then.
+    """
+    from django.core.handlers.asgi import ASGIRequest
+    from django.http import StreamingHttpResponse
+    from .live import WSGI_RETRY_AFTER, SlotStream, async_event_stream, check_stream_token, event_stream, wsgi_stream_slots
+    
+    # Only checked when the stream is opened
+    if not check_stream_token(request.query_params.get('stream_token'), event_id):
+        return Response({'error': 'Invalid or expired stream token'}, status=status.HTTP_401_UNAUTHORIZED)
+    
+    if not Event.objects.filter(pk=event_id).exists():
+        return Response({'error': 'Event not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    last_event_id = request.META.get('HTTP_LAST_EVENT_ID') or request.query_params.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    
+    # Under ASGI the stream is async and holds no worker thread while idle
+    if isinstance(request._request, ASGIRequest):
+        stream = async_event_stream(event_id, last_event_id)
+    elif wsgi_stream_slots.acquire():
+        stream = SlotStream(event_stream(event_id, last_event_id), wsgi_stream_slots)
+    else:
+        # Each WSGI stream holds a worker thread; don't let streams starve the API
+        return Response({
+            'error': 'Too many open live update streams, retry later or poll for results',
+            'retry_after': WSGI_RETRY_AFTER,
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': str(WSGI_RETRY_AFTER)})
+    
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Don't let nginx buffer the stream
+    return response
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def request_metrics(request):
+    """Per-route latency and query percentiles recorded by RequestMetricsMiddleware (admin only)"""
+    from django.conf import settings
+    from .middleware import route_metrics
+    
+    if request.user.role != 'admin':
+        return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
+    
+    if request.method == 'DELETE':
+        route_metrics.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    return Response({
+        'enabled': settings.REQUEST_METRICS_ENABLED,
+        'slow_ms': settings.REQUEST_METRICS_SLOW_MS,
+        'slow_queries': settings.REQUEST_METRICS_SLOW_QUERIES,
+        'routes': route_metrics.summary(),
+    })
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def report_jobs(request):
+    """List recent report jobs or queue a report for background rendering"""
+    from .reports import get_report_types, normalize_params, enqueue_report, jobs_visible_to, serialize_job
+    
+    if request.method == 'GET':
+        jobs = jobs_visible_to(request.user)
+        return Response({'jobs': [serialize_job(job) for job in jobs[:50]]})
+    
+    report_type = request.data.get('report_type')
+    if report_type not in get_report_types():
+        return Response({
+            'error': f'Unknown report type: {report_type}',
+            'available_report_types': sorted(get_report_types().keys())
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        params = normalize_params(report_type, request.data.get('params') or request.data)
+    except (TypeError, ValueError) as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    job = enqueue_report(report_type, params, requested_by=request.user)
+    return Response(serialize_job(job), status=status.HTTP_202_ACCEPTED)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def report_job_detail(request, job_id):
+    """Get the status of a report job"""
+    from .models import ReportJob
+    from .reports import jobs_visible_to, serialize_job
+    
+    # Other users' jobs are reported as missing
+    try:
+        job = jobs_visible_to(request.user).get(id=job_id)
+    except ReportJob.DoesNotExist:
+        return Response({'error': 'Report job not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(serialize_job(job))
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def report_job_download(request, job_id):
+    """Download the rendered PDF of a completed report job"""
+    import os
+    from .models import ReportJob
+    from .reports import file_response, jobs_visible_to
+    
+    try:
+        job = jobs_visible_to(request.user).get(id=job_id)
+    except ReportJob.DoesNotExist:
+        return Response({'error': 'Report job not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if job.status != 'completed':
+        return Response({'error': f'Report is not ready (status: {job.status})'}, status=status.HTTP_409_CONFLICT)
+    if not job.file_path or not os.path.exists(job.file_path):
+        return Response({'error': 'Report file is no longer available, please request it again'}, status=status.HTTP_410_GONE)
+    return file_response(job)
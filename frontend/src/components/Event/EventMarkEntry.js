@@ -85,12 +85,14 @@ const EventMarkEntry = ({ eventId }) => {
 
 
 
-  const fetchParticipants = async (programId) => {
+  const fetchParticipants = async (programId, openForJudging = false) => {
     if (!programId) return;
     
     setLoading(true);
     try {
-      const response = await markEntryAPI.getParticipants(eventId, programId);
+      const response = openForJudging
+        ? await markEntryAPI.openForJudging(eventId, programId)
+        : await markEntryAPI.getParticipants(eventId, programId);
       const participantsData = Array.isArray(response.data) ? response.data : (response.data.results || []);
       setParticipants(participantsData);
       
@@ -124,7 +126,7 @@ const EventMarkEntry = ({ eventId }) => {
     setSelectedProgram(programId);
     const program = programs.find(p => p.id === parseInt(programId));
     setSelectedProgramDetails(program);
-    fetchParticipants(programId);
+    fetchParticipants(programId, true);
   };
 
   const handleMarkChange = (participantId, field, value) => {
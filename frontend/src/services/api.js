@@ -684,6 +684,10 @@ export const markEntryAPI = {
   getParticipants: (eventId, programId) =>
     api.get(`/events/${eventId}/programs/${programId}/results/mark_entry/`),
   
+  // Create result rows for all participants when a program is opened for judging
+  openForJudging: (eventId, programId) =>
+    api.post(`/events/${eventId}/programs/${programId}/results/materialize_results/`),
+  
   // Bulk update marks
   bulkUpdateMarks: (eventId, programId, marksData) =>
     api.post(`/events/${eventId}/programs/${programId}/results/bulk_mark_entry/`, {
@@ -701,6 +705,64 @@ export const markEntryAPI = {
     })
 };
 
+// Live results push channel (server-sent events)
+export const liveResultsAPI = {
+  // Short-lived token that opens one event's stream (EventSource cannot send the Authorization header)
+  getStreamToken: (eventId) => api.post(`/events/${eventId}/live/token/`),
+
+  // Subscribe once per event; handlers.onRanking / handlers.onProgramFinished get the parsed message.
+  // Returns an object with .close() to unsubscribe. Stream tokens are only good for opening the
+  // stream, so every reconnect fetches a new one and resumes after the last message seen.
+  subscribe: (eventId, handlers = {}) => {
+    let source = null;
+    let closed = false;
+    let lastEventId = null;
+    let retryTimer = null;
+
+    const reconnect = (delayMs) => {
+      if (!closed) retryTimer = setTimeout(open, delayMs);
+    };
+
+    const onMessage = (handler) => (e) => {
+      lastEventId = e.lastEventId || lastEventId;
+      if (handler) handler(JSON.parse(e.data));
+    };
+
+    async function open() {
+      let token;
+      try {
+        const response = await liveResultsAPI.getStreamToken(eventId);
+        token = response.data.stream_token;
+      } catch (error) {
+        if (handlers.onError) handlers.onError(error);
+        reconnect(30000);
+        return;
+      }
+      if (closed) return;
+
+      const resume = lastEventId ? `&last_event_id=${encodeURIComponent(lastEventId)}` : '';
+      source = new EventSource(`${API_BASE_URL}/events/${eventId}/live/?stream_token=${encodeURIComponent(token)}${resume}`);
+      source.addEventListener('ranking', onMessage(handlers.onRanking));
+      source.addEventListener('program_finished', onMessage(handlers.onProgramFinished));
+      source.onerror = (e) => {
+        if (handlers.onError) handlers.onError(e);
+        // The browser's own reconnect would reuse the expired token, so reopen with a new one
+        source.close();
+        reconnect(3000);
+      };
+    }
+
+    open();
+    return {
+      close: () => {
+        closed = true;
+        clearTimeout(retryTimer);
+        if (source) source.close();
+      },
+    };
+  },
+};
+
 // Announcements API
 export const announcementsAPI = {
   getAnnouncements: async (params = {}) => {